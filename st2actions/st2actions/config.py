@@ -57,6 +57,8 @@ def _register_action_runner_opts():
                          'creates pack virtualenv.')
     ]
     CONF.register_opts(logging_opts, group='actionrunner')
+    common_config.register_consumer_opts('actionrunner')
+    common_config.register_consumer_opts('scheduler')
 
     db_opts = [
         cfg.StrOpt('host', default='0.0.0.0', help='host of db server'),
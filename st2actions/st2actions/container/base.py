@@ -26,7 +26,7 @@ from st2common.models.db.executionstate import ActionExecutionStateDB
 from st2common.models.system.action import ResolvedActionParameters
 from st2common.persistence.execution import ActionExecution
 from st2common.persistence.executionstate import ActionExecutionState
-from st2common.services import access, executions
+from st2common.services import access, executions, execution_results
 from st2common.util.action_db import (get_action_by_ref, get_runnertype_by_name)
 from st2common.util.action_db import (update_liveaction_status, get_liveaction_by_id)
 from st2common.util import param as param_utils
@@ -66,7 +66,7 @@ class RunnerContainer(object):
             liveaction_db = self._do_run(runner=runner, runnertype_db=runnertype_db,
                                          action_db=action_db, liveaction_db=liveaction_db)
 
-        return liveaction_db.result
+        return execution_results.load_result(liveaction_db.result)
 
     def _do_run(self, runner, runnertype_db, action_db, liveaction_db):
         # Create a temporary auth token which will be available
@@ -157,7 +157,7 @@ class RunnerContainer(object):
                 end_timestamp=date_utils.get_datetime_utc_now(),
                 liveaction_db=liveaction_db)
 
-            executions.update_execution(liveaction_db)
+            executions.update_execution(liveaction_db, include_result=False)
 
             LOG.debug('Performing post_run for runner: %s', runner.runner_id)
             result = {'error': 'Execution canceled by user.'}
@@ -45,6 +45,7 @@ def _register_notifier_opts():
                    help='Location of the logging configuration file.')
     ]
     CONF.register_opts(notifier_opts, group='notifier')
+    common_config.register_consumer_opts('notifier')
 
     scheduler_opts = [
         cfg.IntOpt('delayed_execution_recovery', default=600,
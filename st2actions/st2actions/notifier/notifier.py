@@ -26,12 +26,14 @@ from st2common.constants.triggers import INTERNAL_TRIGGER_TYPES
 from st2common.models.api.trace import TraceContext
 from st2common.models.db.liveaction import LiveActionDB
 from st2common.persistence.action import Action
-from st2common.persistence.policy import Policy
 from st2common import policies
 from st2common.models.system.common import ResourceReference
 from st2common.persistence.execution import ActionExecution
+from st2common.persistence.liveaction import LiveAction
+from st2common.services import execution_results
 from st2common.services import trace as trace_service
 from st2common.transport import consumers, liveaction, publishers
+from st2common.transport.delta import ModelUpdateDelta
 from st2common.transport import utils as transport_utils
 from st2common.transport.reactor import TriggerDispatcher
 from st2common.util import isotime
@@ -40,7 +42,7 @@ from st2common.constants.action import ACTION_CONTEXT_KV_PREFIX
 from st2common.constants.action import ACTION_PARAMETERS_KV_PREFIX
 from st2common.constants.action import ACTION_RESULTS_KV_PREFIX
 from st2common.constants.system import SYSTEM_KV_PREFIX
-from st2common.services.keyvalues import KeyValueLookup
+from st2common.services.keyvalues import get_key_value_lookup
 
 __all__ = [
     'Notifier',
@@ -59,7 +61,8 @@ NOTIFY_TRIGGER_TYPE = INTERNAL_TRIGGER_TYPES['action'][1]
 
 
 class Notifier(consumers.MessageHandler):
-    message_type = LiveActionDB
+    message_type = (LiveActionDB, ModelUpdateDelta)
+    config_group = 'notifier'
 
     def __init__(self, connection, queues, trigger_dispatcher=None):
         super(Notifier, self).__init__(connection, queues)
@@ -83,6 +86,14 @@ class Notifier(consumers.MessageHandler):
                       (live_action_id), extra=extra)
             return
 
+        # Slim update events only contain the status so the full object is retrieved once it's
+        # known the live action needs to be processed
+        liveaction = LiveAction.get_by_update_event(liveaction)
+
+        if not liveaction:
+            LOG.error('LiveAction %s not found.', live_action_id)
+            return
+
         execution = self._get_execution_for_liveaction(liveaction)
 
         if not execution:
@@ -141,7 +152,8 @@ class Notifier(consumers.MessageHandler):
                 'Action ' + liveaction.action + ' ' + default_message_suffix)
             data = notify_subsection.data or {}
 
-            jinja_context = self._build_jinja_context(liveaction=liveaction, execution=execution)
+            jinja_context = self._build_jinja_context(liveaction=liveaction, execution=execution,
+                                                      templates=[message, data])
 
             try:
                 message = self._transform_message(message=message,
@@ -160,7 +172,7 @@ class Notifier(consumers.MessageHandler):
             # to a string representation it uses str(...) which make it impossible to
             # parse the result as json any longer.
             # TODO: Use to_serializable_dict
-            data['result'] = json.dumps(liveaction.result)
+            data['result'] = json.dumps(execution_results.load_result(liveaction.result))
 
             payload['message'] = message
             payload['data'] = data
@@ -189,11 +201,11 @@ class Notifier(consumers.MessageHandler):
             if len(failed_routes) > 0:
                 raise Exception('Failed notifications to routes: %s' % ', '.join(failed_routes))
 
-    def _build_jinja_context(self, liveaction, execution):
-        context = {SYSTEM_KV_PREFIX: KeyValueLookup()}
+    def _build_jinja_context(self, liveaction, execution, templates=None):
+        context = {SYSTEM_KV_PREFIX: get_key_value_lookup(templates=templates)}
         context.update({ACTION_PARAMETERS_KV_PREFIX: liveaction.parameters})
         context.update({ACTION_CONTEXT_KV_PREFIX: liveaction.context})
-        context.update({ACTION_RESULTS_KV_PREFIX: execution.result})
+        context.update({ACTION_RESULTS_KV_PREFIX: execution_results.load_result(execution.result)})
         return context
 
     def _transform_message(self, message, context=None):
@@ -228,7 +240,7 @@ class Notifier(consumers.MessageHandler):
                    'action_ref': liveaction.action,
                    'runner_ref': self._get_runner_ref(liveaction.action),
                    'parameters': liveaction.get_masked_parameters(),
-                   'result': liveaction.result}
+                   'result': execution_results.load_result(liveaction.result)}
         # Use execution_id to extract trace rather than liveaction. execution_id
         # will look-up an exact TraceDB while liveaction depending on context
         # may not end up going to the DB.
@@ -240,20 +252,16 @@ class Notifier(consumers.MessageHandler):
 
     def _apply_post_run_policies(self, liveaction=None):
         # Apply policies defined for the action.
-        policy_dbs = Policy.query(resource_ref=liveaction.action)
-        LOG.debug('Applying %s post_run policies' % (len(policy_dbs)))
-
-        for policy_db in policy_dbs:
-            driver = policies.get_driver(policy_db.ref,
-                                         policy_db.policy_type,
-                                         **policy_db.parameters)
+        policy_chain = policies.get_policy_chain(liveaction.action)
+        LOG.debug('Applying %s post_run policies' % (len(policy_chain)))
 
+        for policy in policy_chain:
             try:
                 LOG.debug('Applying post_run policy "%s" (%s) for liveaction %s' %
-                          (policy_db.ref, policy_db.policy_type, str(liveaction.id)))
-                liveaction = driver.apply_after(liveaction)
+                          (policy.ref, policy.policy_type, str(liveaction.id)))
+                liveaction = policy.driver.apply_after(liveaction)
             except:
-                LOG.exception('An exception occurred while applying policy "%s".', policy_db.ref)
+                LOG.exception('An exception occurred while applying policy "%s".', policy.ref)
 
     def _get_runner_ref(self, action_ref):
         """
@@ -19,6 +19,8 @@ import Queue
 import six
 import time
 
+from oslo_config import cfg
+
 from st2actions.container.service import RunnerContainerService
 from st2actions.runners import get_runner
 from st2common import log as logging
@@ -26,6 +28,7 @@ from st2common.constants import action as action_constants
 from st2common.persistence.executionstate import ActionExecutionState
 from st2common.persistence.liveaction import LiveAction
 from st2common.services import executions
+from st2common.services import execution_results
 from st2common.util.action_db import (get_action_by_ref, get_runnertype_by_name)
 from st2common.util import date as date_utils
 
@@ -118,22 +121,40 @@ class Querier(object):
         self._query_contexts.put((time.time(), query_context))
 
     def _update_action_results(self, execution_id, status, results):
-        liveaction_db = LiveAction.get_by_id(execution_id)
+        # Only retrieve the attributes needed to determine the update. Note: When offloading is
+        # enabled, result stored inline is bounded by the offload threshold
+        fields = ['status', 'end_timestamp']
+
+        if cfg.CONF.executions.result_offload_threshold:
+            fields.append('result')
+
+        liveaction_db = LiveAction.query(id=execution_id).only(*fields).first()
         if not liveaction_db:
             raise Exception('No DB model for liveaction_id: %s' % execution_id)
 
-        if liveaction_db.status != action_constants.LIVEACTION_STATUS_CANCELED:
-            liveaction_db.status = status
+        # Large results are stored outside of the document (see execution_results)
+        update = {'set__result': execution_results.offload_result(results)}
 
-        liveaction_db.result = results
+        if liveaction_db.status != action_constants.LIVEACTION_STATUS_CANCELED:
+            update['set__status'] = status
+        else:
+            status = liveaction_db.status
 
         # Action has completed, record end_timestamp
-        if (liveaction_db.status in action_constants.LIVEACTION_COMPLETED_STATES and
+        if (status in action_constants.LIVEACTION_COMPLETED_STATES and
                 not liveaction_db.end_timestamp):
-            liveaction_db.end_timestamp = date_utils.get_datetime_utc_now()
+            update['set__end_timestamp'] = date_utils.get_datetime_utc_now()
 
         # update liveaction, update actionexecution and then publish update.
-        updated_liveaction = LiveAction.add_or_update(liveaction_db, publish=False)
+        updated_liveaction = LiveAction.find_and_update(query={'id': execution_id},
+                                                        publish=False, **update)
+        if not updated_liveaction:
+            raise Exception('No DB model for liveaction_id: %s' % execution_id)
+
+        # Previous offloaded result has been replaced by the new one
+        if 'result' in fields and liveaction_db.result != updated_liveaction.result:
+            execution_results.delete_result(liveaction_db.result)
+
         executions.update_execution(updated_liveaction)
         LiveAction.publish_update(updated_liveaction)
 
@@ -160,7 +181,7 @@ class Querier(object):
             pack=action_db.pack, entry_point=action_db.entry_point)
 
         # Invoke the post_run method.
-        runner.post_run(actionexec_db.status, actionexec_db.result)
+        runner.post_run(actionexec_db.status, execution_results.load_result(actionexec_db.result))
 
     def _delete_state_object(self, query_context):
         state_db = ActionExecutionState.get_by_id(query_context.id)
@@ -45,6 +45,7 @@ def _register_results_tracker_opts():
                    help='Location of the logging configuration file.')
     ]
     CONF.register_opts(resultstracker_opts, group='resultstracker')
+    common_config.register_consumer_opts('resultstracker')
 
 
 register_opts()
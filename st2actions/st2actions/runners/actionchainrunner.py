@@ -40,7 +40,8 @@ from st2common.models.system import actionchain
 from st2common.models.utils import action_param_utils
 from st2common.persistence.execution import ActionExecution
 from st2common.services import action as action_service
-from st2common.services.keyvalues import KeyValueLookup
+from st2common.services import execution_results
+from st2common.services.keyvalues import get_key_value_lookup
 from st2common.util import action_db as action_db_util
 from st2common.util import isotime
 from st2common.util import date as date_utils
@@ -192,7 +193,7 @@ class ChainHolder(object):
     def _get_rendered_vars(vars, action_parameters):
         if not vars:
             return {}
-        context = {SYSTEM_KV_PREFIX: KeyValueLookup()}
+        context = {SYSTEM_KV_PREFIX: get_key_value_lookup(templates=[vars])}
         context.update(action_parameters)
         return jinja_utils.render_values(mapping=vars, context=context)
 
@@ -353,13 +354,15 @@ class ActionChainRunner(ActionRunner):
                 }
                 context_result[action_node.name] = error
             else:
-                # Update context result
-                context_result[action_node.name] = liveaction.result
+                # Update context result. Note: Large results are stored outside of the
+                # execution (see execution_results)
+                execution_result = execution_results.load_result(liveaction.result)
+                context_result[action_node.name] = execution_result
 
                 # Render and publish variables
                 rendered_publish_vars = ActionChainRunner._render_publish_vars(
                     action_node=action_node, action_parameters=action_parameters,
-                    execution_result=liveaction.result, previous_execution_results=context_result,
+                    execution_result=execution_result, previous_execution_results=context_result,
                     chain_vars=self.chain_holder.vars)
 
                 if rendered_publish_vars:
@@ -461,7 +464,7 @@ class ActionChainRunner(ActionRunner):
         context.update(previous_execution_results)
         context.update(chain_vars)
         context.update({RESULTS_KEY: previous_execution_results})
-        context.update({SYSTEM_KV_PREFIX: KeyValueLookup()})
+        context.update({SYSTEM_KV_PREFIX: get_key_value_lookup(templates=[action_node.publish])})
 
         try:
             rendered_result = jinja_utils.render_values(mapping=action_node.publish,
@@ -483,7 +486,8 @@ class ActionChainRunner(ActionRunner):
         context.update(results)
         context.update(chain_vars)
         context.update({RESULTS_KEY: results})
-        context.update({SYSTEM_KV_PREFIX: KeyValueLookup()})
+        context.update({SYSTEM_KV_PREFIX: get_key_value_lookup(
+            templates=[action_node.get_parameters()])})
         context.update({ACTION_CONTEXT_KV_PREFIX: chain_context})
         try:
             rendered_params = jinja_utils.render_values(mapping=action_node.get_parameters(),
@@ -601,7 +605,7 @@ class ActionChainRunner(ActionRunner):
         if error:
             result['result'] = error
         else:
-            result['result'] = liveaction_db.result
+            result['result'] = execution_results.load_result(liveaction_db.result)
 
         return result
 
@@ -21,7 +21,6 @@ from st2common.exceptions.db import StackStormDBObjectNotFoundError
 from st2common.models.db.liveaction import LiveActionDB
 from st2common.services import action as action_service
 from st2common.persistence.liveaction import LiveAction
-from st2common.persistence.policy import Policy
 from st2common import policies
 from st2common.transport import consumers, liveaction
 from st2common.transport import utils as transport_utils
@@ -40,6 +39,7 @@ ACTIONRUNNER_REQUEST_Q = liveaction.get_status_management_queue(
 
 class ActionExecutionScheduler(consumers.MessageHandler):
     message_type = LiveActionDB
+    config_group = 'scheduler'
 
     def process(self, request):
         """Schedules the LiveAction and publishes the request
@@ -63,15 +63,11 @@ class ActionExecutionScheduler(consumers.MessageHandler):
             raise
 
         # Apply policies defined for the action.
-        for policy_db in Policy.query(resource_ref=liveaction_db.action):
-            driver = policies.get_driver(policy_db.ref,
-                                         policy_db.policy_type,
-                                         **policy_db.parameters)
-
+        for policy in policies.get_policy_chain(liveaction_db.action):
             try:
-                liveaction_db = driver.apply_before(liveaction_db)
+                liveaction_db = policy.driver.apply_before(liveaction_db)
             except:
-                LOG.exception('An exception occurred while applying policy "%s".', policy_db.ref)
+                LOG.exception('An exception occurred while applying policy "%s".', policy.ref)
 
             if liveaction_db.status == action_constants.LIVEACTION_STATUS_DELAYED:
                 break
@@ -43,6 +43,7 @@ ACTIONRUNNER_CANCEL_Q = liveaction.get_status_management_queue(
 
 class ActionExecutionDispatcher(consumers.MessageHandler):
     message_type = LiveActionDB
+    config_group = 'actionrunner'
 
     def __init__(self, connection, queues):
         super(ActionExecutionDispatcher, self).__init__(connection, queues)
@@ -111,7 +112,7 @@ class ActionExecutionDispatcher(consumers.MessageHandler):
 
         self._running_liveactions.add(liveaction_db.id)
 
-        action_execution_db = executions.update_execution(liveaction_db)
+        action_execution_db = executions.update_execution(liveaction_db, include_result=False)
 
         # Launch action
         extra = {'action_execution_db': action_execution_db, 'liveaction_db': liveaction_db}
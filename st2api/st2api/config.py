@@ -54,7 +54,10 @@ def _register_app_opts():
         cfg.IntOpt('heartbeat', default=25,
                    help='Send empty message every N seconds to keep connection open'),
         cfg.BoolOpt('mask_secrets', default=True,
-                    help='True to mask secrets in API responses')
+                    help='True to mask secrets in API responses'),
+        cfg.BoolOpt('estimated_total_count', default=False,
+                    help='True to use the estimated collection count for the X-Total-Count '
+                         'header of list requests without filters')
     ]
     CONF.register_opts(api_opts, group='api')
 
@@ -16,9 +16,14 @@
 # pylint: disable=no-member
 
 import abc
+import base64
 import copy
+import json
 
+import bson
+from mongoengine import Q
 from mongoengine import ValidationError
+from oslo_config import cfg
 import pecan
 from pecan import rest
 import six
@@ -29,6 +34,7 @@ from st2common import log as logging
 from st2common.models.system.common import InvalidResourceReferenceError
 from st2common.models.system.common import ResourceReference
 from st2common.exceptions.db import StackStormDBObjectNotFoundError
+from st2common.util import isotime
 
 LOG = logging.getLogger(__name__)
 
@@ -61,6 +67,19 @@ class ResourceController(rest.RestController):
     # Method responsible for retrieving an instance of the corresponding model DB object
     get_one_db_method = None
 
+    # A list of attributes which can be specified using ?include_attributes filter. Only the
+    # specified attributes are retrieved from the database. Empty list means the filter is not
+    # supported by this resource.
+    valid_include_attributes = []
+
+    # A list of attributes which are always retrieved when ?include_attributes filter is used
+    mandatory_include_fields = ['id']
+
+    # Name of the timestamp attribute which is used together with id for cursor (keyset) based
+    # pagination (?cursor filter). None means cursor based pagination is not supported by this
+    # resource.
+    cursor_field = None
+
     def __init__(self):
         self.supported_filters = copy.deepcopy(self.__class__.supported_filters)
         self.supported_filters.update(RESERVED_QUERY_PARAMS)
@@ -74,14 +93,46 @@ class ResourceController(rest.RestController):
     def get_one(self, id):
         return self._get_one_by_id(id=id)
 
-    def _get_all(self, exclude_fields=None, sort=None, offset=0, limit=None, query_options=None,
-                 **kwargs):
+    def _get_all(self, exclude_fields=None, include_fields=None, sort=None, offset=0, limit=None,
+                 query_options=None, **kwargs):
         """
         :param exclude_fields: A list of object fields to exclude.
         :type exclude_fields: ``list``
+
+        :param include_fields: A list of object fields to include. If not provided, the value of
+                               the include_attributes query parameter is used.
+        :type include_fields: ``list``
+
+        Cursor based pagination is used if the cursor query parameter is provided (empty value
+        for the first page). Results are ordered from the newest to the oldest and the cursor for
+        the next page is returned in the X-Next-Cursor header.
         """
         kwargs = copy.deepcopy(kwargs)
 
+        cursor = kwargs.pop('cursor', None)
+        use_cursor = cursor is not None
+
+        if use_cursor and not self.cursor_field:
+            raise ValueError('Cursor based pagination is not supported for this resource.')
+
+        if use_cursor and int(offset):
+            raise ValueError('offset and cursor arguments are mutually exclusive.')
+
+        include_attributes = kwargs.pop('include_attributes', None)
+        if include_attributes and not include_fields:
+            include_fields = include_attributes.split(',')
+
+        include_fields = self._get_include_fields(include_fields=include_fields)
+
+        if include_fields and use_cursor and self.cursor_field not in include_fields:
+            # Needed for the next page cursor
+            include_fields.append(self.cursor_field)
+
+        if exclude_fields and include_fields:
+            msg = ('exclude_attributes and include_attributes arguments are mutually exclusive. '
+                   'You need to provide either one or another, but not both.')
+            raise ValueError(msg)
+
         exclude_fields = exclude_fields or []
         query_options = query_options if query_options else self.query_options
 
@@ -139,24 +190,83 @@ class ResourceController(rest.RestController):
         }
         LOG.info('GET all %s with filters=%s' % (pecan.request.path, filters), extra=extra)
 
-        instances = self.access.query(exclude_fields=exclude_fields, **filters)
+        # Keyset pagination relies on a stable order on (cursor_field, id)
+        if use_cursor:
+            filters['order_by'] = ['-' + self.cursor_field, '-id']
+
+        instances = self.access.query(exclude_fields=exclude_fields, only_fields=include_fields,
+                                      **filters)
         if limit == 1:
             # Perform the filtering on the DB side
             instances = instances.limit(limit)
 
         if limit:
             pecan.response.headers['X-Limit'] = str(limit)
-        pecan.response.headers['X-Total-Count'] = str(instances.count())
+        total_count = self._get_total_count(instances=instances, filters=filters)
+        pecan.response.headers['X-Total-Count'] = str(total_count)
+
+        if cursor:
+            instances = instances.filter(self._get_cursor_query(cursor=cursor))
 
         from_model_kwargs = self._get_from_model_kwargs_for_request(request=pecan.request)
 
         result = []
+        instance = None
         for instance in instances[offset:eop]:
             item = self.model.from_model(instance, **from_model_kwargs)
             result.append(item)
 
+        next_cursor = None
+        if use_cursor and limit and len(result) == int(limit):
+            next_cursor = self._get_next_cursor(instance=instance)
+
+        if next_cursor:
+            pecan.response.headers['X-Next-Cursor'] = next_cursor
+
         return result
 
+    def _get_total_count(self, instances, filters):
+        """
+        Return value for the X-Total-Count header.
+
+        If api.estimated_total_count option is enabled, total count for requests without filters
+        is retrieved from the collection metadata instead of counting the documents.
+        """
+        # Note: order_by is always present for resources with a default sort order
+        query_filters = [key for key in six.iterkeys(filters) if key != 'order_by']
+
+        if cfg.CONF.api.estimated_total_count and not query_filters:
+            return self.access._get_impl().model._get_collection().count()
+
+        return instances.count()
+
+    def _get_cursor_query(self, cursor):
+        """
+        Return query which matches objects which come after the provided cursor.
+        """
+        try:
+            value, object_id = json.loads(base64.urlsafe_b64decode(str(cursor)))
+            value = isotime.parse(value)
+            object_id = bson.ObjectId(object_id)
+        except Exception:
+            raise ValueError('Invalid cursor: %s' % (cursor))
+
+        field = self.cursor_field
+        return (Q(**{'%s__lt' % (field): value}) |
+                Q(**{field: value, 'id__lt': object_id}))
+
+    def _get_next_cursor(self, instance):
+        """
+        Return opaque cursor for the page which follows the provided object.
+        """
+        value = getattr(instance, self.cursor_field, None)
+
+        if not value:
+            return None
+
+        value = isotime.format(value, usec=True, offset=False)
+        return base64.urlsafe_b64encode(json.dumps([value, str(instance.id)]))
+
     def _get_one(self, id, exclude_fields=None):
         # Note: This is here for backward compatibility reasons
         return self._get_one_by_id(id=id, exclude_fields=exclude_fields)
@@ -229,6 +339,25 @@ class ResourceController(rest.RestController):
 
         return resource_db
 
+    def _get_include_fields(self, include_fields):
+        """
+        Validate provided include fields and return a list of fields which should be retrieved
+        from the database.
+
+        :rtype: ``list``
+        """
+        if not include_fields:
+            return include_fields
+
+        for field in include_fields:
+            if field not in self.valid_include_attributes:
+                msg = 'Invalid or unsupported include attribute specified: %s' % (field)
+                raise ValueError(msg)
+
+        result = list(self.mandatory_include_fields)
+        result.extend([field for field in include_fields if field not in result])
+        return result
+
     def _get_from_model_kwargs_for_request(self, request):
         """
         Retrieve kwargs which are passed to "LiveActionAPI.model" method.
@@ -23,7 +23,9 @@ import jsonschema
 from oslo_config import cfg
 import pecan
 from pecan import abort
+from pecan import Response
 from six.moves import http_client
+from webob.static import FileIter
 
 from st2api.controllers.base import BaseRestControllerMixin
 from st2api.controllers.resource import ResourceController
@@ -43,6 +45,7 @@ from st2common.persistence.liveaction import LiveAction
 from st2common.persistence.execution import ActionExecution
 from st2common.services import action as action_service
 from st2common.services import executions as execution_service
+from st2common.services import execution_results
 from st2common.services import trace as trace_service
 from st2common.rbac.utils import request_user_is_admin
 from st2common.util import jsonify
@@ -90,6 +93,30 @@ class ActionExecutionsControllerMixin(BaseRestControllerMixin):
         'trigger_instance'
     ]
 
+    # ResourceController attributes
+    cursor_field = 'start_timestamp'
+
+    # A list of attributes which can be specified using ?include_attributes filter
+    valid_include_attributes = [
+        'id',
+        'action',
+        'runner',
+        'liveaction',
+        'status',
+        'start_timestamp',
+        'end_timestamp',
+        'parameters',
+        'result',
+        'context',
+        'parent',
+        'children',
+        'ancestors',
+        'rule',
+        'trigger',
+        'trigger_type',
+        'trigger_instance'
+    ]
+
     def _get_from_model_kwargs_for_request(self, request):
         """
         Set mask_secrets=False if the user is an admin and provided ?show_secrets=True query param.
@@ -184,7 +211,7 @@ class ActionExecutionsControllerMixin(BaseRestControllerMixin):
         """
         fields = ['result']
         action_exec_db = self.access.impl.model.objects.filter(id=id).only(*fields).get()
-        return action_exec_db.result
+        return execution_results.load_result(action_exec_db.result)
 
     def _get_children(self, id_, depth=-1, result_fmt=None):
         # make sure depth is int. Url encoding will make it a string and needs to
@@ -199,6 +226,16 @@ class ActionExecutionsControllerMixin(BaseRestControllerMixin):
         return [self.model.from_model(descendant, from_model_kwargs) for
                 descendant in descendants]
 
+    def _get_include_fields(self, include_fields):
+        result = super(ActionExecutionsControllerMixin, self)._get_include_fields(
+            include_fields=include_fields)
+
+        if result and 'parameters' in result:
+            # Action and runner parameter definitions are needed to mask secret parameters
+            result.extend([field for field in ['action', 'runner'] if field not in result])
+
+        return result
+
     def _validate_exclude_fields(self, exclude_fields):
         """
         Validate that provided exclude fields are valid.
@@ -258,9 +295,41 @@ class ActionExecutionAttributeController(BaseActionExecutionNestedController):
         fields = self._validate_exclude_fields(fields)
         action_exec_db = self.access.impl.model.objects.filter(id=id).only(*fields).get()
         result = getattr(action_exec_db, attribute, None)
+
+        if attribute == 'result':
+            result = execution_results.load_result(result)
+
         return result
 
 
+class ActionExecutionResultController(BaseActionExecutionNestedController):
+    @request_user_has_resource_db_permission(permission_type=PermissionType.EXECUTION_VIEW)
+    @jsexpose(arg_types=[str])
+    def get(self, id, **kwargs):
+        """
+        Retrieve full result for the provided action execution. Result is streamed and range
+        requests are supported.
+
+        Handles requests:
+
+            GET /executions/<id>/result
+
+        :rtype: ``dict``
+        """
+        action_exec_db = self.access.impl.model.objects.filter(id=id).only('result').get()
+        result = action_exec_db.result
+
+        if execution_results.is_offloaded_result(result):
+            grid_out = execution_results.open_result(result)
+
+            if grid_out:
+                return Response(content_type='application/json', app_iter=FileIter(grid_out),
+                                content_length=grid_out.length, conditional_response=True)
+
+        return Response(content_type='application/json', body=jsonify.json_encode(result),
+                        conditional_response=True)
+
+
 class ActionExecutionReRunController(ActionExecutionsControllerMixin, ResourceController):
     supported_filters = {}
     exclude_fields = [
@@ -352,6 +421,7 @@ class ActionExecutionsController(ActionExecutionsControllerMixin, ResourceContro
 
     children = ActionExecutionChildrenController()
     attribute = ActionExecutionAttributeController()
+    result = ActionExecutionResultController()
     re_run = ActionExecutionReRunController()
 
     # ResourceController attributes
@@ -372,9 +442,12 @@ class ActionExecutionsController(ActionExecutionsControllerMixin, ResourceContro
 
         Handles requests:
             GET /executions[?exclude_attributes=result,trigger_instance]
+            GET /executions[?include_attributes=id,status,action]
 
         :param exclude_attributes: Comma delimited string of attributes to exclude from the object.
         :type exclude_attributes: ``str``
+
+        Note: ?include_attributes filter is handled by ResourceController._get_all.
         """
         if exclude_attributes:
             exclude_fields = exclude_attributes.split(',')
@@ -413,7 +486,15 @@ class ActionExecutionsController(ActionExecutionsControllerMixin, ResourceContro
 
         exclude_fields = self._validate_exclude_fields(exclude_fields=exclude_fields)
 
-        return self._get_one(id=id, exclude_fields=exclude_fields)
+        execution_api = self._get_one(id=id, exclude_fields=exclude_fields)
+
+        # Note: List responses only include the inline preview of large (offloaded) results
+        result = getattr(execution_api, 'result', None)
+
+        if execution_results.is_offloaded_result(result):
+            execution_api.result = execution_results.load_result(result)
+
+        return execution_api
 
     @jsexpose(body_cls=LiveActionAPI, status_code=http_client.CREATED)
     def post(self, liveaction):
@@ -52,6 +52,8 @@ class RuleEnforcementController(resource.ResourceController):
         'sort': ['-enforced_at', 'rule.ref']
     }
 
+    cursor_field = 'enforced_at'
+
     supported_filters = SUPPORTED_FILTERS
     filter_transform_functions = {
         'enforced_at': lambda value: isotime.parse(value=value),
@@ -35,3 +35,5 @@ class TracesController(ResourceController):
     query_options = {
         'sort': ['trace_tag']
     }
+
+    cursor_field = 'start_timestamp'
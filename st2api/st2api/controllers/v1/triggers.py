@@ -369,6 +369,19 @@ class TriggerInstanceController(TriggerInstanceControllerMixin, resource.Resourc
         'sort': ['-occurrence_time', 'trigger']
     }
 
+    cursor_field = 'occurrence_time'
+
+    # A list of attributes which can be specified using ?include_attributes filter
+    valid_include_attributes = [
+        'id',
+        'trigger',
+        'occurrence_time',
+        'payload'
+    ]
+
+    # occurrence_time is needed for the cursor based pagination
+    mandatory_include_fields = ['id', 'occurrence_time']
+
     def __init__(self):
         super(TriggerInstanceController, self).__init__()
 
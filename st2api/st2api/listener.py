@@ -21,7 +21,11 @@ from oslo_config import cfg
 
 from st2common.models.api.action import LiveActionAPI
 from st2common.models.api.execution import ActionExecutionAPI
+from st2common.persistence.execution import ActionExecution
+from st2common.persistence.liveaction import LiveAction
 from st2common.transport import announcement, liveaction, execution, publishers
+from st2common.transport import codec
+from st2common.transport.delta import ModelUpdateDelta
 from st2common.transport import utils as transport_utils
 from st2common import log as logging
 
@@ -46,29 +50,40 @@ class Listener(ConsumerMixin):
         return [
             consumer(queues=[announcement.get_queue(routing_key=publishers.ANY_RK,
                                                     exclusive=True)],
-                     accept=['pickle'],
+                     accept=codec.get_accepted_codecs(),
                      callbacks=[self.processor()]),
 
             consumer(queues=[execution.get_queue(routing_key=publishers.ANY_RK,
                                                  exclusive=True)],
-                     accept=['pickle'],
-                     callbacks=[self.processor(ActionExecutionAPI)]),
+                     accept=codec.get_accepted_codecs(),
+                     callbacks=[self.processor(ActionExecutionAPI, ActionExecution)]),
 
             consumer(queues=[Queue(None,
                                    liveaction.LIVEACTION_XCHG,
                                    routing_key=publishers.ANY_RK,
                                    exclusive=True)],
-                     accept=['pickle'],
-                     callbacks=[self.processor(LiveActionAPI)])
+                     accept=codec.get_accepted_codecs(),
+                     callbacks=[self.processor(LiveActionAPI, LiveAction)])
         ]
 
-    def processor(self, model=None):
+    def processor(self, model=None, access_cls=None):
         def process(body, message):
             from_model_kwargs = {'mask_secrets': cfg.CONF.api.mask_secrets}
             meta = message.delivery_info
             event_name = '%s__%s' % (meta.get('exchange'), meta.get('routing_key'))
 
             try:
+                if isinstance(body, ModelUpdateDelta):
+                    # Stream clients receive full objects. Only retrieve them if there are any
+                    # clients connected.
+                    if not self.queues:
+                        return
+
+                    body = access_cls.get_by_update_event(body)
+
+                    if not body:
+                        return
+
                 if model:
                     body = model.from_model(body, **from_model_kwargs)
 
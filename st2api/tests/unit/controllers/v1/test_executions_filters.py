@@ -18,7 +18,10 @@ import random
 import datetime
 
 import bson
+import mock
 import six
+from oslo_config import cfg
+from pymongo.collection import Collection
 from six.moves import http_client
 
 from tests import FunctionalTest
@@ -115,6 +118,78 @@ class TestActionExecutionFilters(FunctionalTest):
         self.assertEqual(response.status_int, 200)
         self.assertFalse('result' in response.json[0])
 
+    def test_get_all_include_attributes(self):
+        path = '/v1/executions?action=executions.local&limit=1&include_attributes=status,result'
+        response = self.app.get(path)
+
+        self.assertEqual(response.status_int, 200)
+        self.assertEqual(len(response.json), 1)
+        self.assertItemsEqual(response.json[0].keys(), ['id', 'status', 'result'])
+
+        # Parameters require action and runner for masking the secrets
+        path = '/v1/executions?action=executions.local&limit=1&include_attributes=parameters'
+        response = self.app.get(path)
+
+        self.assertEqual(response.status_int, 200)
+        self.assertTrue('action' in response.json[0])
+        self.assertTrue('runner' in response.json[0])
+        self.assertFalse('result' in response.json[0])
+
+    def test_get_all_include_attributes_invalid(self):
+        path = '/v1/executions?include_attributes=invalid'
+        response = self.app.get(path, expect_errors=True)
+        self.assertEqual(response.status_int, 400)
+
+        path = '/v1/executions?include_attributes=status&exclude_attributes=result'
+        response = self.app.get(path, expect_errors=True)
+        self.assertEqual(response.status_int, 400)
+
+    def test_get_all_cursor_pagination(self):
+        ids = []
+        timestamps = []
+        cursor = ''
+
+        for _ in range(0, 4):
+            response = self.app.get('/v1/executions?limit=30&cursor=%s' % (cursor))
+            self.assertEqual(response.status_int, 200)
+            self.assertEqual(response.headers['X-Total-Count'], str(self.num_records))
+
+            ids.extend([item['id'] for item in response.json])
+            timestamps.extend([isotime.parse(item['start_timestamp'])
+                               for item in response.json])
+            cursor = response.headers.get('X-Next-Cursor', None)
+
+            if len(ids) < self.num_records:
+                self.assertEqual(len(response.json), 30)
+                self.assertTrue(cursor)
+
+        self.assertEqual(len(response.json), 10)
+        self.assertEqual(cursor, None)
+        self.assertListEqual(sorted(ids), sorted(self.refs.keys()))
+        self.assertListEqual(timestamps, list(reversed(self.start_timestamps)))
+
+    def test_get_all_estimated_total_count(self):
+        cfg.CONF.set_override(name='estimated_total_count', override=True, group='api')
+        self.addCleanup(cfg.CONF.clear_override, name='estimated_total_count', group='api')
+
+        with mock.patch.object(Collection, 'count', mock.MagicMock(return_value=12345)):
+            # Request without filters (default sort order is not a filter) uses the estimate
+            response = self.app.get('/v1/executions?limit=1')
+            self.assertEqual(response.status_int, 200)
+            self.assertEqual(response.headers['X-Total-Count'], '12345')
+
+            # Filtered request uses the exact count
+            response = self.app.get('/v1/executions?action=executions.local&limit=1')
+            self.assertEqual(response.status_int, 200)
+            self.assertNotEqual(response.headers['X-Total-Count'], '12345')
+
+    def test_get_all_cursor_pagination_invalid(self):
+        response = self.app.get('/v1/executions?cursor=invalid', expect_errors=True)
+        self.assertEqual(response.status_int, 400)
+
+        response = self.app.get('/v1/executions?cursor=&offset=10', expect_errors=True)
+        self.assertEqual(response.status_int, 400)
+
     def test_get_one(self):
         obj_id = random.choice(self.refs.keys())
         response = self.app.get('/v1/executions/%s' % obj_id)
@@ -26,12 +26,15 @@ except ImportError:
     import json
 import st2common.validators.api.action as action_validator
 
+from oslo_config import cfg
 from six.moves import filter
 from st2common.util import isotime
 from st2common.util import date as date_utils
 from st2common.models.db.auth import TokenDB
 from st2common.persistence.auth import Token
+from st2common.persistence.execution import ActionExecution
 from st2common.persistence.trace import Trace
+from st2common.services import execution_results
 from st2common.services import trace as trace_service
 from st2common.transport.publishers import PoolPublisher
 from st2tests.fixturesloader import FixturesLoader
@@ -259,6 +262,44 @@ class TestActionExecutionController(FunctionalTest):
         resp = self.app.get('/v1/executions/100', expect_errors=True)
         self.assertEqual(resp.status_int, 404)
 
+    def test_get_result(self):
+        actionexecution_id = self._get_actionexecution_id(self._do_post(LIVE_ACTION_1))
+
+        # Result stored inline
+        execution_db = ActionExecution.get_by_id(actionexecution_id)
+        ActionExecution.find_and_update(query={'id': execution_db.id}, publish=False,
+                                        set__result={'stdout': 'small'})
+
+        resp = self.app.get('/v1/executions/%s/result' % actionexecution_id)
+        self.assertEqual(resp.status_int, 200)
+        self.assertDictEqual(resp.json, {'stdout': 'small'})
+
+        # Offloaded result
+        cfg.CONF.set_override(name='result_offload_threshold', override=100, group='executions')
+        self.addCleanup(cfg.CONF.clear_override, name='result_offload_threshold',
+                        group='executions')
+
+        result = {'stdout': 'a' * 1000}
+        ActionExecution.find_and_update(query={'id': execution_db.id}, publish=False,
+                                        set__result=execution_results.offload_result(result))
+
+        resp = self.app.get('/v1/executions/%s/result' % actionexecution_id)
+        self.assertEqual(resp.status_int, 200)
+        self.assertDictEqual(resp.json, result)
+
+        resp = self.app.get('/v1/executions/%s/result' % actionexecution_id,
+                            headers={'Range': 'bytes=0-11'})
+        self.assertEqual(resp.status_int, 206)
+        self.assertEqual(resp.body, '{"stdout": "')
+
+        # Full result is returned for a single execution, list only contains the preview
+        resp = self._do_get_one(actionexecution_id)
+        self.assertDictEqual(resp.json['result'], result)
+
+        resp = self.app.get('/v1/executions?limit=1')
+        self.assertEqual(resp.json[0]['id'], actionexecution_id)
+        self.assertTrue(execution_results.is_offloaded_result(resp.json[0]['result']))
+
     def test_post_delete(self):
         post_resp = self._do_post(LIVE_ACTION_1)
         self.assertEqual(post_resp.status_int, 201)
@@ -46,6 +46,14 @@ class TestTriggerController(FunctionalTest):
         self.assertEqual(resp.status_int, http_client.OK)
         self.assertEqual(len(resp.json), limit, 'Get all failure. Length doesn\'t match limit.')
 
+    def test_get_all_include_attributes(self):
+        resp = self.app.get('/v1/triggerinstances?include_attributes=trigger')
+        self.assertEqual(resp.status_int, http_client.OK)
+        self.assertEqual(len(resp.json), self.triggerinstance_count)
+
+        for instance in resp.json:
+            self.assertEqual(sorted(instance.keys()), ['id', 'occurrence_time', 'trigger'])
+
     def test_get_all_filter_by_trigger(self):
         trigger = 'dummy_pack_1.st2.test.trigger0'
         resp = self.app.get('/v1/triggerinstances?trigger=%s' % trigger)
@@ -32,3 +32,17 @@ class StackStormDBObjectConflictError(StackStormBaseException):
         super(StackStormDBObjectConflictError, self).__init__(message)
         self.conflict_id = conflict_id
         self.model_object = model_object
+
+
+class StackStormDBBulkWriteError(StackStormBaseException):
+    """
+    Exception raised when some of the objects in a bulk write couldn't be written.
+
+    Errors maps index of each object which couldn't be written to the exception
+    (StackStormDBObjectConflictError on a conflict) and model_objects contains the objects
+    which have been written.
+    """
+    def __init__(self, message, errors, model_objects):
+        super(StackStormDBBulkWriteError, self).__init__(message)
+        self.errors = errors
+        self.model_objects = model_objects
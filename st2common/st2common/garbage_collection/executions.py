@@ -25,6 +25,8 @@ from mongoengine.errors import InvalidQueryError
 from st2common.constants import action as action_constants
 from st2common.persistence.liveaction import LiveAction
 from st2common.persistence.execution import ActionExecution
+from st2common.services import execution_results
+from st2common.services.execution_results import OFFLOADED_RESULT_KEY
 
 __all__ = [
     'purge_executions'
@@ -70,6 +72,18 @@ def purge_executions(logger, timestamp, action_ref=None, purge_incomplete=False)
     if action_ref:
         liveaction_filters['action'] = action_ref
 
+    # Offloaded results are stored outside of the liveaction and execution documents so they
+    # need to be deleted explicitly
+    offloaded_filters = copy.deepcopy(liveaction_filters)
+    offloaded_filters['__raw__'] = {'result.%s' % (OFFLOADED_RESULT_KEY): {'$exists': True}}
+
+    try:
+        for liveaction_db in LiveAction.query(only_fields=['result'], **offloaded_filters):
+            execution_results.delete_result(liveaction_db.result)
+    except:
+        logger.exception('Deletion of offloaded results failed for query with filters: %s.',
+                         offloaded_filters)
+
     # TODO: Update this code to return statistics on deleted objects once we
     # upgrade to newer version of MongoDB where delete_by_query actually returns
     # some data
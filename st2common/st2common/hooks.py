@@ -88,7 +88,7 @@ class CorsHook(PecanHook):
         request_headers_allowed = ['Content-Type', 'Authorization', 'X-Auth-Token',
                                    HEADER_API_KEY_ATTRIBUTE_NAME, REQUEST_ID_HEADER]
         response_headers_allowed = ['Content-Type', 'X-Limit', 'X-Total-Count',
-                                    REQUEST_ID_HEADER]
+                                    'X-Next-Cursor', REQUEST_ID_HEADER]
 
         headers['Access-Control-Allow-Origin'] = origin_allowed
         headers['Access-Control-Allow-Methods'] = ','.join(methods_allowed)
@@ -22,6 +22,7 @@ import inspect
 import jsonschema
 import six
 from six.moves import http_client
+import webob
 from webob import exc
 import pecan
 import traceback
@@ -80,9 +81,11 @@ class BaseAPI(object):
         schema = getattr(self, 'schema', {})
         attributes = vars(self)
 
-        cleaned = util_schema.validate(instance=attributes, schema=schema,
-                                       cls=util_schema.CustomValidator, use_default=True,
-                                       allow_default_none=True)
+        validator = util_schema.get_schema_validator(schema=schema,
+                                                     cls=util_schema.CustomValidator,
+                                                     use_default=True, allow_default_none=True,
+                                                     key=self.__class__.__name__)
+        cleaned = validator.validate(attributes)
 
         return self.__class__(**cleaned)
 
@@ -243,6 +246,9 @@ def jsexpose(arg_types=None, body_cls=None, status_code=None, content_type='appl
 
             if status_code:
                 pecan.response.status = status_code
+            if isinstance(result, webob.Response):
+                # Controller constructed the response itself (e.g. streamed response)
+                return result
             if content_type == 'application/json':
                 if is_debugging_enabled():
                     indent = 4
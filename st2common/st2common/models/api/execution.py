@@ -16,6 +16,7 @@
 import copy
 
 import six
+from oslo_config import cfg
 
 from st2common.constants.action import LIVEACTION_STATUSES
 from st2common.util import isotime
@@ -24,6 +25,7 @@ from st2common.models.db.execution import ActionExecutionDB
 from st2common.models.api.trigger import TriggerTypeAPI, TriggerAPI, TriggerInstanceAPI
 from st2common.models.api.rule import RuleAPI
 from st2common.models.api.action import RunnerTypeAPI, ActionAPI, LiveActionAPI
+from st2common.services import execution_snapshots
 from st2common import log as logging
 
 
@@ -105,16 +107,37 @@ class ActionExecutionAPI(BaseAPI):
                 "type": "array",
                 "items": {"type": "string"},
                 "uniqueItems": True
+            },
+            "ancestors": {
+                "type": "array",
+                "items": {"type": "string"}
             }
         },
         "additionalProperties": False
     }
 
+    @classmethod
+    def _from_model(cls, model, mask_secrets=False):
+        doc = super(ActionExecutionAPI, cls)._from_model(model, mask_secrets=False)
+
+        # Definitions stored as snapshots need to be resolved before masking the secrets
+        doc = execution_snapshots.resolve_snapshot_references(doc)
+
+        if mask_secrets and cfg.CONF.log.mask_secrets:
+            doc = model.mask_secrets(value=doc)
+
+        return doc
+
     @classmethod
     def from_model(cls, model, mask_secrets=False):
         doc = cls._from_model(model, mask_secrets=mask_secrets)
-        start_timestamp = isotime.format(model.start_timestamp, offset=False)
-        doc['start_timestamp'] = start_timestamp
+
+        # Note: start_timestamp is not retrieved from the database if the object has been
+        # retrieved with a projection
+        start_timestamp = model.start_timestamp
+        if start_timestamp:
+            start_timestamp = isotime.format(start_timestamp, offset=False)
+            doc['start_timestamp'] = start_timestamp
 
         end_timestamp = model.end_timestamp
         if end_timestamp:
@@ -179,7 +179,12 @@ class TriggerInstanceAPI(BaseAPI):
     @classmethod
     def from_model(cls, model, mask_secrets=False):
         instance = cls._from_model(model, mask_secrets=mask_secrets)
-        instance['occurrence_time'] = isotime.format(instance['occurrence_time'], offset=False)
+
+        # Note: occurrence_time is not retrieved from the database if the object has been
+        # retrieved with a projection which doesn't include it
+        if instance.get('occurrence_time', None):
+            instance['occurrence_time'] = isotime.format(instance['occurrence_time'],
+                                                         offset=False)
         return cls(**instance)
 
     @classmethod
@@ -16,8 +16,11 @@
 import copy
 import importlib
 
+import bson
 import six
 import mongoengine
+from pymongo.errors import BulkWriteError
+from mongoengine.queryset import transform
 
 from st2common import log as logging
 from st2common.util import isotime
@@ -27,6 +30,9 @@ from st2common.models.utils.profiling import log_query_and_profile_data_for_quer
 
 LOG = logging.getLogger(__name__)
 
+# MongoDB error codes for unique index violations
+DUPLICATE_KEY_ERROR_CODES = [11000, 11001]
+
 MODEL_MODULE_NAMES = [
     'st2common.models.db.auth',
     'st2common.models.db.action',
@@ -111,7 +117,7 @@ class MongoDBAccess(object):
     def get_by_ref(self, value):
         return self.get(ref=value, raise_exception=True)
 
-    def get(self, exclude_fields=None, *args, **kwargs):
+    def get(self, exclude_fields=None, only_fields=None, *args, **kwargs):
         raise_exception = kwargs.pop('raise_exception', False)
 
         instances = self.model.objects(**kwargs)
@@ -119,6 +125,9 @@ class MongoDBAccess(object):
         if exclude_fields:
             instances = instances.exclude(*exclude_fields)
 
+        if only_fields:
+            instances = instances.only(*only_fields)
+
         instance = instances[0] if instances else None
         log_query_and_profile_data_for_queryset(queryset=instances)
 
@@ -135,9 +144,17 @@ class MongoDBAccess(object):
         return result
 
     def query(self, offset=0, limit=None, order_by=None, exclude_fields=None,
-              **filters):
+              only_fields=None, **filters):
+        """
+        :param exclude_fields: A list of fields which are not retrieved from the database.
+        :type exclude_fields: ``list``
+
+        :param only_fields: If provided, only those fields are retrieved from the database.
+        :type only_fields: ``list``
+        """
         order_by = order_by or []
         exclude_fields = exclude_fields or []
+        only_fields = only_fields or []
         eop = offset + int(limit) if limit else None
 
         # Process the filters
@@ -151,6 +168,9 @@ class MongoDBAccess(object):
         if exclude_fields:
             result = result.exclude(*exclude_fields)
 
+        if only_fields:
+            result = result.only(*only_fields)
+
         result = result.order_by(*order_by)
         result = result[offset:eop]
         log_query_and_profile_data_for_queryset(queryset=result)
@@ -170,6 +190,71 @@ class MongoDBAccess(object):
         instance = self.model.objects.insert(instance)
         return self._undo_dict_field_escape(instance)
 
+    def insert_many(self, instances):
+        """
+        Insert multiple documents using a single unordered bulk operation.
+
+        :return: Tuple of (instances, errors) where errors maps index of a document which couldn't
+                 be written to the exception.
+        :rtype: ``tuple``
+        """
+        return self.bulk_write(instances=instances, upsert=False)
+
+    def bulk_write(self, instances, upsert=True):
+        """
+        Write multiple documents using a single unordered bulk operation. Documents without an id
+        are inserted and, if upsert is True, documents with an id replace the existing document
+        with the same id (or are inserted if it doesn't exist).
+
+        Other documents are still written if writing one of the documents fails.
+
+        :return: Tuple of (instances, errors) where errors maps index of a document which couldn't
+                 be written to the exception (NotUniqueError for unique constraint violations).
+        :rtype: ``tuple``
+        """
+        if not instances:
+            return instances, {}
+
+        for instance in instances:
+            if instance.id and not upsert:
+                raise ValueError('id for object %s was unexpected.' % instance)
+
+            # Note: Unlike save(), bulk write doesn't validate the documents
+            instance.validate()
+
+        bulk = self.model._get_collection().initialize_unordered_bulk_op()
+        inserted = set([])
+
+        for index, instance in enumerate(instances):
+            document = instance.to_mongo()
+
+            if instance.id:
+                bulk.find({'_id': instance.id}).upsert().replace_one(document)
+            else:
+                document['_id'] = bson.ObjectId()
+                instance.id = document['_id']
+                inserted.add(index)
+                bulk.insert(document)
+
+        errors = {}
+
+        try:
+            bulk.execute()
+        except BulkWriteError as e:
+            for write_error in e.details.get('writeErrors', []):
+                index = write_error['index']
+                message = write_error.get('errmsg', '')
+
+                if write_error.get('code', None) in DUPLICATE_KEY_ERROR_CODES:
+                    errors[index] = mongoengine.NotUniqueError(message)
+                else:
+                    errors[index] = mongoengine.OperationError(message)
+
+                if index in inserted:
+                    instances[index].id = None
+
+        return instances, errors
+
     def add_or_update(self, instance):
         instance.save()
         return self._undo_dict_field_escape(instance)
@@ -177,6 +262,31 @@ class MongoDBAccess(object):
     def update(self, instance, **kwargs):
         return instance.update(**kwargs)
 
+    def find_and_update(self, query, **kwargs):
+        """
+        Atomically update a single document which matches the provided query and return the
+        updated document.
+
+        Only the provided update operators (e.g. set__status, push__children,
+        add_to_set__tags) are sent to the database so the rest of the document is not
+        rewritten.
+
+        :param query: Filters in the mongoengine query syntax.
+        :type query: ``dict``
+
+        :return: Updated document or None if no document matched the query.
+        """
+        spec = self.model.objects(**query)._query
+        update = transform.update(self.model, **kwargs)
+
+        result = self.model._get_collection().find_and_modify(query=spec, update=update,
+                                                              new=True)
+
+        if not result:
+            return None
+
+        return self.model._from_son(result)
+
     def delete(self, instance):
         return instance.delete()
 
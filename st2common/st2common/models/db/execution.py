@@ -26,7 +26,8 @@ from st2common.util.secrets import mask_secret_parameters
 from st2common.constants.types import ResourceType
 
 __all__ = [
-    'ActionExecutionDB'
+    'ActionExecutionDB',
+    'ActionExecutionSnapshotDB'
 ]
 
 
@@ -65,6 +66,9 @@ class ActionExecutionDB(stormbase.StormFoundationDB):
         help_text='Contextual information on the action execution.')
     parent = me.StringField()
     children = me.ListField(field=me.StringField())
+    ancestors = me.ListField(
+        field=me.StringField(),
+        help_text='IDs of all the ancestor executions, starting with the root execution.')
 
     meta = {
         'indexes': [
@@ -75,7 +79,9 @@ class ActionExecutionDB(stormbase.StormFoundationDB):
             {'fields': ['end_timestamp']},
             {'fields': ['status']},
             {'fields': ['parent']},
-            {'fields': ['-start_timestamp', 'action.ref', 'status']}
+            {'fields': ['ancestors']},
+            {'fields': ['-start_timestamp', 'action.ref', 'status']},
+            {'fields': ['-start_timestamp', '-id']}
         ]
     }
 
@@ -87,7 +93,12 @@ class ActionExecutionDB(stormbase.StormFoundationDB):
     def mask_secrets(self, value):
         result = copy.deepcopy(value)
 
-        execution_parameters = value['parameters']
+        execution_parameters = value.get('parameters', None)
+
+        if not execution_parameters:
+            # Parameters have not been retrieved (projection) or there are none
+            return result
+
         parameters = {}
         # pylint: disable=no-member
         parameters.update(value.get('action', {}).get('parameters', {}))
@@ -108,4 +119,21 @@ class ActionExecutionDB(stormbase.StormFoundationDB):
         return serializable_dict['parameters']
 
 
-MODELS = [ActionExecutionDB]
+class ActionExecutionSnapshotDB(stormbase.StormFoundationDB):
+    """
+    Copy of a resource definition (action, runner type, rule, trigger or trigger type) referenced
+    by executions. Snapshots are immutable and identical definitions are stored only once, keyed
+    by the hash of the content.
+    """
+    hash = me.StringField(
+        required=True,
+        unique=True,
+        help_text='Hash of the definition.')
+    resource_type = me.StringField(
+        required=True,
+        help_text='Name of the execution attribute the definition belongs to.')
+    value = stormbase.EscapedDictField(
+        help_text='Resource definition.')
+
+
+MODELS = [ActionExecutionDB, ActionExecutionSnapshotDB]
@@ -54,6 +54,7 @@ class RuleEnforcementDB(stormbase.StormFoundationDB, stormbase.TagsMixin):
     meta = {
         'indexes': [
             {'fields': ['rule.ref']},
+            {'fields': ['-enforced_at', '-id']}
         ]
     }
 
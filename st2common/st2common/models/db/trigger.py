@@ -112,7 +112,8 @@ class TriggerInstanceDB(stormbase.StormFoundationDB):
         'indexes': [
             {'fields': ['occurrence_time']},
             {'fields': ['trigger']},
-            {'fields': ['-occurrence_time', 'trigger']}
+            {'fields': ['-occurrence_time', 'trigger']},
+            {'fields': ['-occurrence_time', '-id']}
         ]
     }
 
@@ -15,6 +15,8 @@
 
 import re
 
+import six
+
 from st2common.util import date as date_utils
 
 __all__ = [
@@ -116,7 +118,13 @@ def greater_than(value, criteria_pattern):
 def match_regex(value, criteria_pattern):
     if criteria_pattern is None:
         return False
-    regex = re.compile(criteria_pattern)
+
+    if isinstance(criteria_pattern, six.string_types):
+        regex = re.compile(criteria_pattern)
+    else:
+        # Already compiled pattern
+        regex = criteria_pattern
+
     # check for a match and not for details of the match.
     return regex.match(value) is not None
 
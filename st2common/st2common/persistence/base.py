@@ -17,10 +17,14 @@ import abc
 
 import six
 from mongoengine import NotUniqueError
+from oslo_config import cfg
 
 from st2common import log as logging
+from st2common.exceptions.db import StackStormDBBulkWriteError
 from st2common.exceptions.db import StackStormDBObjectConflictError
 from st2common.models.system.common import ResourceReference
+from st2common.persistence.cache import get_resource_cache
+from st2common.transport import delta as delta_utils
 from st2common.transport.reactor import TriggerDispatcher
 
 
@@ -50,6 +54,20 @@ class Access(object):
     # used when dispatching a trigger
     operation_to_trigger_ref_map = {}
 
+    # Maps name of a cached lookup (e.g. ref) to a function which returns a cache key for a model
+    # object. Results of those lookups are kept in a process wide read-through cache (see
+    # st2common.persistence.cache)
+    cached_lookups = {}
+
+    # If set, update events for this resource are published as a slim ModelUpdateDelta (see
+    # st2common.transport.delta) which always includes the listed attributes when the
+    # messaging.slim_update_events option is enabled
+    update_event_fields = []
+
+    # Attributes which are not included in the update events even if they have changed.
+    # Consumers which need them retrieve the object from the database.
+    update_event_lazy_fields = []
+
     @classmethod
     @abc.abstractmethod
     def _get_impl(cls):
@@ -123,13 +141,9 @@ class Access(object):
                 LOG.debug('Conflict while trying to save in DB.', exc_info=True)
             else:
                 LOG.exception('Conflict while trying to save in DB.')
-            # On a conflict determine the conflicting object and return its id in
-            # the raised exception.
-            conflict_object = cls._get_by_object(model_object)
-            conflict_id = str(conflict_object.id) if conflict_object else None
-            message = str(e)
-            raise StackStormDBObjectConflictError(message=message, conflict_id=conflict_id,
-                                                  model_object=model_object)
+            raise cls._get_conflict_error(model_object=model_object, error=e)
+
+        cls._invalidate_caches(model_object)
 
         # Publish internal event on the message bus
         if publish:
@@ -151,6 +165,7 @@ class Access(object):
     def add_or_update(cls, model_object, publish=True, dispatch_trigger=True,
                       log_not_unique_error_as_debug=False):
         pre_persist_id = model_object.id
+        changed_fields = delta_utils.get_changed_fields(model_object)
         try:
             model_object = cls._get_impl().add_or_update(model_object)
         except NotUniqueError as e:
@@ -158,21 +173,17 @@ class Access(object):
                 LOG.debug('Conflict while trying to save in DB.', exc_info=True)
             else:
                 LOG.exception('Conflict while trying to save in DB.')
-            # On a conflict determine the conflicting object and return its id in
-            # the raised exception.
-            conflict_object = cls._get_by_object(model_object)
-            conflict_id = str(conflict_object.id) if conflict_object else None
-            message = str(e)
-            raise StackStormDBObjectConflictError(message=message, conflict_id=conflict_id,
-                                                  model_object=model_object)
+            raise cls._get_conflict_error(model_object=model_object, error=e)
 
         is_update = str(pre_persist_id) == str(model_object.id)
 
+        cls._invalidate_caches(model_object)
+
         # Publish internal event on the message bus
         if publish:
             try:
                 if is_update:
-                    cls.publish_update(model_object)
+                    cls.publish_update(model_object, changed_fields=changed_fields)
                 else:
                     cls.publish_create(model_object)
             except:
@@ -190,6 +201,87 @@ class Access(object):
 
         return model_object
 
+    @classmethod
+    def insert_many(cls, model_objects, publish=True, dispatch_trigger=True):
+        """
+        Insert multiple objects using a single bulk write. Create events for the inserted objects
+        are published as a single batch.
+
+        :raises StackStormDBBulkWriteError: If some of the objects couldn't be inserted. The other
+                                            objects are still inserted.
+        """
+        for model_object in model_objects:
+            if model_object.id:
+                raise ValueError('id for object %s was unexpected.' % model_object)
+
+        return cls.bulk_write(model_objects, publish=publish, dispatch_trigger=dispatch_trigger)
+
+    @classmethod
+    def bulk_write(cls, model_objects, publish=True, dispatch_trigger=True):
+        """
+        Insert or update multiple objects using a single bulk write. Objects without an id are
+        inserted and objects with an id replace the stored object. Create and update events are
+        published as a single batch.
+
+        :raises StackStormDBBulkWriteError: If some of the objects couldn't be written. The other
+                                            objects are still written.
+        """
+        model_objects = list(model_objects)
+        is_update = [bool(model_object.id) for model_object in model_objects]
+        changed_fields = [delta_utils.get_changed_fields(model_object)
+                          for model_object in model_objects]
+
+        model_objects, errors = cls._get_impl().bulk_write(model_objects)
+
+        created, updated, updated_changed_fields, written = [], [], [], []
+
+        for index, model_object in enumerate(model_objects):
+            if index in errors:
+                continue
+
+            written.append(model_object)
+            cls._invalidate_caches(model_object)
+
+            if is_update[index]:
+                updated.append(model_object)
+                updated_changed_fields.append(changed_fields[index])
+            else:
+                created.append(model_object)
+
+        # Publish internal events on the message bus
+        if publish:
+            try:
+                if created:
+                    cls.publish_create_many(created)
+                if updated:
+                    cls.publish_update_many(updated, changed_fields=updated_changed_fields)
+            except:
+                LOG.exception('Publish failed.')
+
+        # Dispatch triggers
+        if dispatch_trigger:
+            for model_object in created:
+                try:
+                    cls.dispatch_create_trigger(model_object)
+                except:
+                    LOG.exception('Trigger dispatch failed.')
+
+            for model_object in updated:
+                try:
+                    cls.dispatch_update_trigger(model_object)
+                except:
+                    LOG.exception('Trigger dispatch failed.')
+
+        if errors:
+            errors = {index: cls._get_bulk_write_error(model_objects[index], error)
+                      for index, error in six.iteritems(errors)}
+            message = 'Failed to write %s out of %s objects.' % (len(errors), len(model_objects))
+            LOG.error('%s Errors: %s', message, errors)
+            raise StackStormDBBulkWriteError(message=message, errors=errors,
+                                             model_objects=written)
+
+        return written
+
     @classmethod
     def update(cls, model_object, publish=True, dispatch_trigger=True, **kwargs):
         """
@@ -197,16 +289,40 @@ class Access(object):
         * upsert=False is desired
         * special operators like push, push_all are to be used.
         """
-        cls._get_impl().update(model_object, **kwargs)
-        # update does not return the object but a flag; likely success/fail but docs
-        # are not very good on this one so ignoring. Explicitly get the object from
-        # DB abd return.
-        model_object = cls.get_by_id(model_object.id)
+        updated_object = cls.find_and_update(query={'id': model_object.id}, publish=publish,
+                                             dispatch_trigger=dispatch_trigger, **kwargs)
+
+        if not updated_object:
+            raise ValueError('Unable to find the %s instance. %s' %
+                             (model_object.__class__.__name__, {'id': model_object.id}))
+
+        return updated_object
+
+    @classmethod
+    def find_and_update(cls, query, publish=True, dispatch_trigger=True, **kwargs):
+        """
+        Atomically apply the provided update operators (e.g. set__status=..., push__children=...,
+        add_to_set__tags=...) to a single object which matches the query and return the updated
+        object. Only the updated attributes are written.
+
+        :param query: Filters in the mongoengine query syntax (e.g. {'id': ...,
+                      'status__ne': ...}).
+        :type query: ``dict``
+
+        :return: Updated object or None if no object matched the query.
+        """
+        model_object = cls._get_impl().find_and_update(query=query, **kwargs)
+
+        if not model_object:
+            return None
+
+        cls._invalidate_caches(model_object)
 
         # Publish internal event on the message bus
         if publish:
             try:
-                cls.publish_update(model_object)
+                changed_fields = delta_utils.get_updated_fields(kwargs)
+                cls.publish_update(model_object, changed_fields=changed_fields)
             except:
                 LOG.exception('Publish failed.')
 
@@ -223,6 +339,8 @@ class Access(object):
     def delete(cls, model_object, publish=True, dispatch_trigger=True):
         persisted_object = cls._get_impl().delete(model_object)
 
+        cls._invalidate_caches(model_object)
+
         # Publish internal event on the message bus
         if publish:
             try:
@@ -239,6 +357,62 @@ class Access(object):
 
         return persisted_object
 
+    @classmethod
+    def _get_bulk_write_error(cls, model_object, error):
+        if isinstance(error, NotUniqueError):
+            return cls._get_conflict_error(model_object=model_object, error=error)
+
+        return error
+
+    @classmethod
+    def _get_conflict_error(cls, model_object, error):
+        # On a conflict determine the conflicting object and return its id in the exception
+        conflict_object = cls._get_by_object(model_object)
+        conflict_id = str(conflict_object.id) if conflict_object else None
+        message = str(error)
+        return StackStormDBObjectConflictError(message=message, conflict_id=conflict_id,
+                                               model_object=model_object)
+
+    ###############################################
+    # Read-through cache related methods
+    ###############################################
+
+    @classmethod
+    def _get_cache(cls, lookup):
+        """
+        Return cache for the provided lookup or None if the lookup is not cached.
+        """
+        key_func = cls.cached_lookups.get(lookup, None)
+
+        if not key_func:
+            return None
+
+        name = '%s.%s' % (cls.__name__, lookup)
+        return get_resource_cache(name=name, model_cls=cls._get_impl().model, key_func=key_func)
+
+    @classmethod
+    def _get_cached(cls, lookup, key, loader):
+        """
+        Return result of the provided lookup from the cache, retrieving it using the provided
+        loader function if it's not cached or caching is disabled.
+
+        Note: Returned objects are shared and must not be modified.
+        """
+        cache = cls._get_cache(lookup=lookup)
+
+        if not cache:
+            return loader()
+
+        return cache.get(key=key, loader=loader)
+
+    @classmethod
+    def _invalidate_caches(cls, model_object):
+        for lookup in cls.cached_lookups:
+            cache = cls._get_cache(lookup=lookup)
+
+            if cache:
+                cache.invalidate(model_object)
+
     ####################################################
     # Internal event bus message publish related methods
     ####################################################
@@ -250,10 +424,59 @@ class Access(object):
             publisher.publish_create(model_object)
 
     @classmethod
-    def publish_update(cls, model_object):
+    def publish_update(cls, model_object, changed_fields=None):
+        """
+        :param changed_fields: Names of the changed top-level attributes if known.
+        :type changed_fields: ``list``
+        """
+        publisher = cls._get_publisher()
+        if publisher:
+            publisher.publish_update(cls._get_update_event(model_object, changed_fields))
+
+    @classmethod
+    def publish_create_many(cls, model_objects):
         publisher = cls._get_publisher()
         if publisher:
-            publisher.publish_update(model_object)
+            publisher.publish_create_many(model_objects)
+
+    @classmethod
+    def publish_update_many(cls, model_objects, changed_fields=None):
+        """
+        :param changed_fields: Names of the changed top-level attributes for each object if
+                               known.
+        :type changed_fields: ``list`` of ``list``
+        """
+        publisher = cls._get_publisher()
+        if publisher:
+            changed_fields = changed_fields or [None] * len(model_objects)
+            events = [cls._get_update_event(model_object, fields)
+                      for model_object, fields in zip(model_objects, changed_fields)]
+            publisher.publish_update_many(events)
+
+    @classmethod
+    def _get_update_event(cls, model_object, changed_fields=None):
+        """
+        Return update event payload for the provided object - either the object itself or a slim
+        delta if the resource supports it and slim update events are enabled.
+        """
+        if not cls.update_event_fields or not cfg.CONF.messaging.slim_update_events:
+            return model_object
+
+        return delta_utils.ModelUpdateDelta.from_model(model_object,
+                                                       fields=cls.update_event_fields,
+                                                       lazy_fields=cls.update_event_lazy_fields,
+                                                       changed_fields=changed_fields)
+
+    @classmethod
+    def get_by_update_event(cls, body):
+        """
+        Return full model object for the provided update event body. Object is retrieved from the
+        database if the event is a slim delta.
+        """
+        if isinstance(body, delta_utils.ModelUpdateDelta):
+            return cls.get_by_id(body.id)
+
+        return body
 
     @classmethod
     def publish_delete(cls, model_object):
@@ -330,6 +553,19 @@ class ContentPackResource(Access):
                            pack=ref_obj.pack).first()
         return result
 
+    @classmethod
+    def get_by_ref_cached(cls, ref):
+        """
+        Same as get_by_ref, but the result is served from the resource cache if lookups by
+        reference are cached for this resource.
+
+        Note: Returned object is shared and must not be modified.
+        """
+        if not ref:
+            return None
+
+        return cls._get_cached(lookup='ref', key=ref, loader=lambda: cls.get_by_ref(ref))
+
     @classmethod
     def _get_by_object(cls, object):
         # For an object with a resourcepack pack.name is unique.
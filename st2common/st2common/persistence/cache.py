@@ -0,0 +1,263 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Process wide read-through cache for rarely changing content models (actions, runner types,
+rules, triggers, trigger types and policies).
+
+Cached items are evicted on local writes, when a CUD event for the model is received from the
+message bus or when they expire.
+"""
+
+import datetime
+import threading
+from collections import OrderedDict
+
+from kombu import Queue, binding
+from oslo_config import cfg
+
+from st2common import log as logging
+from st2common.services.resource_watcher import ResourceWatcher
+from st2common.transport.action import ACTION_CUD_XCHG, RUNNERTYPE_CUD_XCHG, POLICY_CUD_XCHG
+from st2common.transport.reactor import RULE_CUD_XCHG, TRIGGER_CUD_XCHG, TRIGGER_TYPE_CUD_XCHG
+from st2common.util import date as date_utils
+
+__all__ = [
+    'ResourceCache',
+
+    'get_resource_cache',
+    'get_resource_caches_stats'
+]
+
+LOG = logging.getLogger(__name__)
+
+# Exchanges with the CUD events for the cached models
+CACHED_RESOURCES_CUD_XCHGS = [ACTION_CUD_XCHG, RUNNERTYPE_CUD_XCHG, POLICY_CUD_XCHG,
+                              RULE_CUD_XCHG, TRIGGER_CUD_XCHG, TRIGGER_TYPE_CUD_XCHG]
+
+# Marker for a key which is not in the cache (None is a valid cached value)
+_MISSING = object()
+
+
+class ResourceCache(object):
+    """
+    Size limited read-through cache with TTL for a particular resource lookup.
+
+    Cached value can be a single model object, a list of model objects or None (resource doesn't
+    exist).
+    """
+
+    def __init__(self, name, model_cls, key_func, max_size, ttl):
+        """
+        :param name: Cache name.
+        :type name: ``str``
+
+        :param model_cls: DB model class of the cached objects. CUD events for objects of this
+                          class invalidate the cache.
+        :type model_cls: ``type``
+
+        :param key_func: Function which returns cache key for the provided model object.
+        :type key_func: ``callable``
+
+        :param max_size: Maximum number of cached items. Least recently used items are evicted
+                         first.
+        :type max_size: ``int``
+
+        :param ttl: Number of seconds an item is cached for.
+        :type ttl: ``int``
+        """
+        self.name = name
+        self.model_cls = model_cls
+        self.hits = 0
+        self.misses = 0
+
+        self._key_func = key_func
+        self._max_size = max_size
+        self._ttl = ttl
+
+        # Maps key -> (value, expire_at)
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Incremented on every invalidation. Value which is being loaded can contain any object
+        # (e.g. a list of objects) so a load is discarded if any invalidation happened during it.
+        self._generation = 0
+
+    def get(self, key, loader):
+        """
+        Return cached value for the provided key. If the value is not cached or has expired,
+        retrieve it by calling the provided loader and cache it.
+
+        :param loader: Function which retrieves the value from the database.
+        :type loader: ``callable``
+        """
+        now = date_utils.get_datetime_utc_now()
+        value = self._get_item(key=key, now=now)
+
+        if value is not _MISSING:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        generation = self._generation
+        value = loader()
+
+        with self._lock:
+            if generation != self._generation:
+                # Object might have changed while it was being loaded, don't cache a stale value
+                return value
+
+            self._items[key] = (value, now + datetime.timedelta(seconds=self._ttl))
+
+            while len(self._items) > self._max_size:
+                self._items.popitem(last=False)
+
+        return value
+
+    def invalidate(self, model_object):
+        """
+        Remove all the cached values which contain the provided model object.
+        """
+        key = self._key_func(model_object)
+        object_id = getattr(model_object, 'id', None)
+
+        with self._lock:
+            self._generation += 1
+            self._items.pop(key, None)
+
+            if not object_id:
+                return
+
+            for item_key, (value, _) in list(self._items.items()):
+                values = value if isinstance(value, list) else [value]
+
+                if any([getattr(item, 'id', None) == object_id for item in values]):
+                    self._items.pop(item_key, None)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._items.clear()
+
+    def get_stats(self):
+        """
+        :rtype: ``dict``
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._items)
+        }
+
+    def _get_item(self, key, now):
+        with self._lock:
+            item = self._items.pop(key, None)
+
+            if not item:
+                return _MISSING
+
+            value, expire_at = item
+
+            if expire_at <= now:
+                return _MISSING
+
+            # Re-insert the item so it becomes the most recently used one
+            self._items[key] = item
+
+        return value
+
+    def __len__(self):
+        return len(self._items)
+
+
+class ResourceCacheWatcher(object):
+    """
+    Watcher which invalidates resource caches when a CUD event for a cached model is received.
+
+    Single exclusive queue bound to the CUD exchanges of all the cached models is used.
+    """
+
+    def __init__(self):
+        self._caches = []
+        self._watcher = ResourceWatcher(create_handler=self._handle_change,
+                                        update_handler=self._handle_change,
+                                        delete_handler=self._handle_change,
+                                        queue_name_base='st2.resource_cache.watch',
+                                        get_queue_func=get_resource_cache_queue,
+                                        exclusive=True)
+
+    def add_cache(self, cache):
+        self._caches.append(cache)
+
+    def start(self):
+        self._watcher.start()
+
+    def stop(self):
+        self._watcher.stop()
+
+    def _handle_change(self, model_object):
+        for cache in self._caches:
+            if isinstance(model_object, cache.model_cls):
+                LOG.debug('%s changed, removing it from "%s" cache.', model_object, cache.name)
+                cache.invalidate(model_object)
+
+
+def get_resource_cache_queue(name, routing_key, exclusive=False):
+    bindings = [binding(exchange, routing_key=routing_key)
+                for exchange in CACHED_RESOURCES_CUD_XCHGS]
+    return Queue(name, bindings=bindings, exclusive=exclusive)
+
+
+_CACHES = {}
+_CACHE_WATCHER = None
+
+
+def get_resource_cache(name, model_cls, key_func):
+    """
+    Return process wide cache with the provided name or None if caching is disabled.
+
+    :rtype: :class:`ResourceCache`
+    """
+    global _CACHE_WATCHER
+
+    ttl = cfg.CONF.resource_cache.ttl
+
+    if ttl <= 0:
+        return None
+
+    cache = _CACHES.get(name, None)
+
+    if cache:
+        return cache
+
+    if not _CACHE_WATCHER:
+        _CACHE_WATCHER = ResourceCacheWatcher()
+        _CACHE_WATCHER.start()
+
+    cache = ResourceCache(name=name, model_cls=model_cls, key_func=key_func,
+                          max_size=cfg.CONF.resource_cache.max_size, ttl=ttl)
+    _CACHE_WATCHER.add_cache(cache)
+    _CACHES[name] = cache
+
+    return cache
+
+
+def get_resource_caches_stats():
+    """
+    Return hit / miss counters for all the resource caches.
+
+    :rtype: ``dict``
+    """
+    return dict([(name, cache.get_stats()) for name, cache in _CACHES.items()])
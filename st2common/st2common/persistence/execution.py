@@ -13,9 +13,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import operator
+
 from st2common import transport
 from st2common.models.db import MongoDBAccess
 from st2common.models.db.execution import ActionExecutionDB
+from st2common.models.db.execution import ActionExecutionSnapshotDB
 from st2common.persistence.base import Access
 from st2common.transport import utils as transport_utils
 
@@ -24,6 +27,10 @@ class ActionExecution(Access):
     impl = MongoDBAccess(ActionExecutionDB)
     publisher = None
 
+    update_event_fields = ['status', 'start_timestamp', 'end_timestamp', 'parent']
+    update_event_lazy_fields = ['result', 'parameters', 'action', 'runner', 'rule', 'trigger',
+                                'trigger_type', 'trigger_instance', 'liveaction', 'children']
+
     @classmethod
     def _get_impl(cls):
         return cls.impl
@@ -38,3 +45,30 @@ class ActionExecution(Access):
     @classmethod
     def delete_by_query(cls, **query):
         return cls._get_impl().delete_by_query(**query)
+
+
+class ActionExecutionSnapshot(Access):
+    impl = MongoDBAccess(ActionExecutionSnapshotDB)
+
+    cached_lookups = {
+        'hash': operator.attrgetter('hash')
+    }
+
+    @classmethod
+    def _get_impl(cls):
+        return cls.impl
+
+    @classmethod
+    def get_by_hash_cached(cls, hash):
+        """
+        Return snapshot with the provided hash (or None if it doesn't exist) from the resource
+        cache.
+
+        Note: Returned object is shared and must not be modified.
+        """
+        return cls._get_cached(lookup='hash', key=hash,
+                               loader=lambda: cls.query(hash=hash).first())
+
+    @classmethod
+    def _get_by_object(cls, object):
+        return cls.query(hash=object.hash).first()
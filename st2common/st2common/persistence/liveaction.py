@@ -23,6 +23,9 @@ class LiveAction(persistence.StatusBasedResource):
     impl = liveaction_access
     publisher = None
 
+    update_event_fields = ['status', 'start_timestamp', 'end_timestamp', 'action']
+    update_event_lazy_fields = ['result', 'parameters']
+
     @classmethod
     def _get_impl(cls):
         return cls.impl
@@ -13,9 +13,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import operator
+
+from st2common import transport
 from st2common.models.db import MongoDBAccess
 from st2common.models.db.policy import PolicyTypeReference, PolicyTypeDB, PolicyDB
 from st2common.persistence.base import Access, ContentPackResource
+from st2common.transport import utils as transport_utils
 
 
 class PolicyType(Access):
@@ -44,7 +48,21 @@ class PolicyType(Access):
 
 class Policy(ContentPackResource):
     impl = MongoDBAccess(PolicyDB)
+    publisher = None
+
+    # Compiled policy chains (see st2common.policies.get_policy_chain) keyed by the resource
+    # reference. Listed here so local writes invalidate them as well.
+    cached_lookups = {
+        'chain': operator.attrgetter('resource_ref')
+    }
 
     @classmethod
     def _get_impl(cls):
         return cls.impl
+
+    @classmethod
+    def _get_publisher(cls):
+        if not cls.publisher:
+            cls.publisher = transport.action.PolicyCUDPublisher(
+                urls=transport_utils.get_messaging_urls())
+        return cls.publisher
@@ -13,17 +13,41 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from st2common import transport
 from st2common.models.db.rule import rule_access, rule_type_access
 from st2common.persistence.base import Access, ContentPackResource
+from st2common.transport import utils as transport_utils
 
 
 class Rule(ContentPackResource):
     impl = rule_access
+    publisher = None
+
+    cached_lookups = {
+        'id': lambda rule_db: str(rule_db.id)
+    }
 
     @classmethod
     def _get_impl(cls):
         return cls.impl
 
+    @classmethod
+    def _get_publisher(cls):
+        if not cls.publisher:
+            cls.publisher = transport.reactor.RuleCUDPublisher(
+                urls=transport_utils.get_messaging_urls())
+        return cls.publisher
+
+    @classmethod
+    def get_by_id_cached(cls, rule_id):
+        """
+        Return rule with the provided id (or None if it doesn't exist) from the resource cache.
+
+        Note: Returned object is shared and must not be modified.
+        """
+        return cls._get_cached(lookup='id', key=rule_id,
+                               loader=lambda: cls.query(id=rule_id).first())
+
 
 class RuleType(Access):
     impl = rule_type_access
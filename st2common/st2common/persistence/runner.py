@@ -13,17 +13,44 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import operator
+
+from st2common import transport
 from st2common.persistence import base as persistence
 from st2common.models.db.runner import runnertype_access
+from st2common.transport import utils as transport_utils
 
 
 class RunnerType(persistence.Access):
     impl = runnertype_access
+    publisher = None
+
+    cached_lookups = {
+        'name': operator.attrgetter('name')
+    }
 
     @classmethod
     def _get_impl(cls):
         return cls.impl
 
+    @classmethod
+    def _get_publisher(cls):
+        if not cls.publisher:
+            cls.publisher = transport.action.RunnerTypeCUDPublisher(
+                urls=transport_utils.get_messaging_urls())
+        return cls.publisher
+
+    @classmethod
+    def get_by_name_cached(cls, name):
+        """
+        Return runner type with the provided name (or None if it doesn't exist) from the resource
+        cache.
+
+        Note: Returned object is shared and must not be modified.
+        """
+        return cls._get_cached(lookup='name', key=name,
+                               loader=lambda: cls.query(name=name).first())
+
     @classmethod
     def _get_by_object(cls, object):
         # For RunnerType name is unique.
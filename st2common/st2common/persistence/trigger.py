@@ -13,6 +13,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import operator
+
 from st2common import log as logging
 from st2common import transport
 from st2common.models.db.trigger import triggertype_access, trigger_access, triggerinstance_access
@@ -24,16 +26,32 @@ LOG = logging.getLogger(__name__)
 
 class TriggerType(ContentPackResource):
     impl = triggertype_access
+    publisher = None
+
+    cached_lookups = {
+        'ref': operator.attrgetter('ref')
+    }
 
     @classmethod
     def _get_impl(cls):
         return cls.impl
 
+    @classmethod
+    def _get_publisher(cls):
+        if not cls.publisher:
+            cls.publisher = transport.reactor.TriggerTypeCUDPublisher(
+                urls=transport_utils.get_messaging_urls())
+        return cls.publisher
+
 
 class Trigger(ContentPackResource):
     impl = trigger_access
     publisher = None
 
+    cached_lookups = {
+        'ref': operator.attrgetter('ref')
+    }
+
     @classmethod
     def _get_impl(cls):
         return cls.impl
@@ -61,6 +79,9 @@ class Trigger(ContentPackResource):
         except ValueError:
             confirmed_delete = True
 
+        if confirmed_delete:
+            cls._invalidate_caches(model_object)
+
         # Publish internal event on the message bus
         if confirmed_delete and publish:
             try:
@@ -14,10 +14,12 @@
 # limitations under the License.
 
 from st2common.policies.base import get_driver
+from st2common.policies.base import get_policy_chain
 from st2common.policies.base import ResourcePolicyApplicator
 
 
 __all__ = [
     'get_driver',
+    'get_policy_chain',
     'ResourcePolicyApplicator'
 ]
@@ -16,17 +16,24 @@
 import abc
 import importlib
 import inspect
+import operator
+
 import six
 
 from st2common import log as logging
+from st2common.models.db.policy import PolicyDB
 from st2common.persistence import policy as policy_access
+from st2common.persistence.cache import get_resource_cache
 from st2common.services import coordination
 
 LOG = logging.getLogger(__name__)
 
 __all__ = [
     'ResourcePolicyApplicator',
-    'get_driver'
+    'CompiledPolicy',
+
+    'get_driver',
+    'get_policy_chain'
 ]
 
 
@@ -86,9 +93,53 @@ class ResourcePolicyApplicator(object):
         return lock_uid
 
 
+class CompiledPolicy(object):
+    """
+    Policy applied to a resource together with the driver which enforces it.
+    """
+
+    def __init__(self, policy_db, driver):
+        # Note: id is used to invalidate the cached chains (see ResourceCache.invalidate)
+        self.id = policy_db.id
+        self.ref = policy_db.ref
+        self.policy_type = policy_db.policy_type
+        self.driver = driver
+
+
 def get_driver(policy_ref, policy_type, **parameters):
     policy_type_db = policy_access.PolicyType.get_by_ref(policy_type)
     module = importlib.import_module(policy_type_db.module, package=None)
     for name, obj in inspect.getmembers(module):
         if inspect.isclass(obj) and issubclass(obj, ResourcePolicyApplicator):
             return obj(policy_ref, policy_type, **parameters)
+
+
+def get_policy_chain(resource_ref):
+    """
+    Return policies applied to the resource with the provided reference together with the
+    drivers which enforce them.
+
+    Policy chains are compiled once and served from the resource cache (they are invalidated when
+    a policy changes). For resources without any policies an empty list is returned.
+
+    Note: Returned objects are shared and must not be modified.
+
+    :rtype: ``list`` of :class:`CompiledPolicy`
+    """
+    # Note: Cache name matches Policy.cached_lookups so local writes invalidate it
+    cache = get_resource_cache(name='Policy.chain', model_cls=PolicyDB,
+                               key_func=operator.attrgetter('resource_ref'))
+
+    if not cache:
+        return _compile_policy_chain(resource_ref=resource_ref)
+
+    return cache.get(resource_ref, lambda: _compile_policy_chain(resource_ref=resource_ref))
+
+
+def _compile_policy_chain(resource_ref):
+    policy_dbs = policy_access.Policy.query(resource_ref=resource_ref)
+
+    return [CompiledPolicy(policy_db=policy_db,
+                           driver=get_driver(policy_db.ref, policy_db.policy_type,
+                                             **policy_db.parameters))
+            for policy_db in policy_dbs]
@@ -19,6 +19,7 @@ Module for syncing RBAC definitions in the database with the ones from the files
 
 from st2common import log as logging
 from st2common.models.db.auth import UserDB
+from st2common.models.db.rbac import UserRoleAssignmentDB
 from st2common.persistence.auth import User
 from st2common.persistence.rbac import Role
 from st2common.persistence.rbac import UserRoleAssignment
@@ -253,15 +254,19 @@ class RBACDefinitionsDBSyncer(object):
         role_names_to_create = new_role_names.union(updated_role_names)
         role_dbs_to_assign = Role.query(name__in=role_names_to_create)
 
-        created_role_assignment_dbs = []
+        role_assignment_dbs_to_create = []
         for role_db in role_dbs_to_assign:
             if role_db.name in role_assignment_api.roles:
                 description = getattr(role_assignment_api, 'description', None)
             else:
                 description = None
-            assignment_db = rbac_services.assign_role_to_user(role_db=role_db, user_db=user_db,
-                                                              description=description)
-            created_role_assignment_dbs.append(assignment_db)
+            assignment_db = UserRoleAssignmentDB(user=user_db.name, role=role_db.name,
+                                                 description=description)
+            role_assignment_dbs_to_create.append(assignment_db)
+
+        # All the assignments for a user are inserted using a single bulk write
+        created_role_assignment_dbs = UserRoleAssignment.insert_many(
+            role_assignment_dbs_to_create)
 
         LOG.debug('Created %s new assignments for user "%s"' % (len(role_dbs_to_assign),
                                                                 user_db.name))
@@ -27,6 +27,7 @@ from st2common import log as logging
 from st2common.models import db
 from st2common.constants.logging import DEFAULT_LOGGING_CONF_PATH
 from st2common.persistence import db_init
+from st2common.services.keyvalues import setup_key_value_cache
 from st2common.transport.bootstrap_utils import register_exchanges
 from st2common.signal_handlers import register_common_signal_handlers
 from st2common.util.debugging import enable_debugging
@@ -59,7 +60,8 @@ def setup(service, config, setup_db=True, register_mq_exchanges=True,
     3. Set log level for all the loggers to DEBUG if --debug flag is present
     4. Registers RabbitMQ exchanges
     5. Registers common signal handlers
-    6. Register internal trigger types
+    6. Sets up process wide datastore cache (if enabled)
+    7. Register internal trigger types
 
     :param service: Name of the service.
     :param config: Config object to use to parse args.
@@ -103,6 +105,10 @@ def setup(service, config, setup_db=True, register_mq_exchanges=True,
     if register_signal_handlers:
         register_common_signal_handlers()
 
+    if setup_db and register_mq_exchanges:
+        # Datastore cache needs the database and its watcher queue the exchanges
+        setup_key_value_cache()
+
     if register_internal_trigger_types:
         triggers.register_internal_trigger_types()
 
@@ -73,10 +73,9 @@ def create_request(liveaction):
         liveaction.parameters = dict()
 
     # Validate action parameters.
-    schema = util_schema.get_schema_for_action_parameters(action_db)
-    validator = util_schema.get_validator()
-    util_schema.validate(liveaction.parameters, schema, validator, use_default=True,
-                         allow_default_none=True)
+    validator = util_schema.get_action_parameters_validator(action_db=action_db,
+                                                            runnertype_db=runnertype_db)
+    validator.validate(liveaction.parameters)
 
     # validate that no immutable params are being overriden. Although possible to
     # ignore the override it is safer to inform the user to avoid surprises.
@@ -157,7 +156,7 @@ def update_status(liveaction, new_status, result=None, publish=True):
     liveaction = action_utils.update_liveaction_status(
         status=new_status, result=result, liveaction_id=liveaction.id, publish=False)
 
-    action_execution = executions.update_execution(liveaction)
+    action_execution = executions.update_execution(liveaction, include_result=bool(result))
 
     msg = ('The status of action execution is changed from %s to %s. '
            '<LiveAction.id=%s, ActionExecution.id=%s>' % (old_status,
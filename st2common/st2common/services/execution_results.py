@@ -0,0 +1,147 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Module for storing large execution results outside of the execution documents.
+
+Results which serialized size exceeds the configured threshold are stored in a GridFS collection
+and only a placeholder with a truncated preview of the serialized result is stored inline in the
+liveaction and execution document. Code which needs the actual result should call load_result().
+"""
+
+import json
+
+import bson
+import gridfs
+import mongoengine
+from oslo_config import cfg
+
+from st2common import log as logging
+
+__all__ = [
+    'OFFLOADED_RESULT_KEY',
+
+    'offload_result',
+    'is_offloaded_result',
+    'load_result',
+    'open_result',
+    'delete_result'
+]
+
+LOG = logging.getLogger(__name__)
+
+# Name of the GridFS collection where the offloaded results are stored
+RESULTS_COLLECTION_NAME = 'execution_results'
+
+# Key of the placeholder which is stored inline instead of the offloaded result
+OFFLOADED_RESULT_KEY = '__offloaded_result'
+
+
+def get_result_fs():
+    """
+    Return GridFS instance for the offloaded results collection.
+
+    :rtype: :class:`gridfs.GridFS`
+    """
+    db = mongoengine.connection.get_db()
+    return gridfs.GridFS(db, collection=RESULTS_COLLECTION_NAME)
+
+
+def offload_result(result):
+    """
+    Store the provided result in the results collection if it exceeds the configured threshold
+    and return a placeholder which should be stored inline instead of the result.
+
+    If the result doesn't exceed the threshold (or offloading is disabled), result is returned
+    as is.
+
+    :rtype: ``dict``
+    """
+    threshold = cfg.CONF.executions.result_offload_threshold
+
+    if not threshold or not result or is_offloaded_result(result):
+        return result
+
+    serialized = json.dumps(result, default=str)
+
+    if len(serialized) <= threshold:
+        return result
+
+    file_id = get_result_fs().put(serialized, content_type='application/json')
+    LOG.debug('Offloaded result (%s bytes) to "%s".', len(serialized), file_id)
+
+    placeholder = {
+        OFFLOADED_RESULT_KEY: {
+            'id': str(file_id),
+            'size': len(serialized)
+        },
+        'preview': serialized[:cfg.CONF.executions.result_preview_size]
+    }
+    return placeholder
+
+
+def is_offloaded_result(result):
+    """
+    Return True if the provided result is a placeholder for an offloaded result.
+
+    :rtype: ``bool``
+    """
+    return isinstance(result, dict) and OFFLOADED_RESULT_KEY in result
+
+
+def load_result(result):
+    """
+    Return the full result for the provided (possibly offloaded) result.
+
+    :rtype: ``dict``
+    """
+    if not is_offloaded_result(result):
+        return result
+
+    grid_out = open_result(result)
+
+    if not grid_out:
+        return result
+
+    try:
+        return json.loads(grid_out.read())
+    finally:
+        grid_out.close()
+
+
+def open_result(result):
+    """
+    Open the offloaded result for reading.
+
+    :return: File like object or None if the offloaded result doesn't exist.
+    :rtype: :class:`gridfs.grid_file.GridOut`
+    """
+    file_id = result[OFFLOADED_RESULT_KEY]['id']
+
+    try:
+        return get_result_fs().get(bson.ObjectId(file_id))
+    except gridfs.errors.NoFile:
+        LOG.warning('Offloaded result "%s" not found.', file_id)
+        return None
+
+
+def delete_result(result):
+    """
+    Delete the offloaded result (if the provided result is a placeholder for one).
+    """
+    if not is_offloaded_result(result):
+        return
+
+    get_result_fs().delete(bson.ObjectId(result[OFFLOADED_RESULT_KEY]['id']))
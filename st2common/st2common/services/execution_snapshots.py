@@ -0,0 +1,147 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Module for storing resource definitions (action, runner type, rule, trigger and trigger type)
+referenced by executions as shared snapshots.
+
+Instead of a full copy of the definition, execution only contains a reference with the
+attributes which are used for filtering and the hash of the snapshot. References are resolved
+back to the full definitions when the execution is serialized (see ActionExecutionAPI).
+"""
+
+import copy
+import hashlib
+import json
+
+import six
+
+from st2common import log as logging
+from st2common.exceptions.db import StackStormDBObjectConflictError
+from st2common.models.db.execution import ActionExecutionSnapshotDB
+from st2common.persistence.execution import ActionExecutionSnapshot
+from st2common.util.secrets import get_secret_parameters
+
+__all__ = [
+    'SNAPSHOT_HASH_ATTRIBUTE',
+
+    'get_snapshot_hash',
+    'create_snapshot_reference',
+    'resolve_snapshot_references'
+]
+
+LOG = logging.getLogger(__name__)
+
+# Name of the reference attribute which holds the snapshot hash
+SNAPSHOT_HASH_ATTRIBUTE = 'snapshot_hash'
+
+# Maps execution attribute to the attributes of the definition which are kept in the reference.
+# Those are used for filtering (see executionviews.SUPPORTED_FILTERS) and by the code which
+# works with the execution DB objects directly.
+REFERENCE_ATTRIBUTES = {
+    'action': ['id', 'ref', 'name', 'pack', 'uid', 'runner_type'],
+    'runner': ['id', 'name', 'uid'],
+    'rule': ['id', 'ref', 'name', 'pack', 'uid'],
+    'trigger': ['id', 'ref', 'name', 'pack', 'type', 'uid'],
+    'trigger_type': ['id', 'ref', 'name', 'pack', 'uid']
+}
+
+# Maps execution attribute to the attribute which contains parameters schema. Secret parameters
+# are kept in the reference so secrets can be masked without resolving it.
+PARAMETERS_ATTRIBUTES = {
+    'action': 'parameters',
+    'runner': 'runner_parameters'
+}
+
+
+def get_snapshot_hash(value):
+    """
+    Return content hash for the provided definition.
+
+    :rtype: ``str``
+    """
+    serialized = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha1(serialized).hexdigest()
+
+
+def create_snapshot_reference(resource_type, value):
+    """
+    Store snapshot of the provided definition (unless it already exists) and return a reference
+    to it which is stored in the execution instead of the definition.
+
+    :param resource_type: Name of the execution attribute (e.g. action, runner).
+    :type resource_type: ``str``
+
+    :param value: Serialized definition (e.g. vars(ActionAPI.from_model(action_db))).
+    :type value: ``dict``
+
+    :rtype: ``dict``
+    """
+    snapshot_hash = get_snapshot_hash(value)
+
+    if not ActionExecutionSnapshot.get_by_hash_cached(snapshot_hash):
+        snapshot_db = ActionExecutionSnapshotDB(hash=snapshot_hash, resource_type=resource_type,
+                                                value=copy.deepcopy(value))
+
+        try:
+            ActionExecutionSnapshot.insert(snapshot_db, publish=False, dispatch_trigger=False,
+                                           log_not_unique_error_as_debug=True)
+        except StackStormDBObjectConflictError:
+            # Snapshot has been stored by a different process in the mean time
+            pass
+
+    reference = dict([(attribute, value[attribute])
+                      for attribute in REFERENCE_ATTRIBUTES[resource_type]
+                      if attribute in value])
+    reference[SNAPSHOT_HASH_ATTRIBUTE] = snapshot_hash
+
+    parameters_attribute = PARAMETERS_ATTRIBUTES.get(resource_type, None)
+
+    if parameters_attribute:
+        parameters = value.get(parameters_attribute, None) or {}
+        secret_parameters = get_secret_parameters(parameters=parameters)
+        reference[parameters_attribute] = dict([(name, {'secret': True})
+                                                for name in secret_parameters])
+
+    return reference
+
+
+def resolve_snapshot_references(doc):
+    """
+    Replace snapshot references in the provided serialized execution with the full definitions.
+
+    :param doc: Serialized execution.
+    :type doc: ``dict``
+
+    :rtype: ``dict``
+    """
+    for resource_type in six.iterkeys(REFERENCE_ATTRIBUTES):
+        reference = doc.get(resource_type, None)
+
+        if not isinstance(reference, dict) or SNAPSHOT_HASH_ATTRIBUTE not in reference:
+            continue
+
+        snapshot_db = ActionExecutionSnapshot.get_by_hash_cached(
+            reference[SNAPSHOT_HASH_ATTRIBUTE])
+
+        if not snapshot_db:
+            LOG.warning('Snapshot "%s" for execution "%s" attribute "%s" not found.',
+                        reference[SNAPSHOT_HASH_ATTRIBUTE], doc.get('id', None), resource_type)
+            continue
+
+        # Note: Cached object is shared so a copy is returned
+        doc[resource_type] = copy.deepcopy(snapshot_db.value)
+
+    return doc
@@ -28,7 +28,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from collections import defaultdict
+
 import six
+from oslo_config import cfg
 
 from st2common import log as logging
 from st2common.util import reference
@@ -42,6 +45,7 @@ from st2common.models.api.action import RunnerTypeAPI, ActionAPI, LiveActionAPI
 from st2common.models.api.rule import RuleAPI
 from st2common.models.api.trigger import TriggerTypeAPI, TriggerAPI, TriggerInstanceAPI
 from st2common.models.db.execution import ActionExecutionDB
+from st2common.services import execution_snapshots
 
 __all__ = [
     'create_execution_object',
@@ -57,6 +61,10 @@ LOG = logging.getLogger(__name__)
 
 SKIPPED = ['id', 'callback', 'action', 'runner_info', 'parameters']
 
+# Execution attributes which are stored as references to shared snapshots if
+# executions.store_definition_snapshots option is enabled
+SNAPSHOT_ATTRIBUTES = ['action', 'runner', 'rule', 'trigger', 'trigger_type']
+
 
 def _decompose_liveaction(liveaction_db):
     """
@@ -73,68 +81,113 @@ def _decompose_liveaction(liveaction_db):
 
 
 def create_execution_object(liveaction, publish=True):
+    attrs = _get_execution_context_attributes(liveaction)
+    attrs.update(_decompose_liveaction(liveaction))
+
+    parent = _get_parent_execution(liveaction)
+    if parent:
+        attrs['parent'] = str(parent.id)
+        # Materialized path which allows retrieving the whole execution tree with a single query
+        attrs['ancestors'] = (parent.ancestors or []) + [str(parent.id)]
+
+    if cfg.CONF.executions.store_definition_snapshots:
+        for resource_type in SNAPSHOT_ATTRIBUTES:
+            if attrs.get(resource_type, None):
+                attrs[resource_type] = execution_snapshots.create_snapshot_reference(
+                    resource_type=resource_type, value=attrs[resource_type])
+
+    execution = ActionExecutionDB(**attrs)
+    execution = ActionExecution.add_or_update(execution, publish=publish)
+
+    if parent:
+        ActionExecution.find_and_update(query={'id': parent.id},
+                                        add_to_set__children=str(execution.id))
+
+    return execution
+
+
+def _get_execution_context_attributes(liveaction):
+    """
+    Return action, runner, rule, trigger instance, trigger and trigger type attributes of the
+    execution for the provided liveaction.
+
+    Content models are retrieved from the resource cache so only the trigger instance is read
+    from the database.
+
+    :rtype: ``dict``
+    """
     action_db = action_utils.get_action_by_ref(liveaction.action)
-    runner = RunnerType.get_by_name(action_db.runner_type['name'])
+    runner = RunnerType.get_by_name_cached(action_db.runner_type['name'])
 
     attrs = {
         'action': vars(ActionAPI.from_model(action_db)),
         'parameters': liveaction['parameters'],
         'runner': vars(RunnerTypeAPI.from_model(runner))
     }
-    attrs.update(_decompose_liveaction(liveaction))
 
     if 'rule' in liveaction.context:
-        rule = reference.get_model_from_ref(Rule, liveaction.context.get('rule', {}))
+        rule_ref = liveaction.context.get('rule', {})
+        rule_id = rule_ref.get('id', None)
+        rule = Rule.get_by_id_cached(rule_id) if rule_id else None
+
+        if not rule:
+            rule = reference.get_model_from_ref(Rule, rule_ref)
+
         attrs['rule'] = vars(RuleAPI.from_model(rule))
 
     if 'trigger_instance' in liveaction.context:
         trigger_instance_id = liveaction.context.get('trigger_instance', {})
         trigger_instance_id = trigger_instance_id.get('id', None)
         trigger_instance = TriggerInstance.get_by_id(trigger_instance_id)
-        trigger = reference.get_model_by_resource_ref(db_api=Trigger,
-                                                      ref=trigger_instance.trigger)
-        trigger_type = reference.get_model_by_resource_ref(db_api=TriggerType,
-                                                           ref=trigger.type)
-        trigger_instance = reference.get_model_from_ref(
-            TriggerInstance, liveaction.context.get('trigger_instance', {}))
+        trigger = Trigger.get_by_ref_cached(trigger_instance.trigger)
+        trigger_type = TriggerType.get_by_ref_cached(trigger.type)
         attrs['trigger_instance'] = vars(TriggerInstanceAPI.from_model(trigger_instance))
         attrs['trigger'] = vars(TriggerAPI.from_model(trigger))
         attrs['trigger_type'] = vars(TriggerTypeAPI.from_model(trigger_type))
 
-    parent = _get_parent_execution(liveaction)
-    if parent:
-        attrs['parent'] = str(parent.id)
-
-    execution = ActionExecutionDB(**attrs)
-    execution = ActionExecution.add_or_update(execution, publish=publish)
-
-    if parent:
-        if str(execution.id) not in parent.children:
-            parent.children.append(str(execution.id))
-            ActionExecution.add_or_update(parent)
-
-    return execution
+    return attrs
 
 
 def _get_parent_execution(child_liveaction_db):
+    """
+    Return parent execution of the provided liveaction. Only the attributes which are needed to
+    link the child execution are retrieved.
+    """
     parent_context = child_liveaction_db.context.get('parent', None)
 
     if parent_context:
         parent_id = parent_context['execution_id']
         try:
-            return ActionExecution.get_by_id(parent_id)
+            parent = ActionExecution.query(id=parent_id, only_fields=['id', 'ancestors']).first()
         except:
             LOG.exception('No valid execution object found in db for id: %s' % parent_id)
             return None
+
+        if not parent:
+            LOG.error('No valid execution object found in db for id: %s' % parent_id)
+
+        return parent
     return None
 
 
-def update_execution(liveaction_db, publish=True):
-    execution = ActionExecution.get(liveaction__id=str(liveaction_db.id))
+def update_execution(liveaction_db, publish=True, include_result=True):
+    """
+    Update execution object for the provided liveaction with a single partial update.
+
+    :param include_result: False if the liveaction result hasn't changed in which case it's not
+                           written again.
+    :type include_result: ``bool``
+    """
     decomposed = _decompose_liveaction(liveaction_db)
-    for k, v in six.iteritems(decomposed):
-        setattr(execution, k, v)
-    execution = ActionExecution.add_or_update(execution, publish=publish)
+
+    if not include_result:
+        decomposed.pop('result', None)
+
+    # Note: Attributes which are not execution fields (e.g. notify) were never persisted
+    update = dict([('set__%s' % (k), v) for k, v in six.iteritems(decomposed)
+                   if k in ActionExecutionDB._fields])
+    execution = ActionExecution.find_and_update(query={'liveaction__id': str(liveaction_db.id)},
+                                                publish=publish, **update)
     return execution
 
 
@@ -215,12 +268,40 @@ def get_descendants(actionexecution_id, descendant_depth=-1, result_fmt=None):
     """
     Returns all descendant executions upto the specified descendant_depth for
     the supplied actionexecution_id.
+
+    The whole tree is retrieved with a single query (using the ancestors materialized path) and
+    assembled in memory.
     """
     descendants = DESCENDANT_VIEWS.get(result_fmt, DFSDescendantView)()
-    children = ActionExecution.query(parent=actionexecution_id,
-                                     **{'order_by': ['start_timestamp']})
-    LOG.debug('Found %s children for id %s.', len(children), actionexecution_id)
-    current_level = [(child, 1) for child in children]
+
+    # Note: Direct children are also matched by the parent attribute for executions which have
+    # been created before ancestors were stored
+    query = {'$or': [{'ancestors': actionexecution_id}, {'parent': actionexecution_id}]}
+    executions = ActionExecution.query(__raw__=query, order_by=['start_timestamp'])
+    LOG.debug('Found %s descendants for id %s.', len(executions), actionexecution_id)
+
+    # Note: Direct children of the requested execution are always retrieved by the query above
+    children_by_parent = defaultdict(list)
+    children_by_parent[actionexecution_id] = []
+
+    for execution in executions:
+        children_by_parent[execution.parent].append(execution)
+
+        # Note: All the descendants of an execution which has ancestors stored have them stored
+        # as well so all of its children (if any) have been retrieved by the query above
+        if execution.ancestors:
+            children_by_parent.setdefault(str(execution.id), [])
+
+    def get_children(parent_id):
+        if parent_id not in children_by_parent:
+            # Execution created before ancestors were stored, fall back to querying by parent
+            children = ActionExecution.query(parent=parent_id, order_by=['start_timestamp'])
+            LOG.debug('Found %s children for id %s.', len(children), parent_id)
+            children_by_parent[parent_id] = list(children)
+
+        return children_by_parent[parent_id]
+
+    current_level = [(child, 1) for child in get_children(actionexecution_id)]
 
     while current_level:
         parent, level = current_level.pop(0)
@@ -230,8 +311,7 @@ def get_descendants(actionexecution_id, descendant_depth=-1, result_fmt=None):
             continue
         if level != -1 and level == descendant_depth:
             continue
-        children = ActionExecution.query(parent=parent_id, **{'order_by': ['start_timestamp']})
-        LOG.debug('Found %s children for id %s.', len(children), parent_id)
+        children = get_children(parent_id)
         # prepend for DFS
         for idx in range(len(children)):
             current_level.insert(idx, (children[idx], level + 1))
@@ -13,7 +13,36 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
+import threading
+from collections import OrderedDict
+
+from oslo_config import cfg
+
+from st2common import log as logging
+from st2common.constants.system import SYSTEM_KV_PREFIX
 from st2common.persistence.keyvalue import KeyValuePair
+from st2common.services.resource_watcher import ResourceWatcher
+from st2common.transport.keyvalue import get_keyvalue_cud_queue
+from st2common.util import date as date_utils
+from st2common.util import jinja as jinja_utils
+
+__all__ = [
+    'KeyValueLookup',
+    'KeyValueCache',
+
+    'get_key_value_lookup',
+    'prefetch_key_values',
+    'get_key_values',
+    'get_key_value_cache',
+    'setup_key_value_cache'
+]
+
+LOG = logging.getLogger(__name__)
+
+# A good default value for un-matched value is empty string since that will be used
+# for rendering templates.
+MISSING_VALUE = ''
 
 
 class KeyValueLookup(object):
@@ -36,8 +65,8 @@ class KeyValueLookup(object):
     def _get(self, name):
         # get the value for this key and save in value_cache
         key = '%s.%s' % (self._key_prefix, name) if self._key_prefix else name
-        value = self._get_kv(key)
-        self._value_cache[key] = value
+        if key not in self._value_cache:
+            self._value_cache[key] = self._get_kv(key)
         # return a KeyValueLookup as response since the lookup may not be complete e.g. if
         # the lookup is for 'key_base.key_value' it is likely that the calling code, e.g. Jinja,
         # will expect to do a dictionary style lookup for key_base and key_value as subsequent
@@ -45,12 +74,206 @@ class KeyValueLookup(object):
         return KeyValueLookup(key, self._value_cache)
 
     def _get_kv(self, key):
-        kvp = None
-        try:
-            kvp = KeyValuePair.get_by_name(key)
-        except ValueError:
-            # ValueErrors are expected in case of partial lookups
-            pass
-        # A good default value for un-matched value is empty string since that will be used
-        # for rendering templates.
-        return kvp.value if kvp else ''
+        return get_key_values(names=[key])[key]
+
+    def _prefetch(self, names):
+        names = [name for name in names if name not in self._value_cache]
+
+        if names:
+            self._value_cache.update(get_key_values(names=names))
+
+
+class KeyValueCache(object):
+    """
+    Size limited process wide cache of datastore item values.
+
+    Items are cached for at most ``ttl`` seconds (or until they expire) and are evicted as soon
+    as a KeyValuePair CUD event for them is received. Once ``max_size`` items are cached, least
+    recently used items are evicted first.
+    """
+
+    def __init__(self, ttl, max_size=1000):
+        """
+        :param ttl: Number of seconds an item is cached for.
+        :type ttl: ``int``
+
+        :param max_size: Maximum number of cached items.
+        :type max_size: ``int``
+        """
+        self._ttl = datetime.timedelta(seconds=ttl)
+        self._max_size = max_size
+
+        # Maps name -> (value, expire_at)
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._watcher = ResourceWatcher(create_handler=self._handle_kvp_change,
+                                        update_handler=self._handle_kvp_change,
+                                        delete_handler=self._handle_kvp_change,
+                                        queue_name_base='st2.keyvalue.watch',
+                                        get_queue_func=get_keyvalue_cud_queue,
+                                        queue_suffix='cache',
+                                        exclusive=True)
+
+    def start(self):
+        self._watcher.start(wait_ready=True)
+
+    def stop(self):
+        self._watcher.stop()
+
+    def get_many(self, names):
+        """
+        Return cached values for the provided names. Names which are not cached are omitted.
+
+        :rtype: ``dict``
+        """
+        now = date_utils.get_datetime_utc_now()
+        result = {}
+
+        with self._lock:
+            for name in names:
+                item = self._items.pop(name, None)
+
+                if not item:
+                    continue
+
+                value, expire_at = item
+
+                if expire_at <= now:
+                    continue
+
+                # Re-insert the item so it becomes the most recently used one
+                self._items[name] = item
+                result[name] = value
+
+        return result
+
+    def set(self, name, value, expire_timestamp=None):
+        expire_at = date_utils.get_datetime_utc_now() + self._ttl
+
+        if expire_timestamp:
+            expire_at = min(expire_at, date_utils.convert_to_utc(expire_timestamp))
+
+        with self._lock:
+            self._items.pop(name, None)
+            self._items[name] = (value, expire_at)
+
+            while len(self._items) > self._max_size:
+                self._items.popitem(last=False)
+
+    def invalidate(self, name):
+        with self._lock:
+            self._items.pop(name, None)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+    def _handle_kvp_change(self, kvp_db):
+        LOG.debug('Datastore item "%s" changed, removing it from cache.', kvp_db.name)
+        self.invalidate(kvp_db.name)
+
+
+_KEY_VALUE_CACHE = None
+
+
+def setup_key_value_cache():
+    """
+    Set up and start the process wide datastore cache if caching is enabled.
+
+    Cache is only used once its watcher queue has been declared so no change events are missed.
+    This function is called on service setup.
+
+    :rtype: :class:`KeyValueCache`
+    """
+    global _KEY_VALUE_CACHE
+
+    ttl = cfg.CONF.keyvalue.cache_ttl
+
+    if ttl <= 0 or _KEY_VALUE_CACHE:
+        return _KEY_VALUE_CACHE
+
+    cache = KeyValueCache(ttl=ttl, max_size=cfg.CONF.keyvalue.cache_max_size)
+    cache.start()
+    _KEY_VALUE_CACHE = cache
+
+    return _KEY_VALUE_CACHE
+
+
+def get_key_value_cache():
+    """
+    Return process wide datastore cache or None if caching is disabled or the cache hasn't been
+    set up (see :func:`setup_key_value_cache`).
+
+    :rtype: :class:`KeyValueCache`
+    """
+    if cfg.CONF.keyvalue.cache_ttl <= 0:
+        return None
+
+    return _KEY_VALUE_CACHE
+
+
+def get_key_values(names):
+    """
+    Retrieve values for the provided datastore item names using a single query. Value for a
+    name which doesn't exist is an empty string.
+
+    :param names: Names of the datastore items.
+    :type names: ``list`` of ``str``
+
+    :rtype: ``dict``
+    """
+    cache = get_key_value_cache()
+    result = cache.get_many(names) if cache else {}
+    missing_names = [name for name in set(names) if name not in result]
+
+    if not missing_names:
+        return result
+
+    kvp_dbs = KeyValuePair.query(name__in=missing_names)
+    kvp_dbs = dict([(kvp_db.name, kvp_db) for kvp_db in kvp_dbs])
+
+    for name in missing_names:
+        kvp_db = kvp_dbs.get(name, None)
+        value = kvp_db.value if kvp_db else MISSING_VALUE
+        result[name] = value
+
+        if cache:
+            cache.set(name, value, expire_timestamp=kvp_db.expire_timestamp if kvp_db else None)
+
+    return result
+
+
+def prefetch_key_values(kv_lookup, templates):
+    """
+    Retrieve all the datastore items which are referenced in the provided templates using
+    the ``system`` prefix with a single query and store them in the lookup object.
+
+    :param kv_lookup: Lookup object which is used for rendering the templates.
+    :type kv_lookup: :class:`KeyValueLookup`
+
+    :param templates: Template strings or dicts / lists containing template strings.
+    :type templates: ``list``
+    """
+    names = set()
+
+    for template in templates or []:
+        names.update(jinja_utils.get_attribute_paths(template, SYSTEM_KV_PREFIX))
+
+    if names:
+        kv_lookup._prefetch(names=names)
+
+
+def get_key_value_lookup(templates=None):
+    """
+    Return a lookup object with the datastore items referenced in the provided templates
+    already retrieved.
+
+    :rtype: :class:`KeyValueLookup`
+    """
+    kv_lookup = KeyValueLookup()
+    prefetch_key_values(kv_lookup=kv_lookup, templates=templates)
+    return kv_lookup
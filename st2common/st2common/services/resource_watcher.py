@@ -0,0 +1,160 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import eventlet
+from eventlet.event import Event
+from kombu.mixins import ConsumerMixin
+from kombu import Connection
+
+from st2common import log as logging
+from st2common.transport import codec, publishers
+from st2common.transport import utils as transport_utils
+import st2common.util.queues as queue_utils
+
+__all__ = [
+    'ResourceWatcher'
+]
+
+LOG = logging.getLogger(__name__)
+
+# How long to wait for the watcher queue to be declared on start (in seconds)
+READY_TIMEOUT = 10
+
+
+class ResourceWatcher(ConsumerMixin):
+    """
+    Generic watcher which calls the provided handlers for the CUD events published by
+    :class:`st2common.transport.publishers.CUDPublisher` for a particular resource.
+    """
+
+    def __init__(self, create_handler, update_handler, delete_handler, queue_name_base,
+                 get_queue_func, queue_suffix=None, exclusive=False):
+        """
+        :param create_handler: Function which is called on resource create event.
+        :type create_handler: ``callable``
+
+        :param update_handler: Function which is called on resource update event.
+        :type update_handler: ``callable``
+
+        :param delete_handler: Function which is called on resource delete event.
+        :type delete_handler: ``callable``
+
+        :param queue_name_base: Base name of the queue.
+        :type queue_name_base: ``str``
+
+        :param get_queue_func: Function which returns a queue bound to the resource CUD
+                               exchange. Called with name, routing_key and exclusive arguments.
+        :type get_queue_func: ``callable``
+
+        :param exclusive: If the Q is exclusive to a specific connection which is then
+                          single connection created by the watcher. When the connection
+                          breaks the Q is removed by the message broker.
+        :type exclusive: ``bool``
+        """
+        self._create_handler = create_handler
+        self._update_handler = update_handler
+        self._delete_handler = delete_handler
+
+        queue_name = queue_utils.get_queue_name(queue_name_base=queue_name_base,
+                                                queue_name_suffix=queue_suffix,
+                                                add_random_uuid_to_suffix=True)
+        self._watcher_q = get_queue_func(queue_name, routing_key='#', exclusive=exclusive)
+
+        self.connection = None
+        self._updates_thread = None
+        # Set once the queue has been declared and the watcher started consuming from it
+        self._consume_ready = Event()
+
+        self._handlers = {
+            publishers.CREATE_RK: create_handler,
+            publishers.UPDATE_RK: update_handler,
+            publishers.DELETE_RK: delete_handler
+        }
+
+    def get_consumers(self, Consumer, channel):
+        consumers = [Consumer(queues=[self._watcher_q],
+                              accept=codec.get_accepted_codecs(),
+                              callbacks=[self.process_task])]
+        return consumers
+
+    def process_task(self, body, message):
+        LOG.debug('process_task')
+        LOG.debug('     body: %s', body)
+        LOG.debug('     message.properties: %s', message.properties)
+        LOG.debug('     message.delivery_info: %s', message.delivery_info)
+
+        routing_key = message.delivery_info.get('routing_key', '')
+        handler = self._handlers.get(routing_key, None)
+
+        try:
+            if not handler:
+                LOG.info('Skipping message %s as no handler was found.', message)
+                return
+
+            try:
+                handler(body)
+            except Exception as e:
+                LOG.exception('Handling failed. Message body: %s. Exception: %s',
+                              body, e.message)
+        finally:
+            message.ack()
+
+    def on_consume_ready(self, connection, channel, consumers, **kwargs):
+        super(ResourceWatcher, self).on_consume_ready(connection, channel, consumers, **kwargs)
+
+        if not self._consume_ready.ready():
+            self._consume_ready.send(True)
+
+    def start(self, wait_ready=False):
+        """
+        :param wait_ready: True to block until the watcher queue is declared and no events
+                           published from now on are missed.
+        :type wait_ready: ``bool``
+        """
+        try:
+            self.connection = Connection(transport_utils.get_messaging_urls())
+            self._updates_thread = eventlet.spawn(self.run)
+        except:
+            LOG.exception('Failed to start %s.', self.__class__.__name__)
+            self.connection.release()
+            return
+
+        if wait_ready:
+            self.wait_ready()
+
+    def wait_ready(self, timeout=READY_TIMEOUT):
+        """
+        Wait until the watcher queue is declared.
+
+        :return: True if the watcher is ready, False if the wait timed out.
+        :rtype: ``bool``
+        """
+        with eventlet.Timeout(timeout, False):
+            self._consume_ready.wait()
+
+        if not self._consume_ready.ready():
+            LOG.warning('%s queue has not been declared in %s seconds, events published in the '
+                        'meantime might be missed.', self.__class__.__name__, timeout)
+            return False
+
+        return True
+
+    def stop(self):
+        try:
+            if self._updates_thread:
+                self._updates_thread = eventlet.kill(self._updates_thread)
+        finally:
+            if self.connection:
+                self.connection.release()
@@ -0,0 +1,49 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from st2common.services.resource_watcher import ResourceWatcher
+from st2common.transport import reactor
+
+__all__ = [
+    'RuleWatcher'
+]
+
+
+class RuleWatcher(ResourceWatcher):
+
+    def __init__(self, create_handler, update_handler, delete_handler,
+                 queue_suffix=None, exclusive=False):
+        """
+        :param create_handler: Function which is called on RuleDB create event.
+        :type create_handler: ``callable``
+
+        :param update_handler: Function which is called on RuleDB update event.
+        :type update_handler: ``callable``
+
+        :param delete_handler: Function which is called on RuleDB delete event.
+        :type delete_handler: ``callable``
+
+        :param exclusive: If the Q is exclusive to a specific connection which is then
+                          single connection created by RuleWatcher. When the connection
+                          breaks the Q is removed by the message broker.
+        :type exclusive: ``bool``
+        """
+        super(RuleWatcher, self).__init__(create_handler=create_handler,
+                                          update_handler=update_handler,
+                                          delete_handler=delete_handler,
+                                          queue_name_base='st2.rule.watch',
+                                          get_queue_func=reactor.get_rule_cud_queue,
+                                          queue_suffix=queue_suffix,
+                                          exclusive=exclusive)
@@ -67,7 +67,7 @@ def get_trigger_db_by_ref(ref):
 
     :rtype trigger_type: ``object``
     """
-    return Trigger.get_by_ref(ref)
+    return Trigger.get_by_ref_cached(ref)
 
 
 def _get_trigger_db(trigger):
@@ -97,7 +97,7 @@ def get_trigger_type_db(ref):
     :rtype trigger_type: ``object``
     """
     try:
-        return TriggerType.get_by_ref(ref)
+        return TriggerType.get_by_ref_cached(ref)
     except ValueError as e:
         LOG.debug('Database lookup for ref="%s" resulted ' +
                   'in exception : %s.', ref, e, exc_info=True)
@@ -19,7 +19,7 @@ from kombu import Connection
 
 from st2common import log as logging
 from st2common.persistence.trigger import Trigger
-from st2common.transport import reactor, publishers
+from st2common.transport import codec, reactor, publishers
 from st2common.transport import utils as transport_utils
 import st2common.util.queues as queue_utils
 
@@ -71,7 +71,7 @@ class TriggerWatcher(ConsumerMixin):
 
     def get_consumers(self, Consumer, channel):
         return [Consumer(queues=[self._trigger_watch_q],
-                         accept=['pickle'],
+                         accept=codec.get_accepted_codecs(),
                          callbacks=[self.process_task])]
 
     def process_task(self, body, message):
@@ -134,6 +134,13 @@ class TriggerWatcher(ConsumerMixin):
         eventlet.sleep(seconds=self.sleep_interval)
 
     def _load_triggers_from_db(self):
+        if not self._trigger_types:
+            # No filtering, all the triggers are of interest
+            for trigger in Trigger.get_all():
+                LOG.debug('Found existing trigger: %s in db.' % trigger)
+                self._handlers[publishers.CREATE_RK](trigger)
+            return
+
         for trigger_type in self._trigger_types:
             for trigger in Trigger.query(type=trigger_type):
                 LOG.debug('Found existing trigger: %s in db.' % trigger)
@@ -14,6 +14,7 @@
 # limitations under the License.
 
 from st2common.transport import liveaction, actionexecutionstate, execution, publishers, reactor
+from st2common.transport import keyvalue, action, codec, delta
 from st2common.transport import bootstrap_utils, utils, connection_retry_wrapper
 
 # TODO(manas) : Exchanges, Queues and RoutingKey design discussion pending.
@@ -24,6 +25,10 @@ __all__ = [
     'execution',
     'publishers',
     'reactor',
+    'keyvalue',
+    'action',
+    'codec',
+    'delta',
     'bootstrap_utils',
     'utils',
     'connection_retry_wrapper'
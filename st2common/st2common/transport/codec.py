@@ -0,0 +1,286 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Codecs used to serialize message bodies published on the st2 exchanges.
+
+Besides the legacy "pickle" codec, compact codecs which don't depend on the exact layout of the
+Python classes are available. Model objects are encoded using their MongoDB representation and
+reconstructed by the consumer from it. Encoded bodies carry a version tag which allows the format
+to evolve.
+
+Consumers accept all the available codecs. This means codec can be switched (``messaging.codec``
+option) once all the services have been upgraded to a version which understands it.
+
+Encoded bodies larger than ``messaging.compression_threshold`` bytes are compressed. Compression
+method is stored in the message headers and kombu decompresses the body before decoding it.
+"""
+
+import datetime
+import json
+
+import dateutil.parser
+import six
+from bson import ObjectId
+from kombu import compression
+from kombu import serialization
+from kombu.exceptions import EncodeError
+from mongoengine.base import BaseDocument
+from mongoengine.base import get_document
+from oslo_config import cfg
+
+from st2common import log as logging
+from st2common.models.api.trace import TraceContext
+from st2common.transport.delta import ModelUpdateDelta
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+__all__ = [
+    'encode',
+    'get_accepted_codecs',
+    'get_compression',
+
+    'to_primitive',
+    'from_primitive'
+]
+
+LOG = logging.getLogger(__name__)
+
+CODEC_PICKLE = 'pickle'
+CODEC_JSON = 'st2-json'
+CODEC_MSGPACK = 'st2-msgpack'
+
+COMPRESSION_ZLIB = 'zlib'
+COMPRESSION_LZ4 = 'lz4'
+
+# Version of the message body format used by the compact codecs
+CODEC_VERSION = 1
+
+# Keys used to tag encoded values which are not natively supported by JSON / msgpack
+DOCUMENT_KEY = '$document'
+OBJECT_ID_KEY = '$oid'
+DATE_KEY = '$date'
+TYPE_KEY = '$type'
+
+# Key used to wrap plain dictionaries which contain "$" prefixed keys so they are never confused
+# with the tagged values above
+DICT_KEY = '$dict'
+
+# Non-document classes which can be sent over the message bus. Maps type name to a tuple of
+# (class, function which returns dict representation, function which creates an instance from a
+# dict representation)
+CUSTOM_TYPES = {
+    'TraceContext': (TraceContext, lambda value: value.__json__(),
+                     lambda value: TraceContext(**value)),
+    'ModelUpdateDelta': (ModelUpdateDelta, lambda value: value.__json__(),
+                         lambda value: ModelUpdateDelta(**value))
+}
+
+
+class UnsupportedMessageVersionError(ValueError):
+    pass
+
+
+def to_primitive(value):
+    """
+    Convert the provided value to a structure which only contains values natively supported by
+    JSON and msgpack.
+    """
+    if value is None or isinstance(value, (bool, float) + six.integer_types + six.string_types):
+        return value
+
+    if isinstance(value, dict):
+        result = {}
+
+        for key, item in six.iteritems(value):
+            if not isinstance(key, six.string_types):
+                raise TypeError('Dictionary key "%s" is not a string' % (key))
+
+            result[key] = to_primitive(item)
+
+        if any(key.startswith('$') for key in result):
+            return {DICT_KEY: result}
+
+        return result
+
+    if isinstance(value, (list, tuple)):
+        return [to_primitive(item) for item in value]
+
+    if isinstance(value, BaseDocument):
+        return {DOCUMENT_KEY: value._class_name, 'value': to_primitive(value.to_mongo())}
+
+    if isinstance(value, ObjectId):
+        return {OBJECT_ID_KEY: str(value)}
+
+    if isinstance(value, datetime.datetime):
+        return {DATE_KEY: value.isoformat()}
+
+    for type_name, (cls, to_dict, _) in six.iteritems(CUSTOM_TYPES):
+        if isinstance(value, cls):
+            return {TYPE_KEY: type_name, 'value': to_primitive(to_dict(value))}
+
+    raise TypeError('Value of type "%s" can\'t be encoded' % (type(value)))
+
+
+def from_primitive(value):
+    """
+    Reverse of :func:`to_primitive`.
+    """
+    if isinstance(value, list):
+        return [from_primitive(item) for item in value]
+
+    if not isinstance(value, dict):
+        return value
+
+    if DICT_KEY in value:
+        return dict([(key, from_primitive(item)) for key, item in six.iteritems(value[DICT_KEY])])
+
+    if OBJECT_ID_KEY in value:
+        return ObjectId(value[OBJECT_ID_KEY])
+
+    if DATE_KEY in value:
+        return dateutil.parser.parse(value[DATE_KEY])
+
+    if DOCUMENT_KEY in value:
+        document_cls = get_document(value[DOCUMENT_KEY])
+        return document_cls._from_son(from_primitive(value['value']))
+
+    if TYPE_KEY in value:
+        _, _, from_dict = CUSTOM_TYPES[value[TYPE_KEY]]
+        return from_dict(from_primitive(value['value']))
+
+    return dict([(key, from_primitive(item)) for key, item in six.iteritems(value)])
+
+
+def _wrap(body):
+    return {'v': CODEC_VERSION, 'body': to_primitive(body)}
+
+
+def _unwrap(data):
+    version = data.get('v', None)
+
+    if version != CODEC_VERSION:
+        raise UnsupportedMessageVersionError('Unsupported message format version: %s' % (version))
+
+    return from_primitive(data['body'])
+
+
+def _json_dumps(body):
+    return json.dumps(_wrap(body), separators=(',', ':'))
+
+
+def _json_loads(data):
+    if isinstance(data, six.binary_type):
+        data = data.decode('utf-8')
+
+    return _unwrap(json.loads(data))
+
+
+def _msgpack_dumps(body):
+    return msgpack.packb(_wrap(body), use_bin_type=True)
+
+
+def _msgpack_loads(data):
+    return _unwrap(msgpack.unpackb(data, raw=False))
+
+
+def register_codecs():
+    serialization.register(CODEC_JSON, _json_dumps, _json_loads,
+                           content_type='application/x-st2-json', content_encoding='utf-8')
+
+    if msgpack:
+        serialization.register(CODEC_MSGPACK, _msgpack_dumps, _msgpack_loads,
+                               content_type='application/x-st2-msgpack',
+                               content_encoding='binary')
+
+
+def register_compressions():
+    # zlib is supported by kombu out of the box
+    if lz4_frame:
+        compression.register(lz4_frame.compress, lz4_frame.decompress,
+                             content_type='application/x-lz4', aliases=[COMPRESSION_LZ4])
+
+
+def get_compression(body):
+    """
+    Return name of the compression method to use for the provided encoded message body or None
+    if the body shouldn't be compressed.
+
+    :param body: Encoded message body.
+    :type body: ``str``
+
+    :rtype: ``str``
+    """
+    method = cfg.CONF.messaging.compression
+    threshold = cfg.CONF.messaging.compression_threshold
+
+    if not method or threshold <= 0 or len(body) < threshold:
+        return None
+
+    if method == COMPRESSION_LZ4 and not lz4_frame:
+        LOG.warning('lz4 library is not installed, falling back to zlib compression.')
+        return COMPRESSION_ZLIB
+
+    return method
+
+
+def get_accepted_codecs():
+    """
+    Return names of all the codecs consumers accept.
+
+    :rtype: ``list`` of ``str``
+    """
+    codecs = [CODEC_PICKLE, CODEC_JSON]
+
+    if msgpack:
+        codecs.append(CODEC_MSGPACK)
+
+    return codecs
+
+
+def encode(body, codec=None):
+    """
+    Encode the provided message body.
+
+    If the body contains a value which can't be encoded using the configured codec, it's encoded
+    using pickle.
+
+    :param codec: Name of the codec to use. Defaults to the configured one.
+    :type codec: ``str``
+
+    :return: Tuple of (content_type, content_encoding, encoded_body).
+    :rtype: ``tuple``
+    """
+    codec = codec or cfg.CONF.messaging.codec
+
+    if codec != CODEC_PICKLE:
+        try:
+            return serialization.dumps(body, serializer=codec)
+        except (TypeError, EncodeError) as e:
+            LOG.debug('Falling back to pickle, unable to encode message using "%s": %s', codec, e)
+
+    return serialization.dumps(body, serializer=CODEC_PICKLE)
+
+
+register_codecs()
+register_compressions()
@@ -97,7 +97,7 @@ class ConnectionRetryWrapper(object):
     def errback(self, exc, interval):
         self._logger.error('Rabbitmq connection error: %s', exc.message)
 
-    def run(self, connection, wrapped_callback):
+    def run(self, connection, wrapped_callback, channel_factory=None):
         """
         Run the wrapped_callback in a protective covering of retries and error handling.
 
@@ -107,12 +107,21 @@ class ConnectionRetryWrapper(object):
         :param wrapped_callback: Callback that will be wrapped by all the fine handling in this
                                  method. Expected signature of callback -
                                  ``def func(connection, channel)``
+
+        :param channel_factory: Optional function which returns the channel to use for the
+                                provided connection. Channels returned by it are owned by the
+                                caller and are not closed once the callback has run. By default
+                                a new channel is opened and closed for each run.
+        :type channel_factory: ``callable``
         """
         should_stop = False
         channel = None
         while not should_stop:
             try:
-                channel = connection.channel()
+                if channel_factory:
+                    channel = channel_factory(connection)
+                else:
+                    channel = connection.channel()
                 wrapped_callback(connection=connection, channel=channel)
                 should_stop = True
             except connection.connection_errors + connection.channel_errors as e:
@@ -143,7 +152,7 @@ class ConnectionRetryWrapper(object):
                 # Not being able to publish a message could be a significant issue for an app.
                 raise
             finally:
-                if should_stop and channel:
+                if should_stop and channel and not channel_factory:
                     try:
                         channel.close()
                     except Exception:
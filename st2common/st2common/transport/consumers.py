@@ -18,40 +18,69 @@ import eventlet
 import six
 
 from kombu.mixins import ConsumerMixin
+from oslo_config import cfg
 
 from st2common import log as logging
+from st2common.transport import codec
 from st2common.util.greenpooldispatch import BufferedDispatcher
 
 
 LOG = logging.getLogger(__name__)
 
 
+def get_consumer_opt(name, group=None):
+    """
+    Return the value of a consumer option for the provided service config group, falling back to
+    the value from the "messaging" group when the service doesn't override it.
+    """
+    group_opts = getattr(cfg.CONF, group, None) if group else None
+    value = getattr(group_opts, name, None) if group_opts else None
+
+    if value is None:
+        value = getattr(cfg.CONF.messaging, name)
+
+    return value
+
+
 class QueueConsumer(ConsumerMixin):
     def __init__(self, connection, queues, handler):
         self.connection = connection
-        self._dispatcher = BufferedDispatcher()
         self._queues = queues
         self._handler = handler
 
+        config_group = getattr(handler, 'config_group', None)
+        self._prefetch_count = get_consumer_opt('prefetch_count', config_group)
+        self._max_in_flight = get_consumer_opt('max_in_flight', config_group)
+        self._ack_after_processing = get_consumer_opt('ack_after_processing', config_group)
+
+        self._dispatcher = BufferedDispatcher(dispatch_pool_size=self._max_in_flight)
+        # Tracks free dispatcher capacity. Once all the slots are taken, process() blocks and no
+        # more messages are read from the channel until one of the in-flight messages completes.
+        self._in_flight = eventlet.semaphore.Semaphore(self._max_in_flight)
+
     def shutdown(self):
         self._dispatcher.shutdown()
 
     def get_consumers(self, Consumer, channel):
-        consumer = Consumer(queues=self._queues, accept=['pickle'], callbacks=[self.process])
+        consumer = Consumer(queues=self._queues, accept=codec.get_accepted_codecs(),
+                            callbacks=[self.process])
 
-        # use prefetch_count=1 for fair dispatch. This way workers that finish an item get the next
-        # task and the work does not get queued behind any single large item.
-        consumer.qos(prefetch_count=1)
+        # prefetch_count=1 (default) results in fair dispatch. This way workers that finish an item
+        # get the next task and the work does not get queued behind any single large item.
+        consumer.qos(prefetch_count=self._prefetch_count)
 
         return [consumer]
 
     def process(self, body, message):
+        self._in_flight.acquire()
+
         try:
-            self._dispatcher.dispatch(self._process_message, body)
+            self._dispatcher.dispatch(self._process_message, body, message)
         finally:
-            message.ack()
+            if not self._ack_after_processing:
+                message.ack()
 
-    def _process_message(self, body):
+    def _process_message(self, body, message=None):
         try:
             if not isinstance(body, self._handler.message_type):
                 raise TypeError('Received an unexpected type "%s" for payload.' % type(body))
@@ -59,11 +88,19 @@ class QueueConsumer(ConsumerMixin):
             self._handler.process(body)
         except:
             LOG.exception('%s failed to process message: %s', self.__class__.__name__, body)
+        finally:
+            if message is not None:
+                if self._ack_after_processing:
+                    message.ack()
+                self._in_flight.release()
 
 
 @six.add_metaclass(abc.ABCMeta)
 class MessageHandler(object):
     message_type = None
+    # Name of the service config group which can override the consumer options from the
+    # "messaging" group (prefetch_count, max_in_flight, ack_after_processing).
+    config_group = None
 
     def __init__(self, connection, queues):
         self._queue_consumer = QueueConsumer(connection, queues, self)
@@ -0,0 +1,168 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Slim update events for models which are updated often and carry large attributes (executions and
+live actions).
+"""
+
+import six
+
+__all__ = [
+    'ModelUpdateDelta',
+
+    'get_changed_fields',
+    'get_updated_fields'
+]
+
+# Operators which can prefix a field name in the mongoengine update() keyword arguments
+UPDATE_OPERATORS = ['set', 'unset', 'inc', 'dec', 'push', 'push_all', 'pull', 'pull_all',
+                    'add_to_set', 'pop', 'max', 'min', 'rename', 'set_on_insert']
+
+
+class ModelUpdateDelta(object):
+    """
+    Update event for a model object.
+
+    Contains the object id, attributes which are always included (e.g. status and timestamps),
+    values of the changed top-level attributes which are cheap to send and names of all the
+    changed top-level attributes. Consumers which need the full object retrieve it from the
+    database using the id.
+
+    Included attribute values are available as attributes of the delta object.
+    """
+
+    def __init__(self, model, id, values=None, changed_fields=None):
+        """
+        :param model: Name of the model class (e.g. LiveActionDB).
+        :type model: ``str``
+
+        :param id: Id of the updated object.
+        :type id: ``str``
+
+        :param values: Values of the included attributes.
+        :type values: ``dict``
+
+        :param changed_fields: Names of the changed top-level attributes. None if they are not
+                               known in which case any attribute could have changed.
+        :type changed_fields: ``list``
+        """
+        self.model = model
+        self.id = id
+        self.values = values or {}
+        self.changed_fields = changed_fields
+
+    @classmethod
+    def from_model(cls, model_object, fields, lazy_fields=None, changed_fields=None):
+        """
+        Create a delta for the provided model object.
+
+        :param fields: Names of the attributes which are always included.
+        :type fields: ``list``
+
+        :param lazy_fields: Names of the attributes which are never included, even if they have
+                            changed.
+        :type lazy_fields: ``list``
+        """
+        lazy_fields = lazy_fields or []
+        included_fields = list(fields)
+
+        for field in changed_fields or []:
+            if field not in lazy_fields and field not in included_fields:
+                included_fields.append(field)
+
+        values = dict([(field, getattr(model_object, field, None)) for field in included_fields])
+        return cls(model=model_object.__class__.__name__, id=str(model_object.id),
+                   values=values, changed_fields=changed_fields)
+
+    def has_changed(self, field):
+        if self.changed_fields is None:
+            return True
+
+        return field in self.changed_fields
+
+    def __json__(self):
+        return {
+            'model': self.model,
+            'id': self.id,
+            'values': self.values,
+            'changed_fields': self.changed_fields
+        }
+
+    def __getattr__(self, name):
+        # Note: Use __dict__ since the attributes are not set yet when unpickling
+        values = self.__dict__.get('values', {})
+
+        if name in values:
+            return values[name]
+
+        raise AttributeError('%s has no attribute "%s"' % (self.__class__.__name__, name))
+
+    def __repr__(self):
+        return '<%s model=%s,id=%s,changed_fields=%s>' % (self.__class__.__name__, self.model,
+                                                         self.id, self.changed_fields)
+
+
+def get_changed_fields(model_object):
+    """
+    Return names of the changed top-level attributes of a model object which has been retrieved
+    from the database and not saved yet.
+
+    :rtype: ``list`` or ``None``
+    """
+    get_fields = getattr(model_object, '_get_changed_fields', None)
+
+    if not get_fields or not getattr(model_object, 'id', None):
+        return None
+
+    changed_fields = get_fields()
+
+    if not changed_fields:
+        # Object wasn't retrieved from the database so changes are not tracked
+        return None
+
+    return _get_top_level_fields(changed_fields)
+
+
+def get_updated_fields(update_kwargs):
+    """
+    Return names of the top-level attributes modified by the mongoengine update() call with the
+    provided keyword arguments.
+
+    :rtype: ``list``
+    """
+    fields = []
+
+    for key in six.iterkeys(update_kwargs):
+        parts = key.split('__')
+
+        if len(parts) > 1 and parts[0] in UPDATE_OPERATORS:
+            parts = parts[1:]
+
+        fields.append(parts[0])
+
+    return _get_top_level_fields(fields)
+
+
+def _get_top_level_fields(fields):
+    result = []
+
+    for field in fields:
+        field = field.split('.')[0]
+
+        if field not in result:
+            result.append(field)
+
+    return result
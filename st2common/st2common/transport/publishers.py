@@ -13,12 +13,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import atexit
 import copy
+import weakref
 
+import eventlet
 from kombu import Connection
 from kombu.messaging import Producer
+from oslo_config import cfg
 
 from st2common import log as logging
+from st2common.transport import codec
 from st2common.transport.connection_retry_wrapper import ConnectionRetryWrapper
 
 ANY_RK = '*'
@@ -26,39 +31,244 @@ CREATE_RK = 'create'
 UPDATE_RK = 'update'
 DELETE_RK = 'delete'
 
+# How long to wait for the broker to confirm a batch of messages (in seconds)
+CONFIRM_TIMEOUT = 10
+
 LOG = logging.getLogger(__name__)
 
 
+class PublishConfirms(object):
+    """
+    Tracks publisher confirms for the messages published on a channel in the confirm mode.
+    """
+
+    def __init__(self, channel):
+        self._delivery_tag = 0
+        self._unconfirmed = set()
+        self._nacked = set()
+
+        channel.confirm_select()
+        channel.events['basic_ack'].add(self._on_ack)
+        channel.events['basic_nack'].add(self._on_nack)
+
+    def add_published(self):
+        # Broker numbers the messages published on a channel starting from 1
+        self._delivery_tag += 1
+        self._unconfirmed.add(self._delivery_tag)
+
+    def wait(self, connection, timeout=CONFIRM_TIMEOUT):
+        """
+        Wait until all the published messages are confirmed by the broker.
+        """
+        while self._unconfirmed:
+            connection.drain_events(timeout=timeout)
+
+        if self._nacked:
+            count = len(self._nacked)
+            self._nacked.clear()
+            raise Exception('Broker rejected %s published message(s).' % (count))
+
+    def _on_ack(self, delivery_tag, multiple=False):
+        self._confirm(delivery_tag, multiple)
+
+    def _on_nack(self, delivery_tag, multiple=False):
+        self._nacked.update(self._confirm(delivery_tag, multiple))
+
+    def _confirm(self, delivery_tag, multiple):
+        if multiple:
+            confirmed = set([tag for tag in self._unconfirmed if tag <= delivery_tag])
+        else:
+            confirmed = set([delivery_tag]) & self._unconfirmed
+
+        self._unconfirmed -= confirmed
+        return confirmed
+
+
 class PoolPublisher(object):
-    def __init__(self, urls):
+    def __init__(self, urls, confirm=False):
+        """
+        :param confirm: True to put the channels in the confirm mode and wait for the broker to
+                        confirm the published messages.
+        :type confirm: ``bool``
+        """
         self.pool = Connection(urls, failover_strategy='round-robin').Pool(limit=10)
         self.cluster_size = len(urls)
 
+        self._confirm = confirm
+        # Producer per pooled connection. Producer is reused for as long as the connection's
+        # default channel it is bound to stays open.
+        self._producers = weakref.WeakKeyDictionary()
+        # Maps channel -> PublishConfirms
+        self._confirms = weakref.WeakKeyDictionary()
+
     def errback(self, exc, interval):
         LOG.error('Rabbitmq connection error: %s', exc.message, exc_info=False)
 
     def publish(self, payload, exchange, routing_key=''):
+        # Encode the message only once, outside of the retry loop
+        self.publish_messages([self.encode_message(payload, exchange, routing_key)])
+
+    def publish_messages(self, messages):
+        """
+        Publish already encoded messages using a single pooled connection and channel.
+
+        :param messages: Messages as returned by :meth:`encode_message`.
+        :type messages: ``list`` of ``dict``
+        """
         with self.pool.acquire(block=True) as connection:
             retry_wrapper = ConnectionRetryWrapper(cluster_size=self.cluster_size, logger=LOG)
 
             def do_publish(connection, channel):
                 # ProducerPool ends up creating it own ConnectionPool which ends up completely
-                # invalidating this ConnectionPool. Also, a ConnectionPool for producer does not
-                # really solve any problems for us so better to create a Producer for each
-                # publish.
-                producer = Producer(channel)
-                kwargs = {
-                    'body': payload,
-                    'exchange': exchange,
-                    'routing_key': routing_key,
-                    'serializer': 'pickle'
-                }
-                retry_wrapper.ensured(connection=connection,
-                                      obj=producer,
-                                      to_ensure_func=producer.publish,
-                                      **kwargs)
-
-            retry_wrapper.run(connection=connection, wrapped_callback=do_publish)
+                # invalidating this ConnectionPool so a Producer is kept for each pooled
+                # connection instead.
+                producer = self._get_producer(connection=connection, channel=channel)
+                confirms = self._get_confirms(channel=channel) if self._confirm else None
+
+                if confirms:
+                    # Messages can't be retried one by one in the confirm mode since the channel
+                    # is replaced on failure. Whole batch is published again on a new channel by
+                    # the retry wrapper instead.
+                    for kwargs in messages:
+                        producer.publish(**kwargs)
+                        confirms.add_published()
+
+                    confirms.wait(connection=connection)
+                    return
+
+                for kwargs in messages:
+                    retry_wrapper.ensured(connection=connection,
+                                          obj=producer,
+                                          to_ensure_func=producer.publish,
+                                          **kwargs)
+
+            retry_wrapper.run(connection=connection, wrapped_callback=do_publish,
+                              channel_factory=self._get_channel)
+
+    @staticmethod
+    def encode_message(payload, exchange, routing_key=''):
+        """
+        Encode the payload and return publish arguments for it. Large bodies are compressed
+        by kombu (see :func:`st2common.transport.codec.get_compression`).
+
+        :rtype: ``dict``
+        """
+        content_type, content_encoding, body = codec.encode(payload)
+
+        return {
+            'body': body,
+            'exchange': exchange,
+            'routing_key': routing_key,
+            'content_type': content_type,
+            'content_encoding': content_encoding,
+            'compression': codec.get_compression(body)
+        }
+
+    def _get_channel(self, connection):
+        # Default channel is closed and replaced by kombu when the connection is re-established
+        return connection.default_channel
+
+    def _get_producer(self, connection, channel):
+        producer = self._producers.get(connection, None)
+
+        if not producer or producer.channel is not channel:
+            producer = Producer(channel)
+            self._producers[connection] = producer
+
+        return producer
+
+    def _get_confirms(self, channel):
+        confirms = self._confirms.get(channel, None)
+
+        if not confirms:
+            if not hasattr(channel, 'confirm_select') or not hasattr(channel, 'events'):
+                # Transport doesn't support publisher confirms
+                return None
+
+            confirms = PublishConfirms(channel=channel)
+            self._confirms[channel] = confirms
+
+        return confirms
+
+
+class BatchedPoolPublisher(PoolPublisher):
+    """
+    Publisher which buffers messages and publishes them in batches.
+
+    Batch is published once it reaches batch_size messages or flush_interval seconds after the
+    first message has been buffered. Each batch is published on a single channel and the flush
+    only finishes once the broker has confirmed all the messages in the batch.
+
+    Messages which fail to publish on timer are put back to the buffer and retried. Remaining
+    buffered messages are flushed on process exit.
+    """
+
+    def __init__(self, urls, batch_size=100, flush_interval=0.05):
+        super(BatchedPoolPublisher, self).__init__(urls=urls, confirm=True)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._buffer = []
+        self._flush_timer = None
+
+        atexit.register(self._flush_on_exit)
+
+    def publish(self, payload, exchange, routing_key=''):
+        self._buffer.append(self.encode_message(payload, exchange, routing_key))
+
+        if len(self._buffer) >= self._batch_size:
+            self.flush()
+        else:
+            self._schedule_flush()
+
+    def publish_messages(self, messages):
+        """
+        Publish already encoded messages together with all the buffered messages. Buffered
+        messages are published first so the publish order is preserved.
+        """
+        self._cancel_flush()
+
+        messages, self._buffer = self._buffer + list(messages), []
+
+        if messages:
+            super(BatchedPoolPublisher, self).publish_messages(messages)
+
+    def flush(self):
+        """
+        Publish all the buffered messages.
+        """
+        self.publish_messages([])
+
+    def _schedule_flush(self):
+        if not self._flush_timer:
+            self._flush_timer = eventlet.spawn_after(self._flush_interval, self._flush_on_timer)
+
+    def _cancel_flush(self):
+        if self._flush_timer:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+    def _flush_on_timer(self):
+        self._flush_timer = None
+
+        messages, self._buffer = self._buffer, []
+
+        if not messages:
+            return
+
+        try:
+            super(BatchedPoolPublisher, self).publish_messages(messages)
+        except Exception:
+            LOG.exception('Failed to publish a batch of %s messages, retrying.', len(messages))
+            self._buffer = messages + self._buffer
+            self._schedule_flush()
+
+    def _flush_on_exit(self):
+        count = len(self._buffer)
+
+        try:
+            self.flush()
+        except Exception:
+            LOG.exception('Failed to publish %s buffered messages on exit.', count)
 
 
 class SharedPoolPublishers(object):
@@ -79,7 +289,14 @@ class SharedPoolPublishers(object):
         publisher = self.shared_publishers.get(publisher_key, None)
         if not publisher:
             # Use original urls here to preserve order.
-            publisher = PoolPublisher(urls=urls)
+            batch_size = cfg.CONF.messaging.publish_batch_size
+
+            if batch_size > 0:
+                flush_interval = cfg.CONF.messaging.publish_flush_interval / 1000.0
+                publisher = BatchedPoolPublisher(urls=urls, batch_size=batch_size,
+                                                 flush_interval=flush_interval)
+            else:
+                publisher = PoolPublisher(urls=urls)
             self.shared_publishers[publisher_key] = publisher
         return publisher
 
@@ -98,6 +315,18 @@ class CUDPublisher(object):
     def publish_delete(self, payload):
         self._publisher.publish(payload, self._exchange, DELETE_RK)
 
+    def publish_create_many(self, payloads):
+        self._publish_many(payloads, CREATE_RK)
+
+    def publish_update_many(self, payloads):
+        self._publish_many(payloads, UPDATE_RK)
+
+    def _publish_many(self, payloads, routing_key):
+        # All the messages are published as a single batch on the same channel
+        messages = [self._publisher.encode_message(payload, self._exchange, routing_key)
+                    for payload in payloads]
+        self._publisher.publish_messages(messages)
+
 
 class StatePublisherMixin(object):
     def __init__(self, urls, exchange):
@@ -13,22 +13,30 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import six
 from kombu import Exchange, Queue
 
 from st2common import log as logging
 from st2common.constants.trace import TRACE_CONTEXT
 from st2common.models.api.trace import TraceContext
+from st2common.models.system.common import ResourceReference
 from st2common.transport import publishers
 from st2common.transport import utils as transport_utils
 
 __all__ = [
+    'RuleCUDPublisher',
     'TriggerCUDPublisher',
+    'TriggerTypeCUDPublisher',
     'TriggerInstancePublisher',
 
     'TriggerDispatcher',
 
+    'get_trigger_routing_key',
+
+    'get_rule_cud_queue',
     'get_sensor_cud_queue',
     'get_trigger_cud_queue',
+    'get_trigger_type_cud_queue',
     'get_trigger_instances_queue'
 ]
 
@@ -37,12 +45,32 @@ LOG = logging.getLogger(__name__)
 # Exchange for Trigger CUD events
 TRIGGER_CUD_XCHG = Exchange('st2.trigger', type='topic')
 
+# Exchange for TriggerType CUD events
+TRIGGER_TYPE_CUD_XCHG = Exchange('st2.triggertype', type='topic')
+
 # Exchange for TriggerInstance events
 TRIGGER_INSTANCE_XCHG = Exchange('st2.trigger_instances_dispatch', type='topic')
 
+# Exchanges which are only used when the rules engine is partitioned. Partitioned exchange is
+# bound to the trigger instances exchange and the nodes bind their queues to it using the
+# references of the owned triggers. Instances which don't match any of those bindings (no
+# trigger reference or trigger not bound to any node yet) are routed to the unrouted exchange.
+TRIGGER_INSTANCE_UNROUTED_XCHG = Exchange('st2.trigger_instances_dispatch.unrouted',
+                                          type='fanout')
+TRIGGER_INSTANCE_PARTITIONED_XCHG = Exchange('st2.trigger_instances_dispatch.partitioned',
+                                             type='topic',
+                                             arguments={'alternate-exchange':
+                                                        TRIGGER_INSTANCE_UNROUTED_XCHG.name})
+
 # Exchane for Sensor CUD events
 SENSOR_CUD_XCHG = Exchange('st2.sensor', type='topic')
 
+# Exchange for Rule CUD events
+RULE_CUD_XCHG = Exchange('st2.rule', type='topic')
+
+# Routing key used for trigger instances for which trigger reference can't be determined
+TRIGGER_INSTANCE_ROUTING_KEY = 'trigger_instance'
+
 
 class SensorCUDPublisher(publishers.CUDPublisher):
     """
@@ -62,12 +90,29 @@ class TriggerCUDPublisher(publishers.CUDPublisher):
         super(TriggerCUDPublisher, self).__init__(urls, TRIGGER_CUD_XCHG)
 
 
+class TriggerTypeCUDPublisher(publishers.CUDPublisher):
+    """
+    Publisher responsible for publishing TriggerType model CUD events.
+    """
+
+    def __init__(self, urls):
+        super(TriggerTypeCUDPublisher, self).__init__(urls, TRIGGER_TYPE_CUD_XCHG)
+
+
+class RuleCUDPublisher(publishers.CUDPublisher):
+    """
+    Publisher responsible for publishing Rule model CUD events.
+    """
+
+    def __init__(self, urls):
+        super(RuleCUDPublisher, self).__init__(urls, RULE_CUD_XCHG)
+
+
 class TriggerInstancePublisher(object):
     def __init__(self, urls):
         self._publisher = publishers.PoolPublisher(urls=urls)
 
     def publish_trigger(self, payload=None, routing_key=None):
-        # TODO: We should use trigger reference as a routing key
         self._publisher.publish(payload, TRIGGER_INSTANCE_XCHG, routing_key)
 
 
@@ -101,19 +146,58 @@ class TriggerDispatcher(object):
             'payload': payload,
             TRACE_CONTEXT: trace_context
         }
-        routing_key = 'trigger_instance'
+        routing_key = get_trigger_routing_key(trigger)
 
         self._logger.debug('Dispatching trigger (trigger=%s,payload=%s)', trigger, payload)
         self._publisher.publish_trigger(payload=payload, routing_key=routing_key)
 
 
+def get_trigger_routing_key(trigger):
+    """
+    Return a routing key which is used when publishing an instance of the provided trigger.
+
+    Trigger reference is used if it can be determined without a database lookup, otherwise the
+    generic ``TRIGGER_INSTANCE_ROUTING_KEY`` is used.
+
+    :param trigger: Trigger reference, trigger dict or a TriggerDB object.
+    :type trigger: ``str`` or ``dict`` or ``object``
+
+    :rtype: ``str``
+    """
+    if isinstance(trigger, six.string_types):
+        return trigger
+
+    if isinstance(trigger, dict):
+        name = trigger.get('name', None)
+        pack = trigger.get('pack', None)
+    else:
+        name = getattr(trigger, 'name', None)
+        pack = getattr(trigger, 'pack', None)
+
+    if name and pack:
+        return ResourceReference.to_string_reference(pack=pack, name=name)
+
+    return TRIGGER_INSTANCE_ROUTING_KEY
+
+
 def get_trigger_cud_queue(name, routing_key, exclusive=False):
     return Queue(name, TRIGGER_CUD_XCHG, routing_key=routing_key, exclusive=exclusive)
 
 
-def get_trigger_instances_queue(name, routing_key):
+def get_trigger_type_cud_queue(name, routing_key, exclusive=False):
+    return Queue(name, TRIGGER_TYPE_CUD_XCHG, routing_key=routing_key, exclusive=exclusive)
+
+
+def get_trigger_instances_queue(name, routing_key, bindings=None):
+    if bindings is not None:
+        return Queue(name, bindings=bindings)
+
     return Queue(name, TRIGGER_INSTANCE_XCHG, routing_key=routing_key)
 
 
 def get_sensor_cud_queue(name, routing_key):
     return Queue(name, SENSOR_CUD_XCHG, routing_key=routing_key)
+
+
+def get_rule_cud_queue(name, routing_key, exclusive=False):
+    return Queue(name, RULE_CUD_XCHG, routing_key=routing_key, exclusive=exclusive)
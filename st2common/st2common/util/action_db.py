@@ -24,6 +24,7 @@ from st2common.exceptions.db import StackStormDBObjectNotFoundError
 from st2common.persistence.action import Action
 from st2common.persistence.liveaction import LiveAction
 from st2common.persistence.runner import RunnerType
+from st2common.services import execution_results
 
 LOG = logging.getLogger(__name__)
 
@@ -76,24 +77,22 @@ def get_runnertype_by_name(runnertype_name):
     """
         Get an runnertype by name.
         On error, raise ST2ObjectNotFoundError.
+
+        Note: Runner type is served from the resource cache.
     """
     try:
-        runnertypes = RunnerType.query(name=runnertype_name)
+        runnertype = RunnerType.get_by_name_cached(runnertype_name)
     except (ValueError, ValidationError) as e:
         LOG.error('Database lookup for name="%s" resulted in exception: %s',
                   runnertype_name, e)
         raise StackStormDBObjectNotFoundError('Unable to find runnertype with name="%s"'
                                               % runnertype_name)
 
-    if not runnertypes:
+    if not runnertype:
         raise StackStormDBObjectNotFoundError('Unable to find RunnerType with name="%s"'
                                               % runnertype_name)
 
-    if len(runnertypes) > 1:
-        LOG.warning('More than one RunnerType returned from DB lookup by name. '
-                    'Result list is: %s', runnertypes)
-
-    return runnertypes[0]
+    return runnertype
 
 
 def get_action_by_id(action_id):
@@ -125,7 +124,7 @@ def get_action_by_ref(ref):
     :rtype action: ``object``
     """
     try:
-        return Action.get_by_ref(ref)
+        return Action.get_by_ref_cached(ref)
     except ValueError as e:
         LOG.debug('Database lookup for ref="%s" resulted ' +
                   'in exception : %s.', ref, e, exc_info=True)
@@ -179,21 +178,37 @@ def update_liveaction_status(status=None, result=None, context=None, end_timesta
               extra=extra)
 
     old_status = liveaction_db.status
-    liveaction_db.status = status
+
+    # Only the changed attributes are written, the rest of the document (e.g. a potentially large
+    # result) is left untouched
+    update = {'set__status': status}
 
     if result:
-        liveaction_db.result = result
+        # Large results are stored outside of the document (see execution_results)
+        update['set__result'] = execution_results.offload_result(result)
 
     if context:
-        liveaction_db.context.update(context)
+        updated_context = dict(liveaction_db.context or {})
+        updated_context.update(context)
+        update['set__context'] = updated_context
 
     if end_timestamp:
-        liveaction_db.end_timestamp = end_timestamp
+        update['set__end_timestamp'] = end_timestamp
 
     if runner_info:
-        liveaction_db.runner_info = runner_info
+        update['set__runner_info'] = runner_info
+
+    updated_liveaction_db = LiveAction.find_and_update(query={'id': liveaction_db.id}, **update)
+
+    if not updated_liveaction_db:
+        raise StackStormDBObjectNotFoundError('Unable to find LiveAction with id="%s"' %
+                                              (liveaction_db.id))
+
+    # Previous offloaded result has been replaced by the new one
+    if result and liveaction_db.result != updated_liveaction_db.result:
+        execution_results.delete_result(liveaction_db.result)
 
-    liveaction_db = LiveAction.add_or_update(liveaction_db)
+    liveaction_db = updated_liveaction_db
 
     LOG.debug('Updated status for LiveAction object.', extra=extra)
 
@@ -13,39 +13,84 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import time
+
 import eventlet
-import Queue
+from eventlet.queue import LightQueue
+
+__all__ = [
+    'BufferedDispatcher'
+]
 
 
 class BufferedDispatcher(object):
+    """
+    Runs the dispatched work items in a green pool of a fixed size. Items which can't run straight
+    away are buffered and started in order as soon as a pool slot frees up.
+
+    Dispatcher thread blocks on the buffer until an item arrives and on the pool semaphore until
+    a slot is free so no polling is involved.
+    """
 
-    def __init__(self, dispatch_pool_size=50, monitor_thread_empty_q_sleep_time=5,
-                 monitor_thread_no_workers_sleep_time=1):
+    def __init__(self, dispatch_pool_size=50):
         self._pool_limit = dispatch_pool_size
         self._dispatcher_pool = eventlet.GreenPool(dispatch_pool_size)
+        self._work_buffer = LightQueue()
+
+        self._dispatched_count = 0
+        self._started_count = 0
+        self._completed_count = 0
+        self._max_queue_depth = 0
+        self._total_wait_time = 0.0
+        self._max_wait_time = 0.0
+
         self._dispatch_monitor_thread = eventlet.greenthread.spawn(self._flush)
-        self._monitor_thread_empty_q_sleep_time = monitor_thread_empty_q_sleep_time
-        self._monitor_thread_no_workers_sleep_time = monitor_thread_no_workers_sleep_time
-        self._work_buffer = Queue.Queue()
 
     def dispatch(self, handler, *args):
-        self._work_buffer.put((handler, args), block=True, timeout=1)
-        self._flush_now()
+        self._work_buffer.put((handler, args, time.time()))
+        self._dispatched_count += 1
+        self._max_queue_depth = max(self._max_queue_depth, self._work_buffer.qsize())
 
     def shutdown(self):
         self._dispatch_monitor_thread.kill()
 
+    def get_stats(self):
+        """
+        Return dispatcher metrics.
+
+        Wait time is the time in seconds an item spent in the buffer before it started running.
+
+        :rtype: ``dict``
+        """
+        running = self._pool_limit - self._dispatcher_pool.free()
+        started = self._started_count
+
+        return {
+            'pool_size': self._pool_limit,
+            'running': running,
+            'pool_utilization': float(running) / self._pool_limit if self._pool_limit else 0.0,
+            'queue_depth': self._work_buffer.qsize(),
+            'max_queue_depth': self._max_queue_depth,
+            'dispatched': self._dispatched_count,
+            'completed': self._completed_count,
+            'avg_wait_time': self._total_wait_time / started if started > 0 else 0.0,
+            'max_wait_time': self._max_wait_time
+        }
+
     def _flush(self):
         while True:
-            while self._work_buffer.empty():
-                eventlet.greenthread.sleep(self._monitor_thread_empty_q_sleep_time)
-            while self._dispatcher_pool.free() <= 0:
-                eventlet.greenthread.sleep(self._monitor_thread_no_workers_sleep_time)
-            self._flush_now()
-
-    def _flush_now(self):
-        if self._dispatcher_pool.free() <= 0:
-            return
-        while not self._work_buffer.empty() and self._dispatcher_pool.free() > 0:
-            (handler, args) = self._work_buffer.get_nowait()
-            self._dispatcher_pool.spawn(handler, *args)
+            # Both calls block until they are signaled - get() until an item is dispatched and
+            # spawn() until a running item completes and releases its pool slot.
+            (handler, args, queued_at) = self._work_buffer.get()
+            self._dispatcher_pool.spawn(self._run, handler, args, queued_at)
+
+    def _run(self, handler, args, queued_at):
+        wait_time = time.time() - queued_at
+        self._started_count += 1
+        self._total_wait_time += wait_time
+        self._max_wait_time = max(self._max_wait_time, wait_time)
+
+        try:
+            handler(*args)
+        finally:
+            self._completed_count += 1
@@ -13,13 +13,22 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
 import json
 import jinja2
+from jinja2 import nodes
 import six
 import re
+import threading
 
 import semver
 
+# Markers which indicate that a string value is a Jinja template
+TEMPLATE_MARKERS = ['{{', '{%', '{#']
+
+# Maximum number of compiled templates which are cached per environment
+TEMPLATE_CACHE_SIZE = 1000
+
 
 class CustomFilters(object):
     '''
@@ -127,6 +136,191 @@ def get_jinja_environment(allow_undefined=False):
     return env
 
 
+class TemplateCache(object):
+    """
+    LRU cache of templates compiled using a particular Jinja environment, keyed by the template
+    source string.
+    """
+
+    def __init__(self, env, max_size=TEMPLATE_CACHE_SIZE):
+        self._env = env
+        self._max_size = max_size
+        self._templates = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_template(self, source):
+        """
+        Return compiled template for the provided source string.
+
+        :param source: Template source.
+        :type source: ``str``
+
+        :rtype: :class:`jinja2.Template`
+        """
+        with self._lock:
+            template = self._templates.pop(source, None)
+
+            if template is not None:
+                # Re-insert so the template becomes the most recently used one
+                self._templates[source] = template
+                return template
+
+        # Compilation happens outside of the lock. In the worst case the same template is
+        # compiled more than once.
+        template = self._env.from_string(source)
+
+        with self._lock:
+            self._templates[source] = template
+
+            while len(self._templates) > self._max_size:
+                self._templates.popitem(last=False)
+
+        return template
+
+    @property
+    def env(self):
+        return self._env
+
+    def clear(self):
+        with self._lock:
+            self._templates.clear()
+
+    def __len__(self):
+        return len(self._templates)
+
+
+_TEMPLATE_CACHES = {}
+_TEMPLATE_CACHES_LOCK = threading.Lock()
+
+
+def get_template_cache(allow_undefined=False):
+    """
+    Return a process wide template cache which uses a shared environment for the provided
+    undefined mode.
+
+    Note: Shared environment should not be modified by the callers.
+
+    :param allow_undefined: If should allow undefined variables in templates
+    :type allow_undefined: ``bool``
+
+    :rtype: :class:`TemplateCache`
+    """
+    template_cache = _TEMPLATE_CACHES.get(allow_undefined, None)
+
+    if template_cache is None:
+        with _TEMPLATE_CACHES_LOCK:
+            template_cache = _TEMPLATE_CACHES.get(allow_undefined, None)
+
+            if template_cache is None:
+                env = get_jinja_environment(allow_undefined=allow_undefined)
+                template_cache = TemplateCache(env=env)
+                _TEMPLATE_CACHES[allow_undefined] = template_cache
+
+    return template_cache
+
+
+def is_template(value):
+    """
+    Return True if the provided value contains Jinja markers and as such needs to be rendered.
+    Lists and dicts are checked recursively.
+
+    :rtype: ``bool``
+    """
+    if isinstance(value, six.string_types):
+        return any(marker in value for marker in TEMPLATE_MARKERS)
+
+    if isinstance(value, dict):
+        for k, v in six.iteritems(value):
+            if is_template(k) or is_template(v):
+                return True
+        return False
+
+    if isinstance(value, (list, tuple)):
+        return any(is_template(item) for item in value)
+
+    return False
+
+
+_ATTRIBUTE_PATHS_CACHE = {}
+
+
+def get_attribute_paths(value, name):
+    """
+    Statically find all the attribute and item lookups on the provided variable in a template
+    by walking the template AST. Lists and dicts are checked recursively.
+
+    For example, for template ``{{system.a.b}} {{system['c']}}`` and name ``system``, paths
+    ``a``, ``a.b`` and ``c`` are returned. Lookups using dynamic keys are ignored.
+
+    :param value: Template string or a dict / list containing template strings.
+    :type value: ``str`` or ``dict`` or ``list``
+
+    :param name: Name of the variable.
+    :type name: ``str``
+
+    :rtype: ``set`` of ``str``
+    """
+    if isinstance(value, dict):
+        paths = set()
+        for k, v in six.iteritems(value):
+            paths.update(get_attribute_paths(k, name))
+            paths.update(get_attribute_paths(v, name))
+        return paths
+
+    if isinstance(value, (list, tuple)):
+        paths = set()
+        for item in value:
+            paths.update(get_attribute_paths(item, name))
+        return paths
+
+    if not is_template(value):
+        return set()
+
+    cache_key = (name, value)
+    paths = _ATTRIBUTE_PATHS_CACHE.get(cache_key, None)
+
+    if paths is None:
+        paths = _find_attribute_paths(value, name)
+
+        if len(_ATTRIBUTE_PATHS_CACHE) >= TEMPLATE_CACHE_SIZE:
+            _ATTRIBUTE_PATHS_CACHE.clear()
+        _ATTRIBUTE_PATHS_CACHE[cache_key] = paths
+
+    return set(paths)
+
+
+def _find_attribute_paths(value, name):
+    env = get_template_cache().env
+
+    try:
+        template_ast = env.parse(value)
+    except jinja2.TemplateSyntaxError:
+        # Error will be surfaced when the template is rendered
+        return frozenset()
+
+    paths = set()
+
+    # Note: Nested lookups are visited as well so all the prefixes of a path are included
+    for node in template_ast.find_all((nodes.Getattr, nodes.Getitem)):
+        path = []
+
+        while isinstance(node, (nodes.Getattr, nodes.Getitem)):
+            if isinstance(node, nodes.Getattr):
+                path.append(node.attr)
+            elif isinstance(node.arg, nodes.Const) and \
+                    isinstance(node.arg.value, six.string_types):
+                path.append(node.arg.value)
+            else:
+                break
+
+            node = node.node
+
+        if isinstance(node, nodes.Name) and node.name == name:
+            paths.add('.'.join(reversed(path)))
+
+    return frozenset(paths)
+
+
 def render_values(mapping=None, context=None, allow_undefined=False):
     """
     Render an incoming mapping using context provided in context using Jinja2. Returns a dict
@@ -151,9 +345,15 @@ def render_values(mapping=None, context=None, allow_undefined=False):
     super_context['__context'] = context
     super_context.update(context)
 
-    env = get_jinja_environment(allow_undefined=allow_undefined)
+    template_cache = get_template_cache(allow_undefined=allow_undefined)
     rendered_mapping = {}
     for k, v in six.iteritems(mapping):
+        # Fast path for values which are not templates. Jinja strips a single trailing newline
+        # so those values still need to be rendered to retain the previous behavior.
+        if not is_template(v) and not (isinstance(v, six.string_types) and v.endswith('\n')):
+            rendered_mapping[k] = v
+            continue
+
         # jinja2 works with string so transform list and dict to strings.
         reverse_json_dumps = False
         if isinstance(v, dict) or isinstance(v, list):
@@ -163,7 +363,7 @@ def render_values(mapping=None, context=None, allow_undefined=False):
             v = str(v)
 
         try:
-            rendered_v = env.from_string(v).render(super_context)
+            rendered_v = template_cache.get_template(v).render(super_context)
         except Exception as e:
             # Attach key and value which failed the rendering
             e.key = k
@@ -13,15 +13,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import six
-import networkx as nx
+import hashlib
+import json
 
+import six
 from jinja2 import meta
+
 from st2common import log as logging
 from st2common.constants.action import ACTION_CONTEXT_KV_PREFIX
 from st2common.constants.system import SYSTEM_KV_PREFIX
 from st2common.exceptions.param import ParamException
 from st2common.services.keyvalues import KeyValueLookup
+from st2common.services.keyvalues import prefetch_key_values
 from st2common.util.casts import get_cast
 from st2common.util.compat import to_unicode
 from st2common.util import jinja as jinja_utils
@@ -29,6 +32,21 @@ from st2common.util import jinja as jinja_utils
 
 LOG = logging.getLogger(__name__)
 ENV = jinja_utils.get_jinja_environment()
+TEMPLATE_CACHE = jinja_utils.get_template_cache()
+
+# Maximum number of cached render plans and template dependencies
+CACHE_SIZE = 1000
+
+# Render plan step kinds
+STEP_TEMPLATE = 'template'
+STEP_DEFAULT = 'default'
+STEP_VALUE = 'value'
+
+# Context variables which are available to all the parameters
+SEEDS = [SYSTEM_KV_PREFIX, ACTION_CONTEXT_KV_PREFIX]
+
+_RENDER_PLANS = {}
+_TEMPLATE_DEPENDENCIES = {}
 
 __all__ = [
     'render_live_params',
@@ -69,83 +87,212 @@ def _cast(v, parameter_schema):
     return cast(v)
 
 
-def _create_graph(action_context):
+class RenderPlan(object):
     '''
-    Creates a generic directed graph for depencency tree and fills it with basic context variables
+    Precomputed order in which parameters are rendered.
+
+    Each step is a (name, kind, source) tuple. Source is the template string for template steps
+    and the index of the schema the default value comes from for default steps.
     '''
-    G = nx.DiGraph()
-    G.add_node(SYSTEM_KV_PREFIX, value=KeyValueLookup())
-    G.add_node(ACTION_CONTEXT_KV_PREFIX, value=action_context)
-    return G
+
+    def __init__(self, steps):
+        self.steps = steps
+
+    def get_templates(self):
+        return [source for _, kind, source in self.steps if kind == STEP_TEMPLATE]
 
 
-def _process(G, name, value):
+def _get_template_source(value):
     '''
-    Determines whether parameter is a template or a value. Adds graph nodes and edges accordingly.
+    Return the string Jinja operates on for the provided value
     '''
     # Jinja defaults to ascii parser in python 2.x unless you set utf-8 support on per module level
     # Instead we're just assuming every string to be a unicode string
     if isinstance(value, str):
-        value = to_unicode(value)
-    template_ast = ENV.parse(value)
-    # Dependencies of the node represent jinja variables used in the template
-    # We're connecting nodes with an edge for every depencency to traverse them in the right order
-    # and also make sure that we don't have missing or cyclic dependencies upfront.
-    dependencies = meta.find_undeclared_variables(template_ast)
-    if dependencies:
-        G.add_node(name, template=value)
-        for dependency in dependencies:
-            G.add_edge(dependency, name)
-    else:
-        G.add_node(name, value=value)
+        return to_unicode(value)
+    return six.text_type(value)
 
 
-def _process_defaults(G, schemas):
+def _get_dependencies(source):
     '''
-    Process dependencies for parameters default values in the order schemas are defined.
+    Return jinja variables used in the template. Results are cached per template source.
     '''
-    for schema in schemas:
-        for name, value in six.iteritems(schema):
-            absent = name not in G.node
-            is_none = G.node.get(name, {}).get('value') is None
-            immutable = value.get('immutable', False)
-            if absent or is_none or immutable:
-                _process(G, name, value.get('default'))
+    if not jinja_utils.is_template(source):
+        return frozenset()
+
+    dependencies = _TEMPLATE_DEPENDENCIES.get(source, None)
+
+    if dependencies is None:
+        template_ast = ENV.parse(source)
+        dependencies = frozenset(meta.find_undeclared_variables(template_ast))
+
+        if len(_TEMPLATE_DEPENDENCIES) >= CACHE_SIZE:
+            _TEMPLATE_DEPENDENCIES.clear()
+        _TEMPLATE_DEPENDENCIES[source] = dependencies
+
+    return dependencies
+
+
+def _get_schemas_key(schemas):
+    schemas_json = json.dumps(schemas, sort_keys=True, default=repr)
+    return hashlib.md5(schemas_json.encode('utf-8')).hexdigest()
 
 
-def _validate(G):
+def _get_render_plan(schemas, values, params, analyze_params):
     '''
-    Validates dependency graph to ensure it has no missing or cyclic dependencies
+    Return a cached render plan for the provided schemas and parameters or create a new one.
+
+    Plans only depend on the schemas, on the templates used in the parameter values and on
+    which values are None so a plan is shared by all the executions of an action which use
+    the same templates.
+    '''
+    param_keys = []
+    for name in sorted(params.keys()):
+        value = params[name]
+        source = _get_template_source(value) if analyze_params else None
+
+        if source is not None and _get_dependencies(source):
+            param_keys.append((name, source))
+        else:
+            param_keys.append((name, value is None))
+
+    seed_keys = tuple([(name, values[name] is None) for name in SEEDS])
+    plan_key = (_get_schemas_key(schemas), analyze_params, tuple(param_keys), seed_keys)
+
+    plan = _RENDER_PLANS.get(plan_key, None)
+
+    if not plan:
+        plan = _create_render_plan(schemas=schemas, values=values, params=params,
+                                   analyze_params=analyze_params)
+
+        if len(_RENDER_PLANS) >= CACHE_SIZE:
+            _RENDER_PLANS.clear()
+        _RENDER_PLANS[plan_key] = plan
+
+    return plan
+
+
+def _create_render_plan(schemas, values, params, analyze_params):
+    '''
+    Determine the dependencies between parameters and the order in which they need to be
+    rendered. Ensures that there's no cyclic or missing dependencies.
     '''
-    for name in G.nodes():
-        if 'value' not in G.node[name] and 'template' not in G.node[name]:
+    # Maps name -> attributes. A node has a "template" and / or a "value" attribute where value is
+    # a (kind, source) tuple.
+    nodes = {}
+    # Maps name -> set of names the node depends on
+    dependencies = {}
+
+    def add_node(name, **attributes):
+        nodes.setdefault(name, {}).update(attributes)
+
+    def process(name, value, value_step):
+        '''
+        Determines whether parameter is a template or a value and adds it to the nodes.
+        '''
+        source = _get_template_source(value)
+        template_dependencies = _get_dependencies(source)
+
+        if template_dependencies:
+            # Note: Non-string values are kept as is so rendering them fails the same way it
+            # always did
+            template = source if isinstance(value, six.string_types) else value
+            add_node(name, template=template)
+            for dependency in template_dependencies:
+                nodes.setdefault(dependency, {})
+                dependencies.setdefault(name, set()).add(dependency)
+        else:
+            add_node(name, value=value_step, is_none=value is None)
+
+    for name in SEEDS:
+        add_node(name, value=(STEP_VALUE, None), is_none=values[name] is None)
+
+    for name, value in six.iteritems(params):
+        if analyze_params:
+            process(name, value, (STEP_VALUE, None))
+        else:
+            # by that point, all params should already be resolved so any template should be
+            # treated value
+            add_node(name, value=(STEP_VALUE, None), is_none=value is None)
+
+    # Process dependencies for parameters default values in the order schemas are defined.
+    for index, schema in enumerate(schemas):
+        for name, value in six.iteritems(schema):
+            absent = name not in nodes
+            is_none = nodes.get(name, {}).get('is_none', True)
+            immutable = value.get('immutable', False)
+            if absent or is_none or immutable:
+                process(name, value.get('default'), (STEP_DEFAULT, index))
+
+    for name, node in six.iteritems(nodes):
+        if 'value' not in node and 'template' not in node:
             msg = 'Dependecy unsatisfied in %s' % name
             raise ParamException(msg)
 
-    if not nx.is_directed_acyclic_graph(G):
+    # Topological sort. Nodes are ordered so each node comes after all of its dependencies.
+    dependents = {}
+    unresolved_counts = {}
+    for name in nodes:
+        unresolved_counts[name] = len(dependencies.get(name, []))
+        for dependency in dependencies.get(name, []):
+            dependents.setdefault(dependency, []).append(name)
+
+    resolved = [name for name, count in six.iteritems(unresolved_counts) if count == 0]
+    order = []
+    while resolved:
+        name = resolved.pop()
+        order.append(name)
+        for dependent in dependents.get(name, []):
+            unresolved_counts[dependent] -= 1
+            if unresolved_counts[dependent] == 0:
+                resolved.append(dependent)
+
+    if len(order) != len(nodes):
         msg = 'Cyclic dependecy found'
         raise ParamException(msg)
 
+    steps = []
+    for name in order:
+        node = nodes[name]
+        if 'template' in node:
+            steps.append((name, STEP_TEMPLATE, node['template']))
+        else:
+            kind, source = node['value']
+            steps.append((name, kind, source))
+
+    return RenderPlan(steps=steps)
 
-def _render(node, render_context):
+
+def _get_seed_values(action_context):
     '''
-    Render the node depending on its type
+    Basic context variables available to all the parameters
     '''
-    if 'template' in node:
-        return ENV.from_string(node['template']).render(render_context)
-    if 'value' in node:
-        return node['value']
+    return {
+        SYSTEM_KV_PREFIX: KeyValueLookup(),
+        ACTION_CONTEXT_KV_PREFIX: action_context
+    }
 
 
-def _resolve_dependencies(G):
+def _render_plan(plan, schemas, values):
     '''
-    Traverse the dependency graph starting from resolved nodes
+    Render parameters in the order determined by the render plan
     '''
+    kv_lookup = values.get(SYSTEM_KV_PREFIX, None)
+    if isinstance(kv_lookup, KeyValueLookup):
+        # Retrieve all the datastore items referenced by the templates using a single query
+        prefetch_key_values(kv_lookup=kv_lookup, templates=plan.get_templates())
+
     context = {}
-    for name in nx.topological_sort(G):
-        node = G.node[name]
+    for name, kind, source in plan.steps:
         try:
-            context[name] = _render(node, context)
+            if kind == STEP_TEMPLATE and isinstance(source, six.string_types):
+                context[name] = TEMPLATE_CACHE.get_template(source).render(context)
+            elif kind == STEP_TEMPLATE:
+                context[name] = ENV.from_string(source).render(context)
+            elif kind == STEP_DEFAULT:
+                context[name] = schemas[source][name].get('default')
+            else:
+                context[name] = values[name]
         except Exception as e:
             LOG.debug('Failed to render %s: %s', name, e, exc_info=True)
             msg = 'Failed to render parameter "%s": %s' % (name, str(e))
@@ -172,14 +319,14 @@ def render_live_params(runner_parameters, action_parameters, params, action_cont
     Renders list of parameters. Ensures that there's no cyclic or missing dependencies. Returns a
     dict of plain rendered parameters.
     '''
-    G = _create_graph(action_context)
+    schemas = [action_parameters, runner_parameters]
+    values = _get_seed_values(action_context)
+    values.update(params)
 
-    [_process(G, name, value) for name, value in six.iteritems(params)]
-    _process_defaults(G, [action_parameters, runner_parameters])
-    _validate(G)
+    plan = _get_render_plan(schemas=schemas, values=values, params=params, analyze_params=True)
 
-    context = _resolve_dependencies(G)
-    live_params = _cast_params_from(params, context, [action_parameters, runner_parameters])
+    context = _render_plan(plan=plan, schemas=schemas, values=values)
+    live_params = _cast_params_from(params, context, schemas)
 
     return live_params
 
@@ -190,15 +337,14 @@ def render_final_params(runner_parameters, action_parameters, params, action_con
     plain values instead of trying to render them again. Returns dicts for action and runner
     parameters.
     '''
-    G = _create_graph(action_context)
+    schemas = [action_parameters, runner_parameters]
+    values = _get_seed_values(action_context)
+    values.update(params)
 
-    # by that point, all params should already be resolved so any template should be treated value
-    [G.add_node(name, value=value) for name, value in six.iteritems(params)]
-    _process_defaults(G, [action_parameters, runner_parameters])
-    _validate(G)
+    plan = _get_render_plan(schemas=schemas, values=values, params=params, analyze_params=False)
 
-    context = _resolve_dependencies(G)
-    context = _cast_params_from(context, context, [action_parameters, runner_parameters])
+    context = _render_plan(plan=plan, schemas=schemas, values=values)
+    context = _cast_params_from(context, context, schemas)
 
     return _split_params(runner_parameters, action_parameters, context)
 
@@ -15,18 +15,26 @@
 
 import os
 import copy
+import json
+import hashlib
 
 import six
 import jsonschema
 from jsonschema import _validators
 from jsonschema.validators import create
+from jsonschema.validators import validator_for
 
 from st2common.exceptions.action import InvalidActionParameterException
 from st2common.util import jsonify
 from st2common.util.misc import deep_update
 
 __all__ = [
+    'CompiledSchemaValidator',
+
     'get_validator',
+    'get_schema_hash',
+    'get_schema_validator',
+    'get_action_parameters_validator',
     'get_draft_schema',
     'get_action_parameters_schema',
     'get_schema_for_action_parameters',
@@ -74,6 +82,11 @@ RUNNER_PARAM_OVERRIDABLE_ATTRS = [
     'required'
 ]
 
+# Maximum number of compiled validators which are kept in the cache
+VALIDATOR_CACHE_SIZE = 1000
+
+_VALIDATORS_CACHE = {}
+
 
 def get_draft_schema(version='custom', additional_properties=False):
     schema = copy.deepcopy(SCHEMAS[version])
@@ -278,6 +291,10 @@ def validate(instance, schema, cls=None, use_default=True, allow_default_none=Fa
     :param use_default: True to support the use of the optional "default" property.
     :type use_default: ``bool``
     """
+    if not args and not kwargs:
+        validator = get_schema_validator(schema=schema, cls=cls, use_default=use_default,
+                                         allow_default_none=allow_default_none)
+        return validator.validate(instance)
 
     instance = copy.deepcopy(instance)
     schema_type = schema.get('type', None)
@@ -295,6 +312,86 @@ def validate(instance, schema, cls=None, use_default=True, allow_default_none=Fa
     return instance
 
 
+class CompiledSchemaValidator(object):
+    """
+    Validator for a particular schema which has been checked against the meta schema and compiled
+    once and can be used to validate many instances.
+
+    Schema manipulation which is needed for "allow_default_none" is performed once when the
+    validator is created.
+    """
+
+    def __init__(self, schema, cls=None, use_default=True, allow_default_none=False):
+        schema = copy.deepcopy(schema)
+
+        if use_default and allow_default_none:
+            schema = modify_schema_allow_default_none(schema=schema)
+
+        cls = cls or validator_for(schema)
+        cls.check_schema(schema)
+
+        self.schema = schema
+        self.use_default = use_default
+        self._validator = cls(schema)
+        self._assign_defaults = use_default and schema.get('type', None) == 'object'
+
+    def validate(self, instance):
+        """
+        Validate the provided instance and return cleaned instance with default values assigned.
+
+        Note: Provided instance is not mutated.
+        """
+        instance = copy.deepcopy(instance)
+
+        if self._assign_defaults and isinstance(instance, dict):
+            instance = assign_default_values(instance=instance, schema=self.schema)
+
+        self._validator.validate(instance)
+
+        return instance
+
+
+def get_schema_hash(schema):
+    """
+    Return hash which uniquely identifies the content of the provided schema.
+
+    :rtype: ``str``
+    """
+    schema_json = json.dumps(schema, sort_keys=True, default=repr)
+    return hashlib.md5(schema_json.encode('utf-8')).hexdigest()
+
+
+def get_schema_validator(schema, cls=None, use_default=True, allow_default_none=False, key=None,
+                         schema_hash=None):
+    """
+    Retrieve compiled validator for the provided schema from the cache, compiling and caching it
+    on the first use.
+
+    :param key: Optional key (e.g. resource reference) which is used together with the schema
+                hash to identify the validator.
+    :type key: ``str``
+
+    :param schema_hash: Optional pre-computed schema hash.
+    :type schema_hash: ``str``
+
+    :rtype: :class:`CompiledSchemaValidator`
+    """
+    schema_hash = schema_hash or get_schema_hash(schema)
+    cache_key = (key, schema_hash, cls, use_default, allow_default_none)
+
+    validator = _VALIDATORS_CACHE.get(cache_key, None)
+
+    if not validator:
+        validator = CompiledSchemaValidator(schema=schema, cls=cls, use_default=use_default,
+                                            allow_default_none=allow_default_none)
+
+        if len(_VALIDATORS_CACHE) >= VALIDATOR_CACHE_SIZE:
+            _VALIDATORS_CACHE.clear()
+        _VALIDATORS_CACHE[cache_key] = validator
+
+    return validator
+
+
 VALIDATORS = {
     'draft4': jsonschema.Draft4Validator,
     'custom': CustomValidator
@@ -321,14 +418,46 @@ def validate_runner_parameter_attribute_override(action_ref, param_name, attr_na
     return True
 
 
-def get_schema_for_action_parameters(action_db):
+def get_action_parameters_validator(action_db, runnertype_db=None):
+    """
+    Retrieve compiled validator for the parameters of the provided action.
+
+    Validators are cached by the action reference and the hash of the action and runner parameters
+    metadata so the merged schema is only constructed once for each version of the action.
+
+    :rtype: :class:`CompiledSchemaValidator`
+    """
+    if not runnertype_db:
+        from st2common.util.action_db import get_runnertype_by_name
+        runnertype_db = get_runnertype_by_name(action_db.runner_type['name'])
+
+    schema_hash = get_schema_hash([action_db.name, action_db.description,
+                                   runnertype_db.runner_parameters, action_db.parameters])
+    cache_key = (action_db.ref, schema_hash, CustomValidator, True, True)
+
+    validator = _VALIDATORS_CACHE.get(cache_key, None)
+
+    if not validator:
+        schema = get_schema_for_action_parameters(action_db=action_db,
+                                                  runnertype_db=runnertype_db)
+        validator = get_schema_validator(schema=schema, cls=CustomValidator, use_default=True,
+                                         allow_default_none=True, key=action_db.ref,
+                                         schema_hash=schema_hash)
+
+    return validator
+
+
+def get_schema_for_action_parameters(action_db, runnertype_db=None):
     """
     Dynamically construct JSON schema for the provided action from the parameters metadata.
 
     Note: This schema is used to validate parameters which are passed to the action.
     """
-    from st2common.util.action_db import get_runnertype_by_name
-    runner_type = get_runnertype_by_name(action_db.runner_type['name'])
+    if runnertype_db:
+        runner_type = runnertype_db
+    else:
+        from st2common.util.action_db import get_runnertype_by_name
+        runner_type = get_runnertype_by_name(action_db.runner_type['name'])
 
     # Note: We need to perform a deep merge because user can only specify a single parameter
     # attribute when overriding it in an action metadata.
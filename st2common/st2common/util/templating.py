@@ -17,7 +17,7 @@ import six
 from jinja2 import Environment, StrictUndefined
 
 from st2common.constants.system import SYSTEM_KV_PREFIX
-from st2common.services.keyvalues import KeyValueLookup
+from st2common.services.keyvalues import get_key_value_lookup
 
 __all__ = [
     'render_template',
@@ -56,7 +56,7 @@ def render_template_with_system_context(value):
     :type context: ``dict``
     """
     context = {
-        SYSTEM_KV_PREFIX: KeyValueLookup(),
+        SYSTEM_KV_PREFIX: get_key_value_lookup(templates=[value]),
     }
 
     rendered = render_template(value=value, context=context)
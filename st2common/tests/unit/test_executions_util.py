@@ -15,14 +15,21 @@
 
 import mock
 import six
+from oslo_config import cfg
 
 from st2common.constants import action as action_constants
 from st2common.models.api.action import RunnerTypeAPI, ActionAPI, LiveActionAPI
+from st2common.models.api.execution import ActionExecutionAPI
 from st2common.models.api.trigger import TriggerTypeAPI, TriggerAPI, TriggerInstanceAPI
 from st2common.models.api.rule import RuleAPI
 from st2common.persistence.liveaction import LiveAction
+from st2common.persistence.rule import Rule
 from st2common.persistence.runner import RunnerType
+from st2common.persistence.trigger import TriggerInstance
 from st2common.persistence.execution import ActionExecution
+from st2common.persistence.execution import ActionExecutionSnapshot
+from st2common.services.execution_snapshots import SNAPSHOT_HASH_ATTRIBUTE
+from st2common.services import execution_results
 from st2common.transport.publishers import PoolPublisher
 import st2common.services.executions as executions_util
 import st2common.util.action_db as action_utils
@@ -80,6 +87,9 @@ class ExecutionsUtilTestCase(CleanDbTestCase):
         liveaction = LiveAction.get_by_id(str(liveaction.id))
         self.assertEquals(execution.liveaction['id'], str(liveaction.id))
 
+    @mock.patch.object(TriggerInstance, 'get_by_id',
+                       mock.MagicMock(side_effect=TriggerInstance.get_by_id))
+    @mock.patch.object(Rule, 'get_by_id_cached', mock.MagicMock(side_effect=Rule.get_by_id_cached))
     def test_execution_creation_action_triggered_by_rule(self):
         # Wait for the action execution to complete and then confirm outcome.
         trigger_type = self.MODELS['triggertypes']['triggertype2.yaml']
@@ -111,6 +121,83 @@ class ExecutionsUtilTestCase(CleanDbTestCase):
         liveaction = LiveAction.get_by_id(str(liveaction.id))
         self.assertEquals(execution.liveaction['id'], str(liveaction.id))
 
+        # Trigger instance is retrieved once, rule is retrieved through the resource cache
+        self.assertEqual(TriggerInstance.get_by_id.call_count, 1)
+        Rule.get_by_id_cached.assert_called_once_with(str(rule.id))
+
+    def test_execution_creation_with_definition_snapshots(self):
+        cfg.CONF.set_override(name='store_definition_snapshots', override=True,
+                              group='executions')
+        self.addCleanup(cfg.CONF.clear_override, name='store_definition_snapshots',
+                        group='executions')
+
+        liveaction = self.MODELS['liveactions']['liveaction1.yaml']
+        executions_util.create_execution_object(liveaction)
+        execution = self._get_action_execution(liveaction__id=str(liveaction.id),
+                                               raise_exception=True)
+
+        # Only references are stored in the execution
+        action = action_utils.get_action_by_ref('core.local')
+        runner = RunnerType.get_by_name(action.runner_type['name'])
+        self.assertEqual(execution.action['ref'], 'core.local')
+        self.assertTrue(SNAPSHOT_HASH_ATTRIBUTE in execution.action)
+        self.assertEqual(execution.runner['name'], runner.name)
+        self.assertTrue(SNAPSHOT_HASH_ATTRIBUTE in execution.runner)
+        self.assertDictEqual(execution.rule, {})
+        self.assertEqual(ActionExecutionSnapshot.count(), 2)
+
+        # Full definitions are returned by the API
+        execution_api = ActionExecutionAPI.from_model(execution)
+        self.assertDictEqual(execution_api.action, vars(ActionAPI.from_model(action)))
+        self.assertDictEqual(execution_api.runner, vars(RunnerTypeAPI.from_model(runner)))
+
+        # Snapshots are shared between the executions
+        liveaction = self.MODELS['liveactions']['successful_liveaction.yaml']
+        executions_util.create_execution_object(liveaction)
+        execution2 = self._get_action_execution(liveaction__id=str(liveaction.id),
+                                                raise_exception=True)
+        self.assertEqual(ActionExecutionSnapshot.count(), 2)
+        self.assertEqual(execution2.action[SNAPSHOT_HASH_ATTRIBUTE],
+                         execution.action[SNAPSHOT_HASH_ATTRIBUTE])
+
+    @mock.patch.object(PoolPublisher, 'publish', mock.MagicMock())
+    def test_execution_update_with_offloaded_result(self):
+        cfg.CONF.set_override(name='result_offload_threshold', override=100, group='executions')
+        self.addCleanup(cfg.CONF.clear_override, name='result_offload_threshold',
+                        group='executions')
+
+        liveaction_db = self.MODELS['liveactions']['liveaction1.yaml']
+        executions_util.create_execution_object(liveaction_db)
+
+        # Small result is stored inline
+        result = {'stdout': 'a' * 10}
+        liveaction_db = action_utils.update_liveaction_status(
+            status=action_constants.LIVEACTION_STATUS_RUNNING, result=result,
+            liveaction_db=liveaction_db)
+        execution_db = executions_util.update_execution(liveaction_db)
+        self.assertDictEqual(liveaction_db.result, result)
+        self.assertDictEqual(execution_db.result, result)
+
+        # Large result is offloaded and only a preview is stored inline
+        result = {'stdout': 'a' * 1000}
+        liveaction_db = action_utils.update_liveaction_status(
+            status=action_constants.LIVEACTION_STATUS_SUCCEEDED, result=result,
+            liveaction_db=liveaction_db)
+        execution_db = executions_util.update_execution(liveaction_db)
+        self.assertTrue(execution_results.is_offloaded_result(liveaction_db.result))
+        self.assertDictEqual(execution_db.result, liveaction_db.result)
+        self.assertTrue(execution_db.result['preview'].startswith('{"stdout": "aaa'))
+        self.assertDictEqual(execution_results.load_result(execution_db.result), result)
+
+        # Previous offloaded result is deleted when the result is updated
+        previous_result = liveaction_db.result
+        result = {'stdout': 'b' * 1000}
+        liveaction_db = action_utils.update_liveaction_status(
+            status=action_constants.LIVEACTION_STATUS_SUCCEEDED, result=result,
+            liveaction_db=liveaction_db)
+        self.assertDictEqual(execution_results.load_result(liveaction_db.result), result)
+        self.assertIsNone(execution_results.open_result(previous_result))
+
     def test_execution_creation_chains(self):
         childliveaction = self.MODELS['liveactions']['childliveaction.yaml']
         child_exec = executions_util.create_execution_object(childliveaction)
@@ -118,6 +205,8 @@ class ExecutionsUtilTestCase(CleanDbTestCase):
         parent_execution = ActionExecution.get_by_id(parent_execution_id)
         child_execs = parent_execution.children
         self.assertTrue(str(child_exec.id) in child_execs)
+        self.assertListEqual(child_exec.ancestors,
+                             parent_execution.ancestors + [parent_execution_id])
 
     @mock.patch.object(PoolPublisher, 'publish', mock.MagicMock())
     def test_abandon_executions(self):
@@ -196,6 +285,32 @@ class ExecutionsUtilDescendantsTestCase(CleanDbTestCase):
 
         self.assertListEqual(all_descendants_ids, expected_ids)
 
+    def test_get_all_descendants_single_query(self):
+        root_execution = self.MODELS['executions']['root_execution.yaml']
+
+        with mock.patch.object(ActionExecution, 'query',
+                               mock.MagicMock(side_effect=ActionExecution.query)) as query:
+            all_descendants = executions_util.get_descendants(str(root_execution.id))
+
+        # Leaves are not queried by parent
+        self.assertEqual(query.call_count, 1)
+        self.assertTrue('__raw__' in query.call_args[1])
+        self.assertEqual(len(all_descendants), len(self.MODELS['executions']) - 1)
+
+    def test_get_all_descendants_without_ancestors(self):
+        root_execution = self.MODELS['executions']['root_execution.yaml']
+        expected_ids = [str(descendant.id) for descendant in
+                        executions_util.get_descendants(str(root_execution.id))]
+
+        # Executions created before ancestors were stored
+        ActionExecution.impl.model.objects.update(unset__ancestors=True)
+
+        all_descendants = executions_util.get_descendants(str(root_execution.id))
+        all_descendants_ids = [str(descendant.id) for descendant in all_descendants]
+
+        # Same DFS order is returned
+        self.assertListEqual(all_descendants_ids, expected_ids)
+
     def test_get_1_level_descendants_sorted(self):
         root_execution = self.MODELS['executions']['root_execution.yaml']
         all_descendants = executions_util.get_descendants(str(root_execution.id),
@@ -13,6 +13,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import time
+
 import eventlet
 import mock
 
@@ -36,9 +38,7 @@ class TestGreenPoolDispatch(TestCase):
         self.assertItemsEqual(expected, call_args_list)
 
     def test_dispatch_starved(self):
-        dispatcher = BufferedDispatcher(dispatch_pool_size=2,
-                                        monitor_thread_empty_q_sleep_time=0.01,
-                                        monitor_thread_no_workers_sleep_time=0.01)
+        dispatcher = BufferedDispatcher(dispatch_pool_size=2)
         mock_handler = mock.MagicMock()
         expected = []
         for i in range(10):
@@ -49,3 +49,47 @@ class TestGreenPoolDispatch(TestCase):
         dispatcher.shutdown()
         call_args_list = [(args[0][0], args[0][1]) for args in mock_handler.call_args_list]
         self.assertItemsEqual(expected, call_args_list)
+
+    def test_buffered_item_starts_when_slot_frees_up(self):
+        dispatcher = BufferedDispatcher(dispatch_pool_size=1)
+        event = eventlet.event.Event()
+        mock_handler = mock.MagicMock()
+        dispatcher.dispatch(event.wait)
+        dispatcher.dispatch(mock_handler, 1)
+        eventlet.sleep(0)
+        self.assertFalse(mock_handler.called)
+
+        start = time.time()
+        event.send()
+        while not mock_handler.called:
+            eventlet.sleep(0.001)
+        dispatcher.shutdown()
+
+        # Previously buffered items waited for the monitor thread to wake up from a sleep
+        self.assertLess(time.time() - start, 0.5)
+        mock_handler.assert_called_once_with(1)
+
+    def test_get_stats(self):
+        dispatcher = BufferedDispatcher(dispatch_pool_size=2)
+        event = eventlet.event.Event()
+        for _ in range(4):
+            dispatcher.dispatch(event.wait)
+        eventlet.sleep(0)
+
+        stats = dispatcher.get_stats()
+        self.assertEqual(stats['pool_size'], 2)
+        self.assertEqual(stats['running'], 2)
+        self.assertEqual(stats['pool_utilization'], 1.0)
+        self.assertEqual(stats['dispatched'], 4)
+        self.assertEqual(stats['completed'], 0)
+        self.assertEqual(stats['max_queue_depth'], 4)
+
+        event.send()
+        while dispatcher.get_stats()['completed'] < 4:
+            eventlet.sleep(0.01)
+        dispatcher.shutdown()
+
+        stats = dispatcher.get_stats()
+        self.assertEqual(stats['queue_depth'], 0)
+        self.assertEqual(stats['running'], 0)
+        self.assertTrue(stats['max_wait_time'] >= stats['avg_wait_time'] >= 0)
@@ -13,6 +13,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
+
 from unittest2 import TestCase
 from jsonschema.exceptions import ValidationError
 
@@ -369,3 +371,46 @@ class JSONSchemaTestCase(TestCase):
 
         array_type_property = TEST_SCHEMA_1['properties']['arg_optional_type_array']
         self.assertFalse(util_schema.is_attribute_type_object(array_type_property.get('type')))
+
+    def test_get_schema_validator_is_cached(self):
+        validator_1 = util_schema.get_schema_validator(schema=TEST_SCHEMA_3,
+                                                       cls=util_schema.CustomValidator,
+                                                       allow_default_none=True, key='foo')
+        validator_2 = util_schema.get_schema_validator(schema=copy.deepcopy(TEST_SCHEMA_3),
+                                                       cls=util_schema.CustomValidator,
+                                                       allow_default_none=True, key='foo')
+        self.assertIs(validator_1, validator_2)
+
+        # Different key, options or schema content results in a different validator
+        validator_3 = util_schema.get_schema_validator(schema=TEST_SCHEMA_3,
+                                                       cls=util_schema.CustomValidator,
+                                                       allow_default_none=True, key='bar')
+        validator_4 = util_schema.get_schema_validator(schema=TEST_SCHEMA_3,
+                                                       cls=util_schema.CustomValidator,
+                                                       allow_default_none=False, key='foo')
+        schema = copy.deepcopy(TEST_SCHEMA_3)
+        schema['properties']['arg_optional_default']['default'] = 'baz'
+        validator_5 = util_schema.get_schema_validator(schema=schema,
+                                                       cls=util_schema.CustomValidator,
+                                                       allow_default_none=True, key='foo')
+        self.assertIsNot(validator_1, validator_3)
+        self.assertIsNot(validator_1, validator_4)
+        self.assertIsNot(validator_1, validator_5)
+
+    def test_compiled_schema_validator_assigns_defaults(self):
+        validator = util_schema.get_schema_validator(schema=TEST_SCHEMA_3,
+                                                     cls=util_schema.CustomValidator,
+                                                     allow_default_none=True)
+
+        instance = {}
+        cleaned = validator.validate(instance)
+        self.assertEqual(instance, {})
+        self.assertEqual(cleaned['arg_optional_default'], 'bar')
+        self.assertIsNone(cleaned['arg_optional_default_none'])
+
+        # Schema passed to the validator is not modified
+        self.assertEqual(TEST_SCHEMA_3['properties']['arg_optional_default_none']['type'],
+                         'string')
+
+        instance = {'arg_optional_default': 1}
+        self.assertRaises(ValidationError, validator.validate, instance)
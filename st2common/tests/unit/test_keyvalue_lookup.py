@@ -13,10 +13,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
+
+import mock
+from oslo_config import cfg
+
 from st2tests.base import CleanDbTestCase
 from st2common.models.db.keyvalue import KeyValuePairDB
 from st2common.persistence.keyvalue import KeyValuePair
+from st2common.services import keyvalues
 from st2common.services.keyvalues import KeyValueLookup
+from st2common.services.resource_watcher import ResourceWatcher
+from st2common.util import date as date_utils
 
 
 class TestKeyValueLookup(CleanDbTestCase):
@@ -57,3 +65,63 @@ class TestKeyValueLookup(CleanDbTestCase):
         lookup = KeyValueLookup()
         self.assertEquals(str(lookup.missing_key), '')
         self.assertTrue(lookup.missing_key, 'Should be not none.')
+
+    def test_prefetch_referenced_keys_with_single_query(self):
+        k1 = KeyValuePair.add_or_update(KeyValuePairDB(name='k1', value='v1'))
+        k2 = KeyValuePair.add_or_update(KeyValuePairDB(name='a.b', value='v2'))
+
+        with mock.patch.object(KeyValuePair, 'query', wraps=KeyValuePair.query) as mock_query:
+            lookup = keyvalues.get_key_value_lookup(
+                templates=['{{system.k1}}', {'k': ['{{system.a.b}} {{system.missing}}']}])
+            self.assertEqual(mock_query.call_count, 1)
+
+            self.assertEquals(str(lookup.k1), k1.value)
+            self.assertEquals(str(lookup.a.b), k2.value)
+            self.assertEquals(str(lookup.missing), '')
+            self.assertEqual(mock_query.call_count, 1)
+
+    @mock.patch.object(ResourceWatcher, 'start', mock.MagicMock(return_value=None))
+    def test_process_wide_cache(self):
+        cfg.CONF.set_override(name='cache_ttl', override=60, group='keyvalue')
+        self.addCleanup(cfg.CONF.clear_override, name='cache_ttl', group='keyvalue')
+        self.addCleanup(setattr, keyvalues, '_KEY_VALUE_CACHE', None)
+
+        # Cache is not used until it has been set up
+        self.assertEqual(keyvalues.get_key_value_cache(), None)
+        keyvalues.setup_key_value_cache()
+        self.assertTrue(keyvalues.get_key_value_cache())
+
+        KeyValuePair.add_or_update(KeyValuePairDB(name='k1', value='v1'))
+        expire_timestamp = date_utils.get_datetime_utc_now() - datetime.timedelta(seconds=1)
+        KeyValuePair.add_or_update(KeyValuePairDB(name='k2', value='v2',
+                                                  expire_timestamp=expire_timestamp))
+
+        with mock.patch.object(KeyValuePair, 'query', wraps=KeyValuePair.query) as mock_query:
+            self.assertEqual(keyvalues.get_key_values(['k1', 'k2']), {'k1': 'v1', 'k2': 'v2'})
+            self.assertEqual(mock_query.call_count, 1)
+
+            # k1 is served from cache, k2 already expired
+            self.assertEqual(str(KeyValueLookup().k1), 'v1')
+            self.assertEqual(mock_query.call_count, 1)
+            keyvalues.get_key_values(['k2'])
+            self.assertEqual(mock_query.call_count, 2)
+
+            # Change event invalidates cached value
+            cache = keyvalues.get_key_value_cache()
+            kvp_db = KeyValuePair.get_by_name('k1')
+            kvp_db.value = 'v1-new'
+            KeyValuePair.add_or_update(kvp_db, publish=False)
+            cache._handle_kvp_change(kvp_db)
+            self.assertEqual(str(KeyValueLookup().k1), 'v1-new')
+
+    def test_process_wide_cache_is_size_limited(self):
+        cache = keyvalues.KeyValueCache(ttl=60, max_size=2)
+        cache.set('k1', 'v1')
+        cache.set('k2', 'v2')
+
+        # k1 becomes the most recently used item so k2 is evicted
+        self.assertEqual(cache.get_many(['k1']), {'k1': 'v1'})
+        cache.set('k3', 'v3')
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get_many(['k1', 'k2', 'k3']), {'k1': 'v1', 'k3': 'v3'})
@@ -430,6 +430,40 @@ class ParamsUtilsTest(DbTestCase):
                                 liveaction_parameters=params,
                                 action_context={})
 
+    def test_get_finalized_params_render_plan_is_reused(self):
+        runner_param_info = {'r1': {'type': 'integer', 'default': '{{a1}}'}}
+        action_param_info = {'a1': {'type': 'integer', 'default': 1},
+                             'a2': {'type': 'array', 'default': [1, 2]}}
+
+        r_runner_params, r_action_params = param_utils.get_finalized_params(
+            runner_param_info, action_param_info, {'a1': 5}, {})
+        self.assertEqual(r_runner_params, {'r1': 5})
+        self.assertEqual(r_action_params, {'a1': 5, 'a2': [1, 2]})
+
+        with mock.patch.object(param_utils, '_create_render_plan') as mock_create_render_plan:
+            r_runner_params, r_action_params = param_utils.get_finalized_params(
+                runner_param_info, action_param_info, {'a1': 10}, {})
+            self.assertFalse(mock_create_render_plan.called)
+
+        self.assertEqual(r_runner_params, {'r1': 10})
+        self.assertEqual(r_action_params, {'a1': 10, 'a2': [1, 2]})
+
+    def test_get_finalized_params_user_templates_are_analyzed_per_request(self):
+        action_param_info = {'a1': {'type': 'string', 'default': 'a'},
+                             'a2': {'type': 'string'}}
+
+        _, r_action_params = param_utils.get_finalized_params(
+            {}, action_param_info, {'a2': '{{a1}}-b'}, {})
+        self.assertEqual(r_action_params, {'a1': 'a', 'a2': 'a-b'})
+
+        _, r_action_params = param_utils.get_finalized_params(
+            {}, action_param_info, {'a1': '{{a2}}', 'a2': 'c'}, {})
+        self.assertEqual(r_action_params, {'a1': 'c', 'a2': 'c'})
+
+        self.assertRaisesRegexp(ParamException, 'Cyclic dependecy found',
+                                param_utils.get_finalized_params, {}, action_param_info,
+                                {'a1': '{{a2}}', 'a2': '{{a1}}'}, {})
+
     def test_cast_param_referenced_action_doesnt_exist(self):
         # Make sure the function throws if the action doesnt exist
         expected_msg = 'Action with ref "foo.doesntexist" doesn\'t exist'
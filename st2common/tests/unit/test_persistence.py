@@ -19,6 +19,10 @@ import datetime
 import bson
 
 from st2tests import DbTestCase
+from st2common.exceptions.db import StackStormDBBulkWriteError
+from st2common.exceptions.db import StackStormDBObjectConflictError
+from st2common.models.db.rbac import RoleDB
+from st2common.persistence.rbac import Role
 from st2common.util import date as date_utils
 from tests.unit.base import FakeModel, FakeModelDB
 
@@ -196,3 +200,82 @@ class TestPersistence(DbTestCase):
         self.assertIsNotNone(obj3)
         self.assertEqual(obj3.id, obj2.id)
         self.assertDictEqual(obj3.context, context)
+
+    def test_find_and_update(self):
+        obj1 = FakeModelDB(name=uuid.uuid4().hex, context={'user': 'system'}, category='a')
+        obj1 = self.access.add_or_update(obj1)
+
+        obj2 = self.access.find_and_update(query={'id': obj1.id}, set__category='b',
+                                           set__context={'a.b': 1})
+        self.assertEqual(obj2.id, obj1.id)
+        self.assertEqual(obj2.name, obj1.name)
+        self.assertEqual(obj2.category, 'b')
+        self.assertDictEqual(obj2.context, {'a.b': 1})
+
+        obj3 = self.access.get_by_id(str(obj1.id))
+        self.assertEqual(obj3.category, 'b')
+        self.assertDictEqual(obj3.context, {'a.b': 1})
+
+        # Object doesn't match the query
+        obj4 = self.access.find_and_update(query={'id': obj1.id, 'category': 'a'},
+                                           set__category='c')
+        self.assertIsNone(obj4)
+        self.assertEqual(self.access.get_by_id(str(obj1.id)).category, 'b')
+
+    def test_update(self):
+        obj1 = FakeModelDB(name=uuid.uuid4().hex, index=1)
+        obj1 = self.access.add_or_update(obj1)
+
+        obj2 = self.access.update(obj1, inc__index=2)
+        self.assertEqual(obj2.index, 3)
+
+        self.access.delete(obj1)
+        self.assertRaises(ValueError, self.access.update, obj1, inc__index=1)
+
+    def test_insert_many(self):
+        objs = [FakeModelDB(name=uuid.uuid4().hex, context={'a.b': i}, index=i)
+                for i in range(0, 3)]
+        result = self.access.insert_many(objs)
+
+        self.assertEqual(len(result), 3)
+        for index, obj in enumerate(result):
+            self.assertIsNotNone(obj.id)
+            obj2 = self.access.get_by_id(str(obj.id))
+            self.assertEqual(obj2.index, index)
+            self.assertDictEqual(obj2.context, {'a.b': index})
+
+        # Objects which already have an id can't be inserted
+        self.assertRaises(ValueError, self.access.insert_many, result)
+
+    def test_bulk_write(self):
+        obj1 = self.access.add_or_update(FakeModelDB(name=uuid.uuid4().hex, index=1))
+        obj1.index = 5
+        obj2 = FakeModelDB(name=uuid.uuid4().hex, index=2)
+
+        result = self.access.bulk_write([obj1, obj2])
+
+        self.assertEqual(len(result), 2)
+        self.assertEqual(self.access.count(), 2)
+        self.assertEqual(self.access.get_by_id(str(obj1.id)).index, 5)
+        self.assertEqual(self.access.get_by_id(str(obj2.id)).index, 2)
+
+    def test_insert_many_conflict(self):
+        self.addCleanup(RoleDB.drop_collection)
+        Role.add_or_update(RoleDB(name='role_a'))
+
+        role_dbs = [RoleDB(name='role_b'), RoleDB(name='role_a'), RoleDB(name='role_c')]
+
+        try:
+            Role.insert_many(role_dbs)
+        except StackStormDBBulkWriteError as e:
+            self.assertEqual(e.errors.keys(), [1])
+            self.assertTrue(isinstance(e.errors[1], StackStormDBObjectConflictError))
+            self.assertEqual(e.errors[1].model_object, role_dbs[1])
+            self.assertEqual([role_db.name for role_db in e.model_objects],
+                             ['role_b', 'role_c'])
+        else:
+            self.fail('StackStormDBBulkWriteError not raised')
+
+        self.assertIsNone(role_dbs[1].id)
+        self.assertEqual(sorted([role_db.name for role_db in Role.get_all()]),
+                         ['role_a', 'role_b', 'role_c'])
@@ -0,0 +1,143 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import operator
+
+import bson
+import mock
+import unittest2
+
+from st2common.models.db.action import ActionDB
+from st2common.models.db.policy import PolicyDB
+from st2common.persistence import cache as cache_module
+from st2common.persistence.cache import ResourceCache
+from st2common.persistence.cache import ResourceCacheWatcher
+from st2common.util import date as date_utils
+
+
+class ResourceCacheTestCase(unittest2.TestCase):
+
+    def _get_cache(self, max_size=10, ttl=60, model_cls=ActionDB, key_attr='ref'):
+        return ResourceCache(name='test', model_cls=model_cls,
+                             key_func=operator.attrgetter(key_attr), max_size=max_size, ttl=ttl)
+
+    def test_get_read_through_and_counters(self):
+        cache = self._get_cache()
+        action_db = ActionDB(id=bson.ObjectId(), pack='core', name='local', ref='core.local')
+        loader = mock.MagicMock(return_value=action_db)
+
+        self.assertEqual(cache.get('core.local', loader), action_db)
+        self.assertEqual(cache.get('core.local', loader), action_db)
+        self.assertEqual(loader.call_count, 1)
+
+        # Missing resources are cached as well
+        missing_loader = mock.MagicMock(return_value=None)
+        self.assertIsNone(cache.get('core.missing', missing_loader))
+        self.assertIsNone(cache.get('core.missing', missing_loader))
+        self.assertEqual(missing_loader.call_count, 1)
+
+        self.assertEqual(cache.get_stats(), {'hits': 2, 'misses': 2, 'size': 2})
+
+    def test_loader_exception_is_not_cached(self):
+        cache = self._get_cache()
+        loader = mock.MagicMock(side_effect=ValueError('invalid'))
+
+        self.assertRaises(ValueError, cache.get, 'core.local', loader)
+        self.assertRaises(ValueError, cache.get, 'core.local', loader)
+        self.assertEqual(len(cache), 0)
+
+    def test_value_invalidated_during_load_is_not_cached(self):
+        cache = self._get_cache()
+        stale_action_db = ActionDB(id=bson.ObjectId(), pack='core', name='local',
+                                   ref='core.local')
+
+        def loader():
+            # CUD event is received while the (now stale) object is being loaded
+            cache.invalidate(stale_action_db)
+            return stale_action_db
+
+        self.assertEqual(cache.get('core.local', loader), stale_action_db)
+        self.assertEqual(len(cache), 0)
+
+        loader = mock.MagicMock(return_value=stale_action_db)
+        cache.get('core.local', loader)
+        cache.get('core.local', loader)
+        self.assertEqual(loader.call_count, 1)
+
+    def test_items_expire(self):
+        cache = self._get_cache(ttl=10)
+        loader = mock.MagicMock(return_value='value')
+        now = date_utils.get_datetime_utc_now()
+
+        with mock.patch.object(date_utils, 'get_datetime_utc_now',
+                               mock.MagicMock(return_value=now)):
+            cache.get('key', loader)
+            cache.get('key', loader)
+
+        with mock.patch.object(date_utils, 'get_datetime_utc_now',
+                               mock.MagicMock(return_value=now + datetime.timedelta(seconds=11))):
+            cache.get('key', loader)
+
+        self.assertEqual(loader.call_count, 2)
+
+    def test_least_recently_used_items_are_evicted(self):
+        cache = self._get_cache(max_size=2)
+        loader = mock.MagicMock(return_value='value')
+
+        cache.get('a', loader)
+        cache.get('b', loader)
+        cache.get('a', loader)
+        cache.get('c', loader)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(loader.call_count, 3)
+
+        # "b" was evicted, "a" is still cached
+        cache.get('a', loader)
+        self.assertEqual(loader.call_count, 3)
+        cache.get('b', loader)
+        self.assertEqual(loader.call_count, 4)
+
+    def test_invalidate(self):
+        cache = self._get_cache(model_cls=PolicyDB, key_attr='resource_ref')
+        policy_id = bson.ObjectId()
+        policy_db = PolicyDB(id=policy_id, pack='core', name='concurrency',
+                             resource_ref='core.local')
+
+        cache.get('core.local', lambda: [policy_db])
+        cache.get('core.remote', lambda: [])
+
+        # Policy which moved to a different resource is evicted from the old resource entry
+        updated_policy_db = PolicyDB(id=policy_id, pack='core', name='concurrency',
+                                     resource_ref='core.remote')
+        cache.invalidate(updated_policy_db)
+        self.assertEqual(len(cache), 0)
+
+    def test_watcher_invalidates_caches_for_model(self):
+        with mock.patch.object(cache_module, 'ResourceWatcher'):
+            watcher = ResourceCacheWatcher()
+
+        action_cache = self._get_cache()
+        policy_cache = self._get_cache(model_cls=PolicyDB, key_attr='resource_ref')
+        watcher.add_cache(action_cache)
+        watcher.add_cache(policy_cache)
+
+        action_db = ActionDB(id=bson.ObjectId(), pack='core', name='local', ref='core.local')
+        action_cache.get('core.local', lambda: action_db)
+        policy_cache.get('core.local', lambda: [])
+
+        watcher._handle_change(action_db)
+        self.assertEqual(len(action_cache), 0)
+        self.assertEqual(len(policy_cache), 1)
@@ -16,13 +16,16 @@
 import os
 
 import jsonschema
+import mock
+from oslo_config import cfg
 
 import st2tests
 import st2common
 from st2common.bootstrap.policiesregistrar import PolicyRegistrar
 from st2common.bootstrap.policiesregistrar import register_policy_types, register_policies
+from st2common.persistence import cache as cache_module
 from st2common.persistence.policy import PolicyType, Policy
-from st2common.policies import ResourcePolicyApplicator, get_driver
+from st2common.policies import ResourcePolicyApplicator, get_driver, get_policy_chain
 from st2tests import DbTestCase, fixturesloader
 from st2tests.fixturesloader import FixturesLoader
 from st2tests.fixturesloader import get_fixtures_base_path
@@ -76,6 +79,40 @@ class PolicyTest(DbTestCase):
         self.assertTrue(hasattr(policy, 'threshold'))
         self.assertEqual(policy.threshold, 3)
 
+    def test_get_policy_chain(self):
+        policy_chain = get_policy_chain('wolfpack.action-1')
+        self.assertEqual(sorted([policy.ref for policy in policy_chain]),
+                         ['wolfpack.action-1.concurrency', 'wolfpack.action-1.raise'])
+
+        for policy in policy_chain:
+            self.assertIsInstance(policy.driver, ResourcePolicyApplicator)
+
+        # Action without policies
+        self.assertListEqual(get_policy_chain('wolfpack.action-2'), [])
+
+    @mock.patch.object(cache_module, '_CACHE_WATCHER', mock.MagicMock())
+    def test_get_policy_chain_cached(self):
+        cfg.CONF.set_override(name='ttl', override=60, group='resource_cache')
+        self.addCleanup(cfg.CONF.clear_override, name='ttl', group='resource_cache')
+        self.addCleanup(cache_module._CACHES.pop, 'Policy.chain', None)
+
+        with mock.patch.object(Policy, 'query', mock.MagicMock(side_effect=Policy.query)):
+            policy_chain = get_policy_chain('wolfpack.action-1')
+            self.assertEqual(len(policy_chain), 2)
+            self.assertIs(get_policy_chain('wolfpack.action-1'), policy_chain)
+
+            self.assertListEqual(get_policy_chain('wolfpack.action-2'), [])
+            self.assertListEqual(get_policy_chain('wolfpack.action-2'), [])
+
+            # Chains are compiled once per resource
+            self.assertEqual(Policy.query.call_count, 2)
+
+            # Chain is compiled again when a policy changes
+            policy_db = Policy.get_by_ref('wolfpack.action-1.concurrency')
+            cache_module._CACHES['Policy.chain'].invalidate(policy_db)
+            get_policy_chain('wolfpack.action-1')
+            self.assertEqual(Policy.query.call_count, 3)
+
 
 class PolicyBootstrapTest(DbTestCase):
 
@@ -0,0 +1,161 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import kombu
+import mock
+import unittest2
+from oslo_config import cfg
+
+import st2tests.config as tests_config
+tests_config.parse_args()
+
+from st2common.transport import publishers
+
+FAKE_XCHG = kombu.Exchange('st2.fake', type='topic')
+URLS = ['memory://']
+
+
+class PublishConfirmsTest(unittest2.TestCase):
+
+    def _get_confirms(self):
+        channel = mock.MagicMock()
+        channel.events = {'basic_ack': set(), 'basic_nack': set()}
+        confirms = publishers.PublishConfirms(channel=channel)
+        channel.confirm_select.assert_called_once_with()
+        return channel, confirms
+
+    def test_wait_returns_once_all_messages_are_confirmed(self):
+        channel, confirms = self._get_confirms()
+        for _ in range(3):
+            confirms.add_published()
+
+        on_ack = list(channel.events['basic_ack'])[0]
+        acks = [(1, False), (3, True)]
+        connection = mock.MagicMock()
+        connection.drain_events.side_effect = lambda timeout: on_ack(*acks.pop(0))
+
+        confirms.wait(connection=connection)
+        self.assertEqual(connection.drain_events.call_count, 2)
+
+    def test_wait_raises_on_nack(self):
+        channel, confirms = self._get_confirms()
+        confirms.add_published()
+        confirms.add_published()
+
+        on_ack = list(channel.events['basic_ack'])[0]
+        on_nack = list(channel.events['basic_nack'])[0]
+        connection = mock.MagicMock()
+        connection.drain_events.side_effect = lambda timeout: (on_ack(1), on_nack(2))
+
+        self.assertRaises(Exception, confirms.wait, connection=connection)
+
+
+class PoolPublisherTest(unittest2.TestCase):
+
+    def test_producer_is_reused_for_the_same_channel(self):
+        publisher = publishers.PoolPublisher(urls=URLS)
+        connection = mock.MagicMock()
+        channel = mock.MagicMock()
+
+        producer = publisher._get_producer(connection=connection, channel=channel)
+        self.assertIs(publisher._get_producer(connection=connection, channel=channel), producer)
+
+        new_channel = mock.MagicMock()
+        new_producer = publisher._get_producer(connection=connection, channel=new_channel)
+        self.assertIsNot(new_producer, producer)
+        self.assertIs(new_producer.channel, new_channel)
+
+    def test_confirms_are_skipped_when_not_supported_by_transport(self):
+        publisher = publishers.PoolPublisher(urls=URLS, confirm=True)
+        self.assertIsNone(publisher._get_confirms(channel=object()))
+
+    def test_encode_message_compresses_large_bodies(self):
+        cfg.CONF.set_override(name='compression_threshold', override=1000, group='messaging')
+        self.addCleanup(cfg.CONF.clear_override, name='compression_threshold', group='messaging')
+
+        message = publishers.PoolPublisher.encode_message({'a': 1}, FAKE_XCHG, 'create')
+        self.assertEqual(message['compression'], None)
+
+        message = publishers.PoolPublisher.encode_message({'a': 'b' * 1000}, FAKE_XCHG, 'create')
+        self.assertEqual(message['compression'], 'zlib')
+
+
+class BatchedPoolPublisherTest(unittest2.TestCase):
+
+    @mock.patch.object(publishers.PoolPublisher, 'publish_messages', mock.MagicMock())
+    def test_publish_flushes_full_batch(self):
+        publisher = publishers.BatchedPoolPublisher(urls=URLS, batch_size=3, flush_interval=60)
+
+        publisher.publish({'a': 1}, FAKE_XCHG, 'create')
+        publisher.publish({'a': 2}, FAKE_XCHG, 'update')
+        self.assertFalse(publishers.PoolPublisher.publish_messages.called)
+
+        publisher.publish({'a': 3}, FAKE_XCHG, 'delete')
+        messages = publishers.PoolPublisher.publish_messages.call_args[0][0]
+        self.assertEqual([message['routing_key'] for message in messages],
+                         ['create', 'update', 'delete'])
+        self.assertIsNone(publisher._flush_timer)
+
+    @mock.patch.object(publishers.PoolPublisher, 'publish_messages', mock.MagicMock())
+    def test_publish_flushes_partial_batch_after_interval(self):
+        publisher = publishers.BatchedPoolPublisher(urls=URLS, batch_size=100,
+                                                    flush_interval=0.01)
+        publisher.publish({'a': 1}, FAKE_XCHG, 'create')
+
+        self.assertIsNotNone(publisher._flush_timer)
+        publisher._flush_timer.wait()
+
+        self.assertEqual(publishers.PoolPublisher.publish_messages.call_count, 1)
+        self.assertEqual(len(publishers.PoolPublisher.publish_messages.call_args[0][0]), 1)
+
+    @mock.patch.object(publishers.PoolPublisher, 'publish_messages', mock.MagicMock())
+    def test_publish_messages_flushes_buffer_first(self):
+        publisher = publishers.BatchedPoolPublisher(urls=URLS, batch_size=100, flush_interval=60)
+        publisher.publish({'a': 1}, FAKE_XCHG, 'create')
+
+        message = publisher.encode_message({'a': 2}, FAKE_XCHG, 'update')
+        publisher.publish_messages([message])
+
+        self.assertEqual(publishers.PoolPublisher.publish_messages.call_count, 1)
+        messages = publishers.PoolPublisher.publish_messages.call_args[0][0]
+        self.assertEqual([message['routing_key'] for message in messages], ['create', 'update'])
+        self.assertIsNone(publisher._flush_timer)
+        self.assertEqual(publisher._buffer, [])
+
+    @mock.patch.object(publishers.PoolPublisher, 'publish_messages',
+                       mock.MagicMock(side_effect=[Exception('failed'), None]))
+    def test_failed_batch_is_retried_on_timer(self):
+        publisher = publishers.BatchedPoolPublisher(urls=URLS, batch_size=100,
+                                                    flush_interval=0.01)
+        publisher.publish({'a': 1}, FAKE_XCHG, 'create')
+        publisher._flush_timer.wait()
+
+        # Batch is put back to the buffer and a new flush is scheduled
+        self.assertEqual(len(publisher._buffer), 1)
+        self.assertIsNotNone(publisher._flush_timer)
+
+        publisher._flush_timer.wait()
+        self.assertEqual(publishers.PoolPublisher.publish_messages.call_count, 2)
+        self.assertEqual(publisher._buffer, [])
+
+    @mock.patch.object(publishers.PoolPublisher, 'publish_messages', mock.MagicMock())
+    def test_buffered_messages_are_flushed_on_exit(self):
+        publisher = publishers.BatchedPoolPublisher(urls=URLS, batch_size=100, flush_interval=60)
+        publisher.publish({'a': 1}, FAKE_XCHG, 'create')
+
+        publisher._flush_on_exit()
+
+        self.assertEqual(publishers.PoolPublisher.publish_messages.call_count, 1)
+        self.assertIsNone(publisher._flush_timer)
@@ -13,8 +13,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import eventlet
 import mock
 from kombu import Connection, Exchange, Queue
+from oslo_config import cfg
 
 from st2common.transport import consumers
 from st2common.transport import utils as transport_utils
@@ -53,3 +55,59 @@ class QueueConsumerTest(DbTestCase):
         handler = get_handler()
         handler._queue_consumer._process_message(payload)
         self.assertFalse(FakeMessageHandler.process.called)
+
+    @mock.patch.object(FakeMessageHandler, 'process', mock.MagicMock())
+    def test_process_acks_before_processing_by_default(self):
+        cfg.CONF.set_override(name='ack_after_processing', override=False, group='messaging')
+        self.addCleanup(cfg.CONF.clear_override, name='ack_after_processing', group='messaging')
+        handler = get_handler()
+        message = mock.MagicMock()
+
+        with mock.patch.object(handler._queue_consumer._dispatcher, 'dispatch'):
+            handler._queue_consumer.process(FakeModelDB(), message)
+
+        message.ack.assert_called_once_with()
+        self.assertFalse(FakeMessageHandler.process.called)
+
+    @mock.patch.object(FakeMessageHandler, 'process', mock.MagicMock())
+    def test_process_acks_after_processing(self):
+        cfg.CONF.set_override(name='ack_after_processing', override=True, group='messaging')
+        self.addCleanup(cfg.CONF.clear_override, name='ack_after_processing', group='messaging')
+        handler = get_handler()
+        message = mock.MagicMock()
+        payload = FakeModelDB()
+
+        with mock.patch.object(handler._queue_consumer._dispatcher, 'dispatch') as dispatch:
+            handler._queue_consumer.process(payload, message)
+            self.assertFalse(message.ack.called)
+
+            # Simulate the dispatcher running the work item
+            dispatch.assert_called_once_with(handler._queue_consumer._process_message, payload,
+                                             message)
+            handler._queue_consumer._process_message(payload, message)
+
+        FakeMessageHandler.process.assert_called_once_with(payload)
+        message.ack.assert_called_once_with()
+
+    def test_process_blocks_when_max_in_flight_is_reached(self):
+        cfg.CONF.set_override(name='max_in_flight', override=1, group='messaging')
+        self.addCleanup(cfg.CONF.clear_override, name='max_in_flight', group='messaging')
+        handler = get_handler()
+        consumer = handler._queue_consumer
+
+        with mock.patch.object(consumer._dispatcher, 'dispatch') as dispatch:
+            consumer.process(FakeModelDB(), mock.MagicMock())
+            thread = eventlet.spawn(consumer.process, FakeModelDB(), mock.MagicMock())
+            eventlet.sleep(0)
+            self.assertEqual(dispatch.call_count, 1)
+
+            # Completing the first message frees up a slot for the second one
+            consumer._process_message(*dispatch.call_args[0][1:])
+            thread.wait()
+            self.assertEqual(dispatch.call_count, 2)
+
+    def test_get_consumer_opt_falls_back_to_messaging_group(self):
+        cfg.CONF.set_override(name='prefetch_count', override=5, group='messaging')
+        self.addCleanup(cfg.CONF.clear_override, name='prefetch_count', group='messaging')
+        self.assertEqual(consumers.get_consumer_opt('prefetch_count'), 5)
+        self.assertEqual(consumers.get_consumer_opt('prefetch_count', 'unknown_group'), 5)
@@ -0,0 +1,121 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import bson
+import unittest2
+from kombu import compression
+from kombu import serialization
+from oslo_config import cfg
+
+import st2tests.config as tests_config
+tests_config.parse_args()
+
+from st2common.models.api.trace import TraceContext
+from st2common.models.db.liveaction import LiveActionDB
+from st2common.transport import codec
+from st2common.util import date as date_utils
+
+ACCEPT = serialization.prepare_accept_content(codec.get_accepted_codecs())
+
+
+class TransportCodecTestCase(unittest2.TestCase):
+
+    def _get_liveaction_db(self):
+        return LiveActionDB(id=bson.ObjectId(), action='core.local', status='running',
+                            start_timestamp=date_utils.get_datetime_utc_now(),
+                            parameters={'cmd': 'ls', 'a.b': 1},
+                            result={'stdout': 'foo', 'x$y': [1, 2, {'z': None}]},
+                            context={'user': 'stanley'})
+
+    def _encode_decode(self, body, codec_name):
+        content_type, content_encoding, data = codec.encode(body, codec=codec_name)
+        return serialization.loads(data, content_type, content_encoding, accept=ACCEPT)
+
+    def test_encode_decode_model_and_trace_context(self):
+        liveaction_db = self._get_liveaction_db()
+        body = {'liveaction': liveaction_db, 'trace_context': TraceContext(trace_tag='foo')}
+
+        for codec_name in codec.get_accepted_codecs():
+            result = self._encode_decode(body, codec_name)
+
+            decoded_liveaction_db = result['liveaction']
+            self.assertTrue(isinstance(decoded_liveaction_db, LiveActionDB))
+            self.assertEqual(decoded_liveaction_db.id, liveaction_db.id)
+            self.assertEqual(decoded_liveaction_db.status, liveaction_db.status)
+            self.assertEqual(decoded_liveaction_db.start_timestamp,
+                             liveaction_db.start_timestamp)
+            self.assertEqual(decoded_liveaction_db.parameters, liveaction_db.parameters)
+            self.assertEqual(decoded_liveaction_db.result, liveaction_db.result)
+            self.assertEqual(result['trace_context'].trace_tag, 'foo')
+
+    def test_encode_decode_dicts_with_reserved_keys(self):
+        body = {
+            'payload': {
+                '$oid': '5a1b2c3d4e5f6a7b8c9d0e1f',
+                '$date': 'tomorrow',
+                '$document': 'LiveActionDB',
+                '$type': 'TraceContext',
+                'value': {'$dict': {'$oid': 1}}
+            },
+            'items': [{'$type': 'foo'}, {'$in': [1, 2]}],
+            'id': bson.ObjectId()
+        }
+
+        for codec_name in codec.get_accepted_codecs():
+            result = self._encode_decode(body, codec_name)
+            self.assertEqual(result, body)
+
+    def test_compact_codecs_produce_smaller_messages(self):
+        liveaction_db = self._get_liveaction_db()
+        _, _, pickled = codec.encode(liveaction_db, codec=codec.CODEC_PICKLE)
+        _, _, encoded = codec.encode(liveaction_db, codec=codec.CODEC_JSON)
+        self.assertTrue(len(encoded) < len(pickled))
+
+    def test_encode_falls_back_to_pickle_for_unsupported_values(self):
+        content_type, _, _ = codec.encode({'foo': set([1])}, codec=codec.CODEC_JSON)
+        self.assertEqual(content_type, 'application/x-python-serialize')
+
+        # Non-string keys can't be represented in JSON without changing them
+        content_type, _, _ = codec.encode({1: 'foo'}, codec=codec.CODEC_JSON)
+        self.assertEqual(content_type, 'application/x-python-serialize')
+
+    def test_unsupported_version_is_rejected(self):
+        data = '{"v":2,"body":{}}'
+        self.assertRaises(Exception, serialization.loads, data, 'application/x-st2-json',
+                          'utf-8', accept=ACCEPT)
+
+    def test_get_compression(self):
+        cfg.CONF.set_override(name='compression', override='zlib', group='messaging')
+        cfg.CONF.set_override(name='compression_threshold', override=100, group='messaging')
+        self.addCleanup(cfg.CONF.clear_override, name='compression', group='messaging')
+        self.addCleanup(cfg.CONF.clear_override, name='compression_threshold', group='messaging')
+
+        self.assertEqual(codec.get_compression('a' * 99), None)
+        self.assertEqual(codec.get_compression('a' * 100), 'zlib')
+
+        cfg.CONF.set_override(name='compression', override='', group='messaging')
+        self.assertEqual(codec.get_compression('a' * 100), None)
+
+    def test_compressed_body_is_decoded(self):
+        liveaction_db = self._get_liveaction_db()
+        liveaction_db.result = {'stdout': 'a' * 10000}
+        content_type, content_encoding, data = codec.encode(liveaction_db, codec=codec.CODEC_JSON)
+
+        compressed, compression_type = compression.compress(data, 'zlib')
+        self.assertTrue(len(compressed) < len(data))
+
+        decompressed = compression.decompress(compressed, compression_type)
+        result = serialization.loads(decompressed, content_type, content_encoding, accept=ACCEPT)
+        self.assertEqual(result.result, liveaction_db.result)
@@ -0,0 +1,107 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import bson
+import mock
+import unittest2
+from kombu import serialization
+from oslo_config import cfg
+
+import st2tests.config as tests_config
+tests_config.parse_args()
+
+from st2common.models.db.liveaction import LiveActionDB
+from st2common.persistence.liveaction import LiveAction
+from st2common.transport import codec
+from st2common.transport.delta import ModelUpdateDelta
+from st2common.transport.delta import get_changed_fields
+from st2common.transport.delta import get_updated_fields
+from st2common.util import date as date_utils
+
+ACCEPT = serialization.prepare_accept_content(codec.get_accepted_codecs())
+
+
+class ModelUpdateDeltaTestCase(unittest2.TestCase):
+
+    def _get_liveaction_db(self):
+        return LiveActionDB(id=bson.ObjectId(), action='core.local', status='running',
+                            start_timestamp=date_utils.get_datetime_utc_now(),
+                            parameters={'cmd': 'ls'}, result={'stdout': 'x' * 1000},
+                            context={'user': 'stanley'})
+
+    def test_from_model_skips_lazy_fields(self):
+        liveaction_db = self._get_liveaction_db()
+        delta = ModelUpdateDelta.from_model(liveaction_db, fields=['status', 'start_timestamp'],
+                                            lazy_fields=['result'],
+                                            changed_fields=['status', 'result', 'context'])
+
+        self.assertEqual(delta.model, 'LiveActionDB')
+        self.assertEqual(delta.id, str(liveaction_db.id))
+        self.assertEqual(delta.status, 'running')
+        self.assertEqual(delta.start_timestamp, liveaction_db.start_timestamp)
+        self.assertEqual(delta.context, {'user': 'stanley'})
+        self.assertFalse(hasattr(delta, 'result'))
+        self.assertTrue(delta.has_changed('result'))
+        self.assertFalse(delta.has_changed('parameters'))
+
+    def test_unknown_changed_fields(self):
+        delta = ModelUpdateDelta.from_model(self._get_liveaction_db(), fields=['status'])
+        self.assertEqual(delta.changed_fields, None)
+        self.assertTrue(delta.has_changed('result'))
+
+    def test_encode_decode(self):
+        delta = ModelUpdateDelta.from_model(self._get_liveaction_db(),
+                                            fields=['status', 'start_timestamp'],
+                                            changed_fields=['status'])
+
+        for codec_name in codec.get_accepted_codecs():
+            content_type, content_encoding, data = codec.encode(delta, codec=codec_name)
+            result = serialization.loads(data, content_type, content_encoding, accept=ACCEPT)
+
+            self.assertTrue(isinstance(result, ModelUpdateDelta))
+            self.assertEqual(result.id, delta.id)
+            self.assertEqual(result.status, delta.status)
+            self.assertEqual(result.start_timestamp, delta.start_timestamp)
+            self.assertEqual(result.changed_fields, ['status'])
+
+    def test_get_changed_fields(self):
+        liveaction_db = LiveActionDB._from_son(self._get_liveaction_db().to_mongo())
+        self.assertEqual(get_changed_fields(liveaction_db), None)
+
+        liveaction_db.status = 'succeeded'
+        liveaction_db.result = {'stdout': 'foo'}
+        self.assertItemsEqual(get_changed_fields(liveaction_db), ['status', 'result'])
+
+    def test_get_updated_fields(self):
+        fields = get_updated_fields({'set__status': 'succeeded', 'push__children': 'a',
+                                     'result': {}, 'set__context__user': 'foo'})
+        self.assertItemsEqual(fields, ['status', 'children', 'result', 'context'])
+
+    def test_update_event_payload(self):
+        liveaction_db = self._get_liveaction_db()
+
+        cfg.CONF.set_override(name='slim_update_events', override=False, group='messaging')
+        self.assertIs(LiveAction._get_update_event(liveaction_db), liveaction_db)
+
+        cfg.CONF.set_override(name='slim_update_events', override=True, group='messaging')
+        self.addCleanup(cfg.CONF.clear_override, name='slim_update_events', group='messaging')
+        delta = LiveAction._get_update_event(liveaction_db, changed_fields=['result'])
+        self.assertTrue(isinstance(delta, ModelUpdateDelta))
+        self.assertEqual(delta.status, 'running')
+        self.assertFalse(hasattr(delta, 'result'))
+
+        with mock.patch.object(LiveAction, 'get_by_id', mock.MagicMock(return_value='full')):
+            self.assertEqual(LiveAction.get_by_update_event(delta), 'full')
+            LiveAction.get_by_id.assert_called_once_with(delta.id)
@@ -35,6 +35,60 @@ class JinjaUtilsRenderTestCase(unittest2.TestCase):
         expected = {'k2': 'v2', 'k1': 'v1', 'k3': ''}
         self.assertEqual(actual, expected)
 
+    def test_render_values_non_template_values_are_returned_as_is(self):
+        mapping = {'k1': 'v1', 'k2': 10, 'k3': {'a': [1, 'b']}, 'k4': None,
+                   'k5': {'a': '{{a}}'}}
+        actual = jinja_utils.render_values(mapping=mapping, context={'a': 'v1'})
+        expected = {'k1': 'v1', 'k2': 10, 'k3': {'a': [1, 'b']}, 'k4': None,
+                    'k5': {'a': 'v1'}}
+        self.assertEqual(actual, expected)
+        self.assertTrue(actual['k3'] is mapping['k3'])
+
+    def test_render_values_templates_are_compiled_once(self):
+        template_cache = jinja_utils.get_template_cache()
+        template_cache.clear()
+
+        for value in ['v1', 'v2', 'v3']:
+            actual = jinja_utils.render_values(mapping={'k1': '{{a}}', 'k2': 'static'},
+                                               context={'a': value})
+            self.assertEqual(actual, {'k1': value, 'k2': 'static'})
+
+        self.assertEqual(len(template_cache), 1)
+        self.assertTrue(template_cache is jinja_utils.get_template_cache())
+        self.assertFalse(template_cache is jinja_utils.get_template_cache(allow_undefined=True))
+
+
+class JinjaUtilsAttributePathsTestCase(unittest2.TestCase):
+
+    def test_get_attribute_paths(self):
+        template = ('{{system.a.b}} {{system["c"]}} {{system.d | int}} {{system[x].y}} '
+                    '{% if system.e %}{{foo.bar}}{% endif %}')
+        paths = jinja_utils.get_attribute_paths(template, 'system')
+        self.assertEqual(paths, set(['a', 'a.b', 'c', 'd', 'e']))
+
+        paths = jinja_utils.get_attribute_paths({'k': ['{{system.f}}', 1], '{{system.g}}': 2},
+                                                'system')
+        self.assertEqual(paths, set(['f', 'g']))
+
+        self.assertEqual(jinja_utils.get_attribute_paths('system.a', 'system'), set([]))
+        self.assertEqual(jinja_utils.get_attribute_paths('{{system.a', 'system'), set([]))
+
+
+class JinjaUtilsTemplateCacheTestCase(unittest2.TestCase):
+
+    def test_least_recently_used_template_is_evicted(self):
+        template_cache = jinja_utils.TemplateCache(env=jinja_utils.get_jinja_environment(),
+                                                   max_size=2)
+        template1 = template_cache.get_template('{{a}}')
+        template_cache.get_template('{{b}}')
+        # Mark first template as recently used
+        self.assertTrue(template_cache.get_template('{{a}}') is template1)
+        template_cache.get_template('{{c}}')
+
+        self.assertEqual(len(template_cache), 2)
+        self.assertTrue(template_cache.get_template('{{a}}') is template1)
+        self.assertEqual(template_cache.get_template('{{c}}').render({'c': 'v'}), 'v')
+
 
 class JinjaUtilsRegexFilterTestCase(unittest2.TestCase):
 
@@ -45,3 +45,5 @@ logging_opts = [
                help='location of the logging.exporter.conf file')
 ]
 CONF.register_opts(logging_opts, group='exporter')
+
+common_config.register_consumer_opts('exporter')
@@ -27,6 +27,7 @@ from st2common.models.db.execution import ActionExecutionDB
 from st2common.persistence.execution import ActionExecution
 from st2common.persistence.marker import DumperMarker
 from st2common.transport import consumers, execution, publishers
+from st2common.transport.delta import ModelUpdateDelta
 from st2common.transport import utils as transport_utils
 from st2common.util import isotime
 from st2exporter.exporter.dumper import Dumper
@@ -44,7 +45,8 @@ EXPORTER_WORK_Q = execution.get_queue(
 
 
 class ExecutionsExporter(consumers.MessageHandler):
-    message_type = ActionExecutionDB
+    message_type = (ActionExecutionDB, ModelUpdateDelta)
+    config_group = 'exporter'
 
     def __init__(self, connection, queues):
         super(ExecutionsExporter, self).__init__(connection, queues)
@@ -77,6 +79,13 @@ class ExecutionsExporter(consumers.MessageHandler):
         LOG.debug('Got execution from queue: %s', execution)
         if execution.status not in COMPLETION_STATUSES:
             return
+
+        # Slim update events only contain the status, full object is retrieved lazily
+        execution = ActionExecution.get_by_update_event(execution)
+
+        if not execution:
+            return
+
         execution_api = ActionExecutionAPI.from_model(execution, mask_secrets=True)
         self.pending_executions.put_nowait(execution_api)
         LOG.debug("Added execution to queue.")
@@ -20,7 +20,10 @@ from st2reactor.container.partitioners import DefaultPartitioner, get_all_enable
 
 __all__ = [
     'HashPartitioner',
-    'Range'
+    'Range',
+
+    'hash_ref',
+    'create_hash_ranges'
 ]
 
 # The range expression serialized is of the form `RANGE_START..RANGE_END|RANGE_START..RANGE_END ...`
@@ -100,31 +103,47 @@ class HashPartitioner(DefaultPartitioner):
         return False
 
     def _hash_sensor_ref(self, sensor_ref):
-        # Hmm... maybe this should be done in C. If it becomes a performance
-        # bottleneck will look at that optimization.
-
-        # From http://www.cs.hmc.edu/~geoff/classes/hmc.cs070.200101/homework10/hashfuncs.html
-        # The 'liberal' use of ctypes.c_unit is to guarantee unsigned integer and workaround
-        # inifinite precision.
-        md5_hash = hashlib.md5(sensor_ref.encode())
-        md5_hash_int_repr = int(md5_hash.hexdigest(), 16)
-        h = ctypes.c_uint(0)
-        for d in reversed(str(md5_hash_int_repr)):
-            d = ctypes.c_uint(int(d))
-            higherorder = ctypes.c_uint(h.value & 0xf8000000)
-            h = ctypes.c_uint(h.value << 5)
-            h = ctypes.c_uint(h.value ^ (higherorder.value >> 27))
-            h = ctypes.c_uint(h.value ^ d.value)
-        return h.value
+        return hash_ref(sensor_ref)
 
     def _create_hash_ranges(self, hash_ranges_repr):
-        """
-        Extract from a format like - 0..1024|2048..4096|4096..MAX
-        """
-        hash_ranges = []
-        # Likely all this splitting can be avoided and done nicely with regex but I generally
-        # dislike using regex so I go with naive approaches.
-        for range_repr in hash_ranges_repr.split(SUB_RANGE_SEPARATOR):
-            hash_range = Range(range_repr.strip())
-            hash_ranges.append(hash_range)
-        return hash_ranges
+        return create_hash_ranges(hash_ranges_repr)
+
+
+def hash_ref(ref):
+    """
+    Return an unsigned 32-bit hash of the provided resource reference.
+
+    :param ref: Resource reference.
+    :type ref: ``str``
+
+    :rtype: ``int``
+    """
+    # Hmm... maybe this should be done in C. If it becomes a performance
+    # bottleneck will look at that optimization.
+
+    # From http://www.cs.hmc.edu/~geoff/classes/hmc.cs070.200101/homework10/hashfuncs.html
+    # The 'liberal' use of ctypes.c_unit is to guarantee unsigned integer and workaround
+    # inifinite precision.
+    md5_hash = hashlib.md5(ref.encode())
+    md5_hash_int_repr = int(md5_hash.hexdigest(), 16)
+    h = ctypes.c_uint(0)
+    for d in reversed(str(md5_hash_int_repr)):
+        d = ctypes.c_uint(int(d))
+        higherorder = ctypes.c_uint(h.value & 0xf8000000)
+        h = ctypes.c_uint(h.value << 5)
+        h = ctypes.c_uint(h.value ^ (higherorder.value >> 27))
+        h = ctypes.c_uint(h.value ^ d.value)
+    return h.value
+
+
+def create_hash_ranges(hash_ranges_repr):
+    """
+    Extract from a format like - 0..1024|2048..4096|4096..MAX
+    """
+    hash_ranges = []
+    # Likely all this splitting can be avoided and done nicely with regex but I generally
+    # dislike using regex so I go with naive approaches.
+    for range_repr in hash_ranges_repr.split(SUB_RANGE_SEPARATOR):
+        hash_range = Range(range_repr.strip())
+        hash_ranges.append(hash_range)
+    return hash_ranges
@@ -13,9 +13,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from oslo_config import cfg
+from oslo_config import cfg, types
 
 import st2common.config as common_config
+from st2common.constants.sensors import DEFAULT_PARTITION_LOADER
 from st2common.constants.system import VERSION_STRING
 common_config.register_opts()
 
@@ -45,6 +46,34 @@ def _register_rules_engine_opts():
                    help='Location of the logging configuration file.')
     ]
     CONF.register_opts(logging_opts, group='rulesengine')
+    common_config.register_consumer_opts('rulesengine')
+
+    matching_opts = [
+        cfg.IntOpt('discrimination_index_min_rules', default=50,
+                   help='Minimum number of rules a trigger needs to have for the equality and '
+                        'prefix criteria index to be used when matching rules. 0 to disable.')
+    ]
+    CONF.register_opts(matching_opts, group='rulesengine')
+
+    enforcement_opts = [
+        cfg.IntOpt('enforcement_pool_size', default=20,
+                   help='Number of rule enforcements which can run concurrently in a single '
+                        'rules engine process. 0 to enforce rules serially.'),
+        cfg.IntOpt('max_enforcements_per_trigger_instance', default=10,
+                   help='Maximum number of rules which are enforced concurrently for a single '
+                        'trigger instance.')
+    ]
+    CONF.register_opts(enforcement_opts, group='rulesengine')
+
+    partition_opts = [
+        cfg.StrOpt('node_name', default='rulesengine1',
+                   help='Name of the rules engine node.'),
+        cfg.Opt('partition_provider', type=types.Dict(value_type=types.String()),
+                default={'name': DEFAULT_PARTITION_LOADER},
+                help='Provider of rules engine node partition config. Use "hash" together '
+                     'with "hash_ranges" to only handle instances of a share of the triggers.')
+    ]
+    CONF.register_opts(partition_opts, group='rulesengine')
 
     timer_opts = [
         cfg.StrOpt('local_timezone', default='America/Los_Angeles',
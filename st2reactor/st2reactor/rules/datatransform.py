@@ -18,6 +18,7 @@ import copy
 from st2common.constants.rules import TRIGGER_PAYLOAD_PREFIX
 from st2common.constants.system import SYSTEM_KV_PREFIX
 from st2common.services.keyvalues import KeyValueLookup
+from st2common.services.keyvalues import get_key_value_lookup
 from st2common.util import jinja as jinja_utils
 
 
@@ -28,7 +29,7 @@ class Jinja2BasedTransformer(object):
 
     def __call__(self, mapping):
         context = copy.copy(self._payload_context)
-        context[SYSTEM_KV_PREFIX] = KeyValueLookup()
+        context[SYSTEM_KV_PREFIX] = get_key_value_lookup(templates=[mapping])
         return jinja_utils.render_values(mapping=mapping, context=context)
 
     @staticmethod
@@ -0,0 +1,217 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import six
+
+from st2common import log as logging
+import st2common.operators as criteria_operators
+from st2common.constants.rules import TRIGGER_PAYLOAD_PREFIX
+from st2reactor.rules.filter import PayloadLookup, compile_criteria
+
+__all__ = [
+    'DiscriminationIndex'
+]
+
+LOG = logging.getLogger('st2reactor.rules.DiscriminationIndex')
+
+EQUALS_OPERATORS = [
+    criteria_operators.EQUALS_SHORT,
+    criteria_operators.EQUALS_LONG
+]
+
+STARTSWITH_OPERATORS = [
+    criteria_operators.STARTSWITH_LONG
+]
+
+
+class DiscriminationIndex(object):
+    """
+    Index which narrows down the rules of a single trigger to the candidate rules for a trigger
+    instance without evaluating each rule.
+
+    Each rule which has an ``equals`` / ``eq`` or ``startswith`` criterion with a static pattern
+    on a trigger payload field is placed in a group keyed by (payload path, operator). Equality
+    groups are hash maps of pattern -> rules and prefix groups are maps of prefix -> rules which
+    are probed with all the distinct prefix lengths in the group. Rules without such a criterion
+    are always candidates.
+
+    The index only ever removes rules which can't match so the candidates still need to be
+    evaluated using the regular filters.
+    """
+
+    def __init__(self, rules, compiled_criteria=None):
+        """
+        :param rules: Rules for a single trigger.
+        :type rules: ``list`` of :class:`RuleDB`
+
+        :param compiled_criteria: Optional map of rule id to pre-compiled rule criteria.
+        :type compiled_criteria: ``dict``
+        """
+        compiled_criteria = compiled_criteria or {}
+
+        # Rules which always need to be evaluated
+        self._unindexed_rule_ids = set([])
+
+        # Maps (path, operator) -> (CompiledCriterion, {pattern -> set of rule ids})
+        self._equals_groups = {}
+
+        # Maps (path, operator) -> (CompiledCriterion, {prefix -> set of rule ids},
+        #                           sorted list of prefix lengths)
+        self._startswith_groups = {}
+
+        for rule in rules:
+            rule_id = str(rule.id)
+            criteria = compiled_criteria.get(rule_id, None)
+
+            if criteria is None:
+                criteria = compile_criteria(rule.criteria)
+
+            self._add_rule(rule_id=rule_id, criteria=criteria)
+
+        for key, (criterion, prefixes, _) in six.iteritems(self._startswith_groups):
+            lengths = sorted(set([len(prefix) for prefix in prefixes.keys()]))
+            self._startswith_groups[key] = (criterion, prefixes, lengths)
+
+    def get_candidate_rules(self, rules, payload):
+        """
+        Return rules which can potentially match the provided payload. Order of the input rules
+        is preserved.
+
+        :param rules: Rules which were used to build the index.
+        :type rules: ``list`` of :class:`RuleDB`
+
+        :param payload: Trigger instance payload.
+        :type payload: ``dict``
+
+        :rtype: ``list`` of :class:`RuleDB`
+        """
+        candidate_ids = set(self._unindexed_rule_ids)
+        payload_lookup = PayloadLookup(payload)
+
+        for criterion, patterns in six.itervalues(self._equals_groups):
+            found, value = self._get_payload_value(payload_lookup, criterion)
+
+            if not found:
+                # Can't use the index, all the rules in this group are candidates
+                for rule_ids in six.itervalues(patterns):
+                    candidate_ids.update(rule_ids)
+                continue
+
+            try:
+                candidate_ids.update(patterns.get(value, []))
+            except TypeError:
+                # Unhashable value (e.g. list or dict) can't be equal to a static pattern
+                pass
+
+        for criterion, prefixes, lengths in six.itervalues(self._startswith_groups):
+            found, value = self._get_payload_value(payload_lookup, criterion)
+
+            if not found:
+                for rule_ids in six.itervalues(prefixes):
+                    candidate_ids.update(rule_ids)
+                continue
+
+            if not isinstance(value, six.string_types):
+                # startswith can't match non-string values
+                continue
+
+            for length in lengths:
+                if length > len(value):
+                    break
+
+                candidate_ids.update(prefixes.get(value[:length], []))
+
+        return [rule for rule in rules if str(rule.id) in candidate_ids]
+
+    def _add_rule(self, rule_id, criteria):
+        criterion = self._get_discriminating_criterion(criteria=criteria)
+
+        if not criterion:
+            self._unindexed_rule_ids.add(rule_id)
+            return
+
+        operator = criterion.type.lower()
+        key = (criterion.key, operator)
+
+        if operator in EQUALS_OPERATORS:
+            if key not in self._equals_groups:
+                self._equals_groups[key] = (criterion, {})
+
+            patterns = self._equals_groups[key][1]
+            patterns.setdefault(criterion.pattern, set([])).add(rule_id)
+        else:
+            if key not in self._startswith_groups:
+                self._startswith_groups[key] = (criterion, {}, None)
+
+            prefixes = self._startswith_groups[key][1]
+            prefixes.setdefault(criterion.pattern, set([])).add(rule_id)
+
+    def _get_discriminating_criterion(self, criteria):
+        """
+        Pick a criterion which can be used to index the rule. Equality criteria are preferred
+        since they are the most selective.
+        """
+        startswith_criterion = None
+
+        for criterion in criteria:
+            if not self._is_indexable(criterion):
+                continue
+
+            operator = criterion.type.lower()
+
+            if operator in EQUALS_OPERATORS:
+                return criterion
+            elif operator in STARTSWITH_OPERATORS and not startswith_criterion:
+                startswith_criterion = criterion
+
+        return startswith_criterion
+
+    def _is_indexable(self, criterion):
+        if not criterion.type or not criterion.expression or not criterion.is_static_pattern:
+            return False
+
+        # Only lookups on the trigger payload are cheap and side-effect free
+        if not criterion.key.startswith(TRIGGER_PAYLOAD_PREFIX + '.'):
+            return False
+
+        operator = criterion.type.lower()
+        pattern = criterion.pattern
+
+        if operator in EQUALS_OPERATORS:
+            # Note: None pattern never matches and booleans and numbers compare equal with
+            # each other which is also how they hash so they are safe to index.
+            return isinstance(pattern, six.string_types + six.integer_types + (float, bool))
+        elif operator in STARTSWITH_OPERATORS:
+            return isinstance(pattern, six.string_types)
+
+        return False
+
+    def _get_payload_value(self, payload_lookup, criterion):
+        """
+        Retrieve a payload value the same way as the filter does.
+
+        :return: (found, value) tuple. found is False if the value couldn't be retrieved.
+        :rtype: ``tuple``
+        """
+        try:
+            matches = payload_lookup.find(criterion.expression)
+        except Exception:
+            LOG.debug('Failed to look up "%s" in the payload.', criterion.key, exc_info=True)
+            return False, None
+
+        if matches:
+            return True, matches[0]
+
+        return True, None
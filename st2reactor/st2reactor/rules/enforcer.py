@@ -42,6 +42,9 @@ class RuleEnforcer(object):
         self.trigger_instance = trigger_instance
         self.rule = rule
 
+        # RuleEnforcementDB object created during enforce
+        self.enforcement_db = None
+
         try:
             self.data_transformer = get_transformer(trigger_instance.payload)
         except Exception as e:
@@ -50,7 +53,13 @@ class RuleEnforcer(object):
                        'a datastore, those characters need to be escaped' % (str(e)))
             raise ValueError(message)
 
-    def enforce(self):
+    def enforce(self, persist_enforcement=True):
+        """
+        :param persist_enforcement: True to write the RuleEnforcementDB object to the database.
+                                    If False, caller is responsible for persisting
+                                    ``self.enforcement_db`` (e.g. in a batch).
+        :type persist_enforcement: ``bool``
+        """
         # TODO: Refactor this to avoid additional lookup in cast_params
         # TODO: rename self.rule.action -> self.rule.action_exec_spec
         action_ref = self.rule.action['ref']
@@ -78,6 +87,7 @@ class RuleEnforcer(object):
         rule_spec = {'ref': self.rule.ref, 'id': str(self.rule.id), 'uid': self.rule.uid}
         enforcement_db = RuleEnforcementDB(trigger_instance_id=str(self.trigger_instance.id),
                                            rule=rule_spec)
+        self.enforcement_db = enforcement_db
         try:
             execution_db = RuleEnforcer._invoke_action(self.rule.action, data, context)
             # pylint: disable=no-member
@@ -87,7 +97,8 @@ class RuleEnforcer(object):
             LOG.exception('Failed kicking off execution for rule %s.', self.rule, extra=extra)
             return None
         finally:
-            self._update_enforcement(enforcement_db)
+            if persist_enforcement:
+                self._update_enforcement(enforcement_db)
 
         extra['execution_db'] = execution_db
         # pylint: disable=no-member
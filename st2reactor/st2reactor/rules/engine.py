@@ -13,8 +13,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import eventlet
+from eventlet.semaphore import Semaphore
+
 from st2common import log as logging
 from st2common.persistence.rule import Rule
+from st2common.persistence.rule_enforcement import RuleEnforcement
 from st2common.services.triggers import get_trigger_db_by_ref
 from st2reactor.rules.enforcer import RuleEnforcer
 from st2reactor.rules.matcher import RulesMatcher
@@ -23,6 +27,29 @@ LOG = logging.getLogger('st2reactor.rules.RulesEngine')
 
 
 class RulesEngine(object):
+    def __init__(self, rules_index=None, enforcement_pool_size=0,
+                 max_enforcements_per_trigger_instance=1):
+        """
+        :param rules_index: Optional in-memory rules index. If provided, candidate rules and
+                            triggers are retrieved from the index instead of the database.
+        :type rules_index: :class:`st2reactor.rules.index.RulesIndex`
+
+        :param enforcement_pool_size: Size of the green pool shared by all the rule enforcements
+                                      in this process. 0 means rules are enforced serially.
+        :type enforcement_pool_size: ``int``
+
+        :param max_enforcements_per_trigger_instance: Maximum number of rules which are enforced
+                                                      concurrently for a single trigger instance.
+        :type max_enforcements_per_trigger_instance: ``int``
+        """
+        self._rules_index = rules_index
+
+        self._enforcement_pool = None
+        if enforcement_pool_size > 0:
+            self._enforcement_pool = eventlet.GreenPool(enforcement_pool_size)
+
+        self._max_enforcements_per_trigger_instance = max(1, max_enforcements_per_trigger_instance)
+
     def handle_trigger_instance(self, trigger_instance):
         # Find matching rules for trigger instance.
         matching_rules = self.get_matching_rules_for_trigger(trigger_instance)
@@ -34,13 +61,30 @@ class RulesEngine(object):
         self.enforce_rules(enforcers)
 
     def get_matching_rules_for_trigger(self, trigger_instance):
-        trigger = trigger_instance.trigger
-        trigger = get_trigger_db_by_ref(trigger_instance.trigger)
-        rules = Rule.query(trigger=trigger_instance.trigger, enabled=True)
+        if self._rules_index:
+            rules = self._rules_index.get_rules_for_trigger(trigger_instance.trigger)
+
+            if not rules:
+                # Nothing to match, no need to look up the trigger either
+                LOG.info('Found 0 rules defined for trigger %s', trigger_instance.trigger)
+                return []
+
+            trigger = self._rules_index.get_trigger_db_by_ref(trigger_instance.trigger)
+            compiled_criteria = self._rules_index.get_compiled_criteria()
+            discrimination_index = self._rules_index.get_discrimination_index(
+                trigger_instance.trigger)
+        else:
+            trigger = get_trigger_db_by_ref(trigger_instance.trigger)
+            rules = Rule.query(trigger=trigger_instance.trigger, enabled=True)
+            compiled_criteria = None
+            discrimination_index = None
+
         LOG.info('Found %d rules defined for trigger %s (type=%s)', len(rules), trigger['name'],
                  trigger['type'])
         matcher = RulesMatcher(trigger_instance=trigger_instance,
-                               trigger=trigger, rules=rules)
+                               trigger=trigger, rules=rules,
+                               compiled_criteria=compiled_criteria,
+                               discrimination_index=discrimination_index)
 
         matching_rules = matcher.get_matching_rules()
         LOG.info('Matched %s rule(s) for trigger_instance %s (type=%s)', len(matching_rules),
@@ -60,8 +104,53 @@ class RulesEngine(object):
         return enforcers
 
     def enforce_rules(self, enforcers):
-        for enforcer in enforcers:
+        """
+        Enforce the provided rules. All the enforcers are expected to be for the same trigger
+        instance.
+
+        If an enforcement pool is configured, rules are enforced concurrently (up to
+        max_enforcements_per_trigger_instance at a time). Enforcement objects are written to
+        the database at the end using a single bulk insert.
+        """
+        if self._enforcement_pool and len(enforcers) > 1:
+            self._enforce_rules_concurrently(enforcers=enforcers)
+        else:
+            for enforcer in enforcers:
+                self._enforce_rule(enforcer=enforcer)
+
+        enforcement_dbs = [enforcer.enforcement_db for enforcer in enforcers
+                           if enforcer.enforcement_db]
+        self._write_enforcements(enforcement_dbs=enforcement_dbs)
+
+    def _enforce_rules_concurrently(self, enforcers):
+        semaphore = Semaphore(self._max_enforcements_per_trigger_instance)
+
+        def enforce_rule(enforcer):
             try:
-                enforcer.enforce()  # Should this happen in an eventlet pool?
-            except:
-                LOG.exception('Exception enforcing rule %s.', enforcer.rule)
+                self._enforce_rule(enforcer=enforcer)
+            finally:
+                semaphore.release()
+
+        threads = []
+        for enforcer in enforcers:
+            semaphore.acquire()
+            threads.append(self._enforcement_pool.spawn(enforce_rule, enforcer))
+
+        for thread in threads:
+            thread.wait()
+
+    def _enforce_rule(self, enforcer):
+        try:
+            enforcer.enforce(persist_enforcement=False)
+        except:
+            LOG.exception('Exception enforcing rule %s.', enforcer.rule)
+
+    def _write_enforcements(self, enforcement_dbs):
+        if not enforcement_dbs:
+            return
+
+        try:
+            RuleEnforcement.insert_many(enforcement_dbs)
+        except:
+            extra = {'enforcement_dbs': enforcement_dbs}
+            LOG.exception('Failed writing enforcement models to db.', extra=extra)
@@ -13,6 +13,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import re
+
 import six
 from jsonpath_rw import parse
 
@@ -24,11 +26,23 @@ from st2common.services.keyvalues import KeyValueLookup
 from st2common.util.templating import render_template_with_system_context
 
 
+__all__ = [
+    'RuleFilter',
+    'SecondPassRuleFilter',
+
+    'CompiledCriterion',
+    'compile_criteria'
+]
+
 LOG = logging.getLogger('st2reactor.ruleenforcement.filter')
 
+# Markers which indicate a criteria pattern string is a template which needs to be rendered
+TEMPLATE_MARKERS = ['{{', '{%', '{#']
+
 
 class RuleFilter(object):
-    def __init__(self, trigger_instance, trigger, rule, extra_info=False):
+    def __init__(self, trigger_instance, trigger, rule, extra_info=False,
+                 compiled_criteria=None):
         """
         :param trigger_instance: TriggerInstance DB object.
         :type trigger_instance: :class:`TriggerInstanceDB``
@@ -38,11 +52,16 @@ class RuleFilter(object):
 
         :param rule: Rule DB object.
         :type rule: :class:`RuleDB`
+
+        :param compiled_criteria: Pre-compiled rule criteria. If not provided, criteria are
+                                  compiled from the rule.
+        :type compiled_criteria: ``list`` of :class:`CompiledCriterion`
         """
         self.trigger_instance = trigger_instance
         self.trigger = trigger
         self.rule = rule
         self.extra_info = extra_info
+        self.compiled_criteria = compiled_criteria
 
         # Base context used with a logger
         self._base_logger_context = {
@@ -63,7 +82,10 @@ class RuleFilter(object):
         if not self.rule.enabled:
             return False
 
-        criteria = self.rule.criteria
+        criteria = self.compiled_criteria
+        if criteria is None:
+            criteria = compile_criteria(self.rule.criteria)
+
         is_rule_applicable = True
 
         if criteria and not self.trigger_instance.payload:
@@ -74,16 +96,15 @@ class RuleFilter(object):
         LOG.debug('Trigger payload: %s', self.trigger_instance.payload,
                   extra=self._base_logger_context)
 
-        for criterion_k in criteria.keys():
-            criterion_v = criteria[criterion_k]
+        for criterion in criteria:
             is_rule_applicable, payload_value, criterion_pattern = self._check_criterion(
-                criterion_k, criterion_v, payload_lookup)
+                criterion, payload_lookup)
             if not is_rule_applicable:
                 if self.extra_info:
                     criteria_extra_info = '\n'.join([
-                        '  key: %s' % criterion_k,
+                        '  key: %s' % criterion.key,
                         '  pattern: %s' % criterion_pattern,
-                        '  type: %s' % criterion_v['type'],
+                        '  type: %s' % criterion.type,
                         '  payload: %s' % payload_value
                     ])
                     LOG.info('Validation for rule %s failed on criteria -\n%s', self.rule.ref,
@@ -97,24 +118,32 @@ class RuleFilter(object):
 
         return is_rule_applicable
 
-    def _check_criterion(self, criterion_k, criterion_v, payload_lookup):
-        if 'type' not in criterion_v:
+    def _check_criterion(self, criterion, payload_lookup):
+        if not criterion.type:
             # Comparison operator type not specified, can't perform a comparison
-            return False
+            return False, None, None
 
-        criteria_operator = criterion_v['type']
-        criteria_pattern = criterion_v.get('pattern', None)
+        criterion_k = criterion.key
 
-        # Render the pattern (it can contain a jinja expressions)
-        try:
-            criteria_pattern = self._render_criteria_pattern(criteria_pattern=criteria_pattern)
-        except Exception:
-            LOG.exception('Failed to render pattern value "%s" for key "%s"' %
-                          (criteria_pattern, criterion_k), extra=self._base_logger_context)
-            return False
+        if criterion.is_static_pattern:
+            criteria_pattern = criterion.pattern
+        else:
+            # Render the pattern (it can contain a jinja expressions)
+            criteria_pattern = criterion.pattern
+
+            try:
+                criteria_pattern = self._render_criteria_pattern(
+                    criteria_pattern=criteria_pattern)
+            except Exception:
+                LOG.exception('Failed to render pattern value "%s" for key "%s"' %
+                              (criteria_pattern, criterion_k), extra=self._base_logger_context)
+                return False, None, criteria_pattern
 
         try:
-            matches = payload_lookup.get_value(criterion_k)
+            if criterion.expression:
+                matches = payload_lookup.find(criterion.expression)
+            else:
+                matches = payload_lookup.get_value(criterion_k)
             # pick value if only 1 matches else will end up being an array match.
             if matches:
                 payload_value = matches[0] if len(matches) > 0 else matches
@@ -123,16 +152,20 @@ class RuleFilter(object):
         except:
             LOG.exception('Failed transforming criteria key %s', criterion_k,
                           extra=self._base_logger_context)
-            return False
+            return False, None, criteria_pattern
 
-        op_func = criteria_operators.get_operator(criteria_operator)
+        op_func = criterion.op_func or criteria_operators.get_operator(criterion.type)
 
         try:
             result = op_func(value=payload_value, criteria_pattern=criteria_pattern)
         except:
             LOG.exception('There might be a problem with critera in rule %s.', self.rule,
                           extra=self._base_logger_context)
-            return False
+            return False, payload_value, criteria_pattern
+
+        if criterion.is_static_pattern:
+            # Report the original and not the compiled pattern
+            criteria_pattern = criterion.raw_pattern
 
         return result, payload_value, criteria_pattern
 
@@ -154,7 +187,8 @@ class SecondPassRuleFilter(RuleFilter):
     Special filter that handles all second pass rules. For not these are only
     backstop rules i.e. those that can match when no other rule has matched.
     """
-    def __init__(self, trigger_instance, trigger, rule, first_pass_matched):
+    def __init__(self, trigger_instance, trigger, rule, first_pass_matched,
+                 compiled_criteria=None):
         """
         :param trigger_instance: TriggerInstance DB object.
         :type trigger_instance: :class:`TriggerInstanceDB``
@@ -167,8 +201,12 @@ class SecondPassRuleFilter(RuleFilter):
 
         :param first_pass_matched: Rules that matched in the first pass.
         :type first_pass_matched: `list`
+
+        :param compiled_criteria: Pre-compiled rule criteria.
+        :type compiled_criteria: ``list`` of :class:`CompiledCriterion`
         """
-        super(SecondPassRuleFilter, self).__init__(trigger_instance, trigger, rule)
+        super(SecondPassRuleFilter, self).__init__(trigger_instance, trigger, rule,
+                                                   compiled_criteria=compiled_criteria)
         self.first_pass_matched = first_pass_matched
 
     def filter(self):
@@ -191,7 +229,102 @@ class PayloadLookup(object):
 
     def get_value(self, lookup_key):
         expr = parse(lookup_key)
+        return self.find(expr)
+
+    def find(self, expr):
+        """
+        Same as get_value, but operates on an already parsed JSONPath expression.
+        """
         matches = [match.value for match in expr.find(self._context)]
         if not matches:
             return None
         return matches
+
+
+class CompiledCriterion(object):
+    """
+    Pre-processed form of a single rule criterion which can be evaluated against many trigger
+    instances without parsing the key or the pattern again.
+    """
+
+    def __init__(self, key, criterion):
+        """
+        :param key: Criterion key (payload lookup path).
+        :type key: ``str``
+
+        :param criterion: Criterion definition with "type" and "pattern" attributes.
+        :type criterion: ``dict``
+        """
+        self.key = key
+        self.type = criterion.get('type', None)
+        self.raw_pattern = criterion.get('pattern', None)
+
+        # Note: Errors are not raised here. Invalid keys and operators are reported on
+        # evaluation the same way as for non-compiled criteria.
+        self.op_func = None
+        if self.type:
+            try:
+                self.op_func = criteria_operators.get_operator(self.type)
+            except Exception:
+                self.op_func = None
+
+        try:
+            self.expression = parse(key)
+        except Exception:
+            self.expression = None
+
+        self.is_static_pattern = not _is_template(self.raw_pattern)
+        self.pattern = self.raw_pattern
+
+        if self.is_static_pattern:
+            self.pattern = self._compile_pattern(self.raw_pattern)
+
+    def _compile_pattern(self, pattern):
+        if not pattern:
+            # Falsy patterns ('', 0, False) are treated as None, the same way as by
+            # RuleFilter._render_criteria_pattern
+            return None
+
+        if not isinstance(pattern, six.string_types):
+            return pattern
+
+        operator = self.type.lower() if self.type else None
+
+        if operator == criteria_operators.MATCH_REGEX:
+            try:
+                return re.compile(pattern)
+            except Exception:
+                # Leave it to the operator to report an invalid regex
+                return pattern
+
+        # Note: Other patterns are passed to the operators as is, the same way as the rendered
+        # ones, so the operators always receive the same types
+        return pattern
+
+    def __repr__(self):
+        return ('<CompiledCriterion key=%s,type=%s,pattern=%s,static=%s>' %
+                (self.key, self.type, self.raw_pattern, self.is_static_pattern))
+
+
+def compile_criteria(criteria):
+    """
+    Compile rule criteria into a list of :class:`CompiledCriterion` objects.
+
+    :param criteria: Rule criteria.
+    :type criteria: ``dict``
+
+    :rtype: ``list`` of :class:`CompiledCriterion`
+    """
+    criteria = criteria or {}
+    return [CompiledCriterion(key=key, criterion=value) for key, value in six.iteritems(criteria)]
+
+
+def _is_template(value):
+    if not value or not isinstance(value, six.string_types):
+        return False
+
+    for marker in TEMPLATE_MARKERS:
+        if marker in value:
+            return True
+
+    return False
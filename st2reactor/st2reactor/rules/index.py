@@ -0,0 +1,199 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from st2common import log as logging
+from st2common.persistence.rule import Rule
+from st2common.services.rule_watcher import RuleWatcher
+from st2common.services.triggers import get_trigger_db_by_ref
+from st2reactor.rules.discrimination import DiscriminationIndex
+from st2reactor.rules.filter import compile_criteria
+
+__all__ = [
+    'RulesIndex'
+]
+
+LOG = logging.getLogger('st2reactor.rules.RulesIndex')
+
+
+class RulesIndex(object):
+    """
+    In-memory index of enabled rules keyed by the trigger reference.
+
+    The index is populated from the database once on start and is then kept up to date using
+    the rule CUD events published by the persistence layer. This way the rules engine doesn't
+    need to hit the database to find candidate rules for each trigger instance.
+
+    Rule criteria are compiled when a rule is added to the index and the compiled form is
+    re-used until the rule changes. For triggers with many rules, a discrimination index is
+    built lazily which narrows down the candidate rules for a trigger instance.
+    """
+
+    def __init__(self, queue_suffix='rules_engine', discrimination_index_min_rules=0,
+                 trigger_filter=None):
+        """
+        :param discrimination_index_min_rules: Minimum number of rules a trigger needs to have
+                                               for a discrimination index to be used. 0 means
+                                               discrimination indexes are disabled.
+        :type discrimination_index_min_rules: ``int``
+
+        :param trigger_filter: If provided, only rules for triggers for which this function
+                               returns True are indexed.
+        :type trigger_filter: ``callable``
+        """
+        self._discrimination_index_min_rules = discrimination_index_min_rules
+        self._trigger_filter = trigger_filter
+
+        # Maps trigger ref -> {rule id -> RuleDB}
+        self._rules_by_trigger = {}
+
+        # Maps rule id -> trigger ref. Used to find the previous bucket of an updated or
+        # deleted rule since the trigger of a rule can change.
+        self._rule_to_trigger = {}
+
+        # Maps rule id -> list of CompiledCriterion
+        self._compiled_criteria = {}
+
+        # Maps trigger ref -> DiscriminationIndex
+        self._discrimination_indexes = {}
+
+        self._rules_watcher = RuleWatcher(create_handler=self._handle_create_rule,
+                                          update_handler=self._handle_update_rule,
+                                          delete_handler=self._handle_delete_rule,
+                                          queue_suffix=queue_suffix,
+                                          exclusive=True)
+
+    def start(self):
+        # Note: Rules are loaded only once the watcher queue has been declared so no events are
+        # lost in between. Handlers are idempotent so it's fine if the same rule is seen twice.
+        LOG.debug('Starting rule CUD watcher...')
+        self._rules_watcher.start(wait_ready=True)
+        self.load()
+
+    def stop(self):
+        self._rules_watcher.stop()
+
+    def load(self):
+        """
+        (Re)load all the enabled rules from the database.
+        """
+        rule_dbs = Rule.query(enabled=True)
+
+        for rule_db in rule_dbs:
+            self._add_rule(rule_db=rule_db)
+
+        LOG.info('Loaded %d rule(s) for %d trigger(s) into the rules index.',
+                 len(self._rule_to_trigger), len(self._rules_by_trigger))
+
+    def get_rules_for_trigger(self, trigger_ref):
+        """
+        Return all the enabled rules for the provided trigger.
+
+        :param trigger_ref: Reference of the trigger.
+        :type trigger_ref: ``str``
+
+        :rtype: ``list`` of :class:`RuleDB`
+        """
+        rules = self._rules_by_trigger.get(trigger_ref, {})
+        return list(rules.values())
+
+    def get_compiled_criteria(self):
+        """
+        Return a map of rule id to the compiled criteria for that rule.
+
+        :rtype: ``dict``
+        """
+        return self._compiled_criteria
+
+    def get_discrimination_index(self, trigger_ref):
+        """
+        Return a discrimination index for the rules of the provided trigger or None if the
+        trigger doesn't have enough rules for the index to pay off.
+
+        :rtype: :class:`DiscriminationIndex`
+        """
+        if self._discrimination_index_min_rules <= 0:
+            return None
+
+        rules = self._rules_by_trigger.get(trigger_ref, {})
+
+        if len(rules) < self._discrimination_index_min_rules:
+            return None
+
+        discrimination_index = self._discrimination_indexes.get(trigger_ref, None)
+
+        if not discrimination_index:
+            discrimination_index = DiscriminationIndex(rules=rules.values(),
+                                                       compiled_criteria=self._compiled_criteria)
+            self._discrimination_indexes[trigger_ref] = discrimination_index
+
+        return discrimination_index
+
+    def get_trigger_db_by_ref(self, trigger_ref):
+        """
+        Return TriggerDB for the provided trigger reference.
+
+        Note: Triggers are not cached by the index. They are served from the process wide
+        resource cache which is invalidated on trigger CUD events.
+
+        :rtype: :class:`TriggerDB`
+        """
+        return get_trigger_db_by_ref(trigger_ref)
+
+    def _add_rule(self, rule_db):
+        self._remove_rule(rule_db=rule_db)
+
+        if not rule_db.enabled:
+            return
+
+        if self._trigger_filter and not self._trigger_filter(rule_db.trigger):
+            return
+
+        rule_id = str(rule_db.id)
+        trigger_ref = rule_db.trigger
+
+        if trigger_ref not in self._rules_by_trigger:
+            self._rules_by_trigger[trigger_ref] = {}
+
+        self._rules_by_trigger[trigger_ref][rule_id] = rule_db
+        self._rule_to_trigger[rule_id] = trigger_ref
+        self._compiled_criteria[rule_id] = compile_criteria(rule_db.criteria)
+        self._discrimination_indexes.pop(trigger_ref, None)
+
+    def _remove_rule(self, rule_db):
+        rule_id = str(rule_db.id)
+        trigger_ref = self._rule_to_trigger.pop(rule_id, None)
+        self._compiled_criteria.pop(rule_id, None)
+
+        if not trigger_ref:
+            return
+
+        rules = self._rules_by_trigger.get(trigger_ref, {})
+        rules.pop(rule_id, None)
+        self._discrimination_indexes.pop(trigger_ref, None)
+
+        if not rules:
+            self._rules_by_trigger.pop(trigger_ref, None)
+
+    def _handle_create_rule(self, rule_db):
+        LOG.debug('Rule %s created, adding it to the rules index.', rule_db.ref)
+        self._add_rule(rule_db=rule_db)
+
+    def _handle_update_rule(self, rule_db):
+        LOG.debug('Rule %s updated, updating the rules index.', rule_db.ref)
+        self._add_rule(rule_db=rule_db)
+
+    def _handle_delete_rule(self, rule_db):
+        LOG.debug('Rule %s deleted, removing it from the rules index.', rule_db.ref)
+        self._remove_rule(rule_db=rule_db)
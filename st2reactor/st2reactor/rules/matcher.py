@@ -21,11 +21,24 @@ LOG = logging.getLogger('st2reactor.rules.RulesMatcher')
 
 
 class RulesMatcher(object):
-    def __init__(self, trigger_instance, trigger, rules, extra_info=False):
+    def __init__(self, trigger_instance, trigger, rules, extra_info=False,
+                 compiled_criteria=None, discrimination_index=None):
+        """
+        :param compiled_criteria: Optional map of rule id to pre-compiled rule criteria which
+                                  are re-used across trigger instances.
+        :type compiled_criteria: ``dict``
+
+        :param discrimination_index: Optional index built for the provided rules. If provided,
+                                     only the candidate rules returned by the index are
+                                     evaluated.
+        :type discrimination_index: :class:`st2reactor.rules.discrimination.DiscriminationIndex`
+        """
         self.trigger_instance = trigger_instance
         self.trigger = trigger
         self.rules = rules
         self.extra_info = extra_info
+        self.compiled_criteria = compiled_criteria or {}
+        self.discrimination_index = discrimination_index
 
     def get_matching_rules(self):
         first_pass, second_pass = self._split_rules_into_passes()
@@ -33,14 +46,16 @@ class RulesMatcher(object):
         rule_filters = [RuleFilter(trigger_instance=self.trigger_instance,
                                    trigger=self.trigger,
                                    rule=rule,
-                                   extra_info=self.extra_info)
+                                   extra_info=self.extra_info,
+                                   compiled_criteria=self._get_compiled_criteria(rule))
                         for rule in first_pass]
         matched_rules = [rule_filter.rule for rule_filter in rule_filters if rule_filter.filter()]
         LOG.debug('[1st_pass] %d rule(s) found to enforce for %s.', len(matched_rules),
                   self.trigger['name'])
         # second pass
         rule_filters = [SecondPassRuleFilter(self.trigger_instance, self.trigger, rule,
-                                             matched_rules)
+                                             matched_rules,
+                                             compiled_criteria=self._get_compiled_criteria(rule))
                         for rule in second_pass]
         matched_in_second_pass = [rule_filter.rule for rule_filter in rule_filters
                                   if rule_filter.filter()]
@@ -59,12 +74,25 @@ class RulesMatcher(object):
         """
         first_pass = []
         second_pass = []
-        for rule in self.rules:
+
+        rules = self.rules
+        if self.discrimination_index:
+            # Rules which can't match are dropped before the passes are evaluated. This doesn't
+            # affect backstop semantics since only rules which wouldn't match are dropped.
+            rules = self.discrimination_index.get_candidate_rules(
+                rules=rules, payload=self.trigger_instance.payload)
+            LOG.debug('%d of %d rule(s) are candidates for %s.', len(rules), len(self.rules),
+                      self.trigger['name'])
+
+        for rule in rules:
             if self._is_first_pass_rule(rule):
                 first_pass.append(rule)
             else:
                 second_pass.append(rule)
         return first_pass, second_pass
 
+    def _get_compiled_criteria(self, rule):
+        return self.compiled_criteria.get(str(rule.id), None)
+
     def _is_first_pass_rule(self, rule):
         return rule.type['ref'] != RULE_TYPE_BACKSTOP
@@ -0,0 +1,211 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+
+from eventlet.semaphore import Semaphore
+from kombu import Connection, binding
+from oslo_config import cfg
+
+from st2common import log as logging
+from st2common.constants.sensors import DEFAULT_PARTITION_LOADER, HASH_PARTITION_LOADER
+from st2common.exceptions.rules import RulesEnginePartitionerNotSupportedException
+from st2common.services.triggerwatcher import TriggerWatcher
+from st2common.transport import reactor
+from st2common.transport import utils as transport_utils
+from st2reactor.container.hash_partitioner import create_hash_ranges, hash_ref
+
+__all__ = [
+    'DefaultRulesEnginePartitioner',
+    'HashRulesEnginePartitioner',
+
+    'get_rules_engine_partitioner'
+]
+
+LOG = logging.getLogger(__name__)
+
+RULESENGINE_WORK_Q_NAME = 'st2.trigger_instances_dispatch.rules_engine'
+
+# Queue which is shared by all the partitioned nodes and receives trigger instances which have
+# been dispatched without a trigger reference as a routing key and instances of triggers which
+# are currently not bound to any node (both are routed through the unrouted exchange).
+RULESENGINE_UNPARTITIONED_WORK_Q = reactor.get_trigger_instances_queue(
+    name='%s.unpartitioned' % (RULESENGINE_WORK_Q_NAME),
+    routing_key=None,
+    bindings=[binding(reactor.TRIGGER_INSTANCE_UNROUTED_XCHG)])
+
+
+class DefaultRulesEnginePartitioner(object):
+    """
+    Partitioner which is used when the rules engine is not partitioned. Every rules engine
+    node consumes from a single shared queue and handles instances of all the triggers.
+    """
+
+    def __init__(self, node_name):
+        self._node_name = node_name
+
+    def is_partitioned(self):
+        return False
+
+    def is_trigger_owner(self, trigger_ref):
+        return True
+
+    def get_queues(self):
+        return [reactor.get_trigger_instances_queue(name=RULESENGINE_WORK_Q_NAME,
+                                                    routing_key='#')]
+
+    def start(self, connection=None):
+        pass
+
+    def stop(self):
+        pass
+
+
+class HashRulesEnginePartitioner(DefaultRulesEnginePartitioner):
+    """
+    Partitioner which assigns triggers to the rules engine nodes based on the hash of the
+    trigger reference.
+
+    Each node owns a configured share of the hash space and consumes from its own durable
+    queue. The queue is bound to the partitioned exchange using the references of the owned
+    triggers as routing keys so a node only receives instances of the triggers it owns.
+    Bindings are kept up to date using the trigger CUD events. Bindings for triggers which
+    the node doesn't own (anymore) are removed when the triggers are loaded on start.
+
+    Instances which are published while no node is bound to the trigger end up on the
+    unpartitioned queue.
+    """
+
+    def __init__(self, node_name, hash_ranges):
+        super(HashRulesEnginePartitioner, self).__init__(node_name=node_name)
+        self._hash_ranges = create_hash_ranges(hash_ranges)
+        self._work_q = reactor.get_trigger_instances_queue(
+            name='%s.%s' % (RULESENGINE_WORK_Q_NAME, node_name), routing_key=None, bindings=[])
+
+        self._bound_trigger_refs = set()
+        # Bindings are changed from the watcher and the initial load threads so access to the
+        # channel needs to be serialized.
+        self._binding_lock = Semaphore()
+        self._connection = None
+        self._owns_connection = False
+        self._channel = None
+        self._bound_work_q = None
+
+        self._trigger_watcher = TriggerWatcher(create_handler=self._handle_create_trigger,
+                                               update_handler=self._handle_update_trigger,
+                                               delete_handler=self._handle_delete_trigger,
+                                               trigger_types=None,
+                                               queue_suffix='rules_engine_partitioner',
+                                               exclusive=True)
+
+    def is_partitioned(self):
+        return True
+
+    def is_trigger_owner(self, trigger_ref):
+        trigger_ref_hash = hash_ref(trigger_ref)
+        for hash_range in self._hash_ranges:
+            if trigger_ref_hash in hash_range:
+                return True
+        return False
+
+    def get_queues(self):
+        return [self._work_q, RULESENGINE_UNPARTITIONED_WORK_Q]
+
+    def start(self, connection=None):
+        """
+        :param connection: Connection used by the work queue consumer. Bindings are managed on
+                           a channel of this connection.
+        :type connection: :class:`kombu.Connection`
+        """
+        self._connection = connection or Connection(transport_utils.get_messaging_urls())
+        self._owns_connection = connection is None
+        self._channel = self._connection.channel()
+
+        partitioned_xchg = reactor.TRIGGER_INSTANCE_PARTITIONED_XCHG(self._channel)
+        partitioned_xchg.declare()
+        partitioned_xchg.bind_to(exchange=reactor.TRIGGER_INSTANCE_XCHG, routing_key='#')
+
+        self._bound_work_q = self._work_q(self._channel)
+        self._bound_work_q.declare()
+
+        LOG.debug('Starting trigger CUD watcher...')
+        self._trigger_watcher.start()
+
+    def stop(self):
+        try:
+            self._trigger_watcher.stop()
+        finally:
+            if self._channel:
+                self._channel.close()
+
+            if self._connection and self._owns_connection:
+                self._connection.release()
+
+    def _bind_trigger(self, trigger_ref):
+        with self._binding_lock:
+            if trigger_ref in self._bound_trigger_refs:
+                return
+
+            LOG.debug('Binding trigger %s to rules engine node %s.', trigger_ref,
+                      self._node_name)
+            self._bound_work_q.bind_to(exchange=reactor.TRIGGER_INSTANCE_PARTITIONED_XCHG,
+                                       routing_key=trigger_ref)
+            self._bound_trigger_refs.add(trigger_ref)
+
+    def _unbind_trigger(self, trigger_ref):
+        # Note: Binding is removed even if it hasn't been created by this process. The queue is
+        # durable so it can still be bound from before a restart (e.g. with different hash
+        # ranges). Removing a binding which doesn't exist is a no-op.
+        with self._binding_lock:
+            LOG.debug('Unbinding trigger %s from rules engine node %s.', trigger_ref,
+                      self._node_name)
+            self._bound_work_q.unbind_from(exchange=reactor.TRIGGER_INSTANCE_PARTITIONED_XCHG,
+                                           routing_key=trigger_ref)
+            self._bound_trigger_refs.discard(trigger_ref)
+
+    def _handle_create_trigger(self, trigger_db):
+        trigger_ref = trigger_db.get_reference().ref
+
+        if self.is_trigger_owner(trigger_ref):
+            self._bind_trigger(trigger_ref)
+        else:
+            self._unbind_trigger(trigger_ref)
+
+    def _handle_update_trigger(self, trigger_db):
+        self._handle_create_trigger(trigger_db)
+
+    def _handle_delete_trigger(self, trigger_db):
+        self._unbind_trigger(trigger_db.get_reference().ref)
+
+
+PROVIDERS = {
+    DEFAULT_PARTITION_LOADER: DefaultRulesEnginePartitioner,
+    HASH_PARTITION_LOADER: HashRulesEnginePartitioner
+}
+
+
+def get_rules_engine_partitioner():
+    partition_provider_config = copy.copy(cfg.CONF.rulesengine.partition_provider)
+    partition_provider = partition_provider_config.pop('name')
+    node_name = cfg.CONF.rulesengine.node_name
+
+    provider = PROVIDERS.get(partition_provider.lower(), None)
+    LOG.info('Using rules engine partitioner %s with node %s.', partition_provider, node_name)
+    if not provider:
+        raise RulesEnginePartitionerNotSupportedException(
+            'Partition provider %s not found.' % partition_provider)
+
+    # pass in extra config with no analysis
+    return provider(node_name=node_name, **partition_provider_config)
@@ -14,33 +14,71 @@
 # limitations under the License.
 
 from kombu import Connection
+from oslo_config import cfg
 
 from st2common import log as logging
 from st2common.constants.trace import TRACE_CONTEXT, TRACE_ID
 from st2common.util import date as date_utils
 from st2common.services import trace as trace_service
+from st2common.services import triggers as trigger_service
 from st2common.transport import consumers, reactor
 from st2common.transport import utils as transport_utils
 import st2reactor.container.utils as container_utils
 from st2reactor.rules.engine import RulesEngine
+from st2reactor.rules.index import RulesIndex
+from st2reactor.rules.partitioner import DefaultRulesEnginePartitioner
+from st2reactor.rules.partitioner import get_rules_engine_partitioner
 
 
 LOG = logging.getLogger(__name__)
 
-RULESENGINE_WORK_Q = reactor.get_trigger_instances_queue(
-    name='st2.trigger_instances_dispatch.rules_engine', routing_key='#')
-
 
 class TriggerInstanceDispatcher(consumers.MessageHandler):
     message_type = dict
+    config_group = 'rulesengine'
 
-    def __init__(self, connection, queues):
+    def __init__(self, connection, queues, partitioner=None):
         super(TriggerInstanceDispatcher, self).__init__(connection, queues)
-        self.rules_engine = RulesEngine()
+        self.partitioner = partitioner or DefaultRulesEnginePartitioner(
+            node_name=cfg.CONF.rulesengine.node_name)
+        self.rules_index = RulesIndex(
+            discrimination_index_min_rules=cfg.CONF.rulesengine.discrimination_index_min_rules,
+            trigger_filter=self.partitioner.is_trigger_owner)
+        self.rules_engine = RulesEngine(
+            rules_index=self.rules_index,
+            enforcement_pool_size=cfg.CONF.rulesengine.enforcement_pool_size,
+            max_enforcements_per_trigger_instance=(
+                cfg.CONF.rulesengine.max_enforcements_per_trigger_instance))
+
+        # Rules engine which retrieves rules from the database. It's used for instances of
+        # triggers which are not owned by this node, but which have been delivered to it
+        # because the owner hasn't bound the trigger yet.
+        self._unowned_rules_engine = None
+        self._trigger_dispatcher = None
+
+    def start(self, wait=False):
+        self.partitioner.start(connection=self._queue_consumer.connection)
+        self.rules_index.start()
+        super(TriggerInstanceDispatcher, self).start(wait=wait)
+
+    def shutdown(self):
+        super(TriggerInstanceDispatcher, self).shutdown()
+        self.rules_index.stop()
+        self.partitioner.stop()
 
     def process(self, instance):
         trigger = instance['trigger']
         payload = instance['payload']
+        rules_engine = self.rules_engine
+
+        if self.partitioner.is_partitioned():
+            trigger = self._route_to_trigger_owner(instance)
+
+            if not trigger:
+                return
+
+            if not self.partitioner.is_trigger_owner(trigger):
+                rules_engine = self._get_unowned_rules_engine()
 
         trigger_instance = None
         try:
@@ -70,7 +108,7 @@ class TriggerInstanceDispatcher(consumers.MessageHandler):
                     trigger_instances=[
                         trace_service.get_trace_component_for_trigger_instance(trigger_instance)
                     ])
-                self.rules_engine.handle_trigger_instance(trigger_instance)
+                rules_engine.handle_trigger_instance(trigger_instance)
             except:
                 # This could be a large message but at least in case of an exception
                 # we get to see more context.
@@ -79,7 +117,63 @@ class TriggerInstanceDispatcher(consumers.MessageHandler):
                 LOG.exception('Failed to handle trigger_instance %s.', instance)
                 return
 
+    def _route_to_trigger_owner(self, instance):
+        """
+        Make sure the trigger instance is handled by the node which owns the trigger.
+
+        Instances which have been dispatched with a trigger reference as a routing key are
+        never re-dispatched. They are either delivered to the owner or, if no node has bound the
+        trigger yet, to the shared queue in which case they are processed by the receiving node.
+        Instances dispatched without a trigger reference are received on the shared queue and
+        are re-dispatched using the trigger reference unless this node is the owner.
+
+        :return: Trigger reference if the instance should be processed by this node, None
+                 otherwise.
+        :rtype: ``str``
+        """
+        trigger = instance['trigger']
+        routing_key = reactor.get_trigger_routing_key(trigger)
+
+        if routing_key != reactor.TRIGGER_INSTANCE_ROUTING_KEY:
+            return routing_key
+
+        try:
+            trigger_db = trigger_service.get_trigger_db_given_type_and_params(
+                type=trigger.get('type', None), parameters=trigger.get('parameters', {}))
+        except:
+            LOG.exception('Failed to retrieve trigger for trigger_instance %s.', instance)
+            return None
+
+        if not trigger_db:
+            LOG.error('Failed to find trigger for trigger_instance %s.', instance)
+            return None
+
+        trigger_ref = trigger_db.get_reference().ref
+
+        if self.partitioner.is_trigger_owner(trigger_ref):
+            return trigger_ref
+
+        LOG.debug('Re-dispatching trigger_instance of trigger %s to the owner node.', trigger_ref)
+
+        if not self._trigger_dispatcher:
+            self._trigger_dispatcher = reactor.TriggerDispatcher(LOG)
+
+        self._trigger_dispatcher.dispatch(trigger_ref, payload=instance['payload'],
+                                          trace_context=instance.get(TRACE_CONTEXT, None))
+        return None
+
+    def _get_unowned_rules_engine(self):
+        if not self._unowned_rules_engine:
+            self._unowned_rules_engine = RulesEngine(
+                rules_index=None,
+                max_enforcements_per_trigger_instance=(
+                    cfg.CONF.rulesengine.max_enforcements_per_trigger_instance))
+
+        return self._unowned_rules_engine
+
 
 def get_worker():
+    partitioner = get_rules_engine_partitioner()
+
     with Connection(transport_utils.get_messaging_urls()) as conn:
-        return TriggerInstanceDispatcher(conn, [RULESENGINE_WORK_Q])
+        return TriggerInstanceDispatcher(conn, partitioner.get_queues(), partitioner=partitioner)
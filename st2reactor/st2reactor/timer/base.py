@@ -83,11 +83,12 @@ class St2Timer(object):
         trigger_type_ref = trigger['type']
         trigger_type = TIMER_TRIGGER_TYPES[trigger_type_ref]
         try:
-            util_schema.validate(instance=trigger['parameters'],
-                                 schema=trigger_type['parameters_schema'],
-                                 cls=util_schema.CustomValidator,
-                                 use_default=True,
-                                 allow_default_none=True)
+            validator = util_schema.get_schema_validator(schema=trigger_type['parameters_schema'],
+                                                         cls=util_schema.CustomValidator,
+                                                         use_default=True,
+                                                         allow_default_none=True,
+                                                         key=trigger_type_ref)
+            validator.validate(trigger['parameters'])
         except jsonschema.ValidationError as e:
             LOG.error('Exception scheduling timer: %s, %s',
                       trigger['parameters'], e, exc_info=True)
@@ -0,0 +1,124 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import bson
+import unittest2
+
+from st2common.constants.rules import RULE_TYPE_BACKSTOP
+from st2common.models.db.rule import RuleDB, RuleTypeSpecDB
+from st2common.models.db.trigger import TriggerDB, TriggerInstanceDB
+from st2common.util import date as date_utils
+from st2reactor.rules.discrimination import DiscriminationIndex
+from st2reactor.rules.matcher import RulesMatcher
+
+__all__ = [
+    'DiscriminationIndexTestCase'
+]
+
+MOCK_TRIGGER = TriggerDB(pack='dummy_pack_1', name='st2.webhook', type='core.st2.webhook')
+
+
+def _get_rule_db(name, criteria, rule_type=None):
+    rule_db = RuleDB(pack='sixpack', name=name, trigger=MOCK_TRIGGER.get_reference().ref,
+                     criteria=criteria, enabled=True)
+    rule_db.id = bson.ObjectId()
+
+    if rule_type:
+        rule_db.type = RuleTypeSpecDB(ref=rule_type)
+
+    return rule_db
+
+
+def _get_trigger_instance(payload):
+    return TriggerInstanceDB(trigger=MOCK_TRIGGER.get_reference().ref, payload=payload,
+                             occurrence_time=date_utils.get_datetime_utc_now())
+
+
+class DiscriminationIndexTestCase(unittest2.TestCase):
+    def setUp(self):
+        super(DiscriminationIndexTestCase, self).setUp()
+
+        self.rules = []
+
+        for index in range(0, 20):
+            self.rules.append(_get_rule_db('repo%s' % (index), {
+                'trigger.body.repo': {'type': 'equals', 'pattern': 'repo%s' % (index)}
+            }))
+
+        self.rules.append(_get_rule_db('branch_and_repo', {
+            'trigger.body.repo': {'type': 'eq', 'pattern': 'repo1'},
+            'trigger.body.branch': {'type': 'equals', 'pattern': 'master'}
+        }))
+        self.rules.append(_get_rule_db('prefix_feature', {
+            'trigger.body.branch': {'type': 'startswith', 'pattern': 'feature/'}
+        }))
+        self.rules.append(_get_rule_db('prefix_feature_foo', {
+            'trigger.body.branch': {'type': 'startswith', 'pattern': 'feature/foo'}
+        }))
+        self.rules.append(_get_rule_db('int_value', {
+            'trigger.body.count': {'type': 'equals', 'pattern': 10}
+        }))
+        self.rules.append(_get_rule_db('regex', {
+            'trigger.body.repo': {'type': 'matchregex', 'pattern': 'repo1.*'}
+        }))
+        self.rules.append(_get_rule_db('template', {
+            'trigger.body.repo': {'type': 'equals', 'pattern': '{{ "repo2" }}'}
+        }))
+        self.rules.append(_get_rule_db('no_criteria', {}))
+        self.rules.append(_get_rule_db('backstop', {
+            'trigger.body.repo': {'type': 'equals', 'pattern': 'unknown'}
+        }, rule_type=RULE_TYPE_BACKSTOP))
+
+        self.discrimination_index = DiscriminationIndex(rules=self.rules)
+
+    def test_get_candidate_rules(self):
+        payload = {'body': {'repo': 'repo1', 'branch': 'feature/foobar'}}
+        candidates = self.discrimination_index.get_candidate_rules(rules=self.rules,
+                                                                   payload=payload)
+        self.assertEqual([rule.name for rule in candidates],
+                         ['repo1', 'branch_and_repo', 'prefix_feature', 'prefix_feature_foo',
+                          'regex', 'template', 'no_criteria'])
+
+        payload = {'body': {'count': 10, 'repo': ['repo1']}}
+        candidates = self.discrimination_index.get_candidate_rules(rules=self.rules,
+                                                                   payload=payload)
+        self.assertEqual([rule.name for rule in candidates],
+                         ['int_value', 'regex', 'template', 'no_criteria'])
+
+    def test_same_results_as_without_index(self):
+        payloads = [
+            {'body': {'repo': 'repo1', 'branch': 'master'}},
+            {'body': {'repo': 'repo5', 'branch': 'feature/foo'}},
+            {'body': {'repo': 'repo2'}},
+            {'body': {'repo': 'unknown'}},
+            {'body': {'count': 10.0}},
+            {'body': {'branch': 'feature'}},
+            {'body': {'repo': {'name': 'repo1'}}},
+            {'other': 'value'}
+        ]
+
+        for payload in payloads:
+            trigger_instance = _get_trigger_instance(payload=payload)
+
+            matcher = RulesMatcher(trigger_instance=trigger_instance, trigger=MOCK_TRIGGER,
+                                   rules=self.rules)
+            expected = [rule.name for rule in matcher.get_matching_rules()]
+
+            matcher = RulesMatcher(trigger_instance=trigger_instance, trigger=MOCK_TRIGGER,
+                                   rules=self.rules,
+                                   discrimination_index=self.discrimination_index)
+            actual = [rule.name for rule in matcher.get_matching_rules()]
+
+            self.assertEqual(actual, expected, 'Mismatch for payload %s' % (payload))
@@ -22,7 +22,7 @@ from st2common.models.db.rule import RuleDB, ActionExecutionSpecDB
 from st2common.models.db.trigger import TriggerDB, TriggerInstanceDB
 from st2common.util import reference
 from st2common.util import date as date_utils
-from st2reactor.rules.filter import RuleFilter
+from st2reactor.rules.filter import RuleFilter, compile_criteria
 from st2tests import DbTestCase
 
 
@@ -189,3 +189,70 @@ class FilterTest(DbTestCase):
         }
         f = RuleFilter(MOCK_TRIGGER_INSTANCE, MOCK_TRIGGER, rule)
         self.assertTrue(f.filter())
+
+    def test_compiled_criteria_are_used(self):
+        rule = MOCK_RULE_1
+        rule.criteria = {'trigger.p1': {'type': 'equals', 'pattern': 'v1'}}
+        compiled_criteria = compile_criteria({'trigger.p1': {'type': 'equals', 'pattern': 'v'}})
+
+        f = RuleFilter(MOCK_TRIGGER_INSTANCE, MOCK_TRIGGER, rule)
+        self.assertTrue(f.filter())
+
+        # Provided compiled criteria take precedence over the ones in the rule
+        f = RuleFilter(MOCK_TRIGGER_INSTANCE, MOCK_TRIGGER, rule,
+                       compiled_criteria=compiled_criteria)
+        self.assertFalse(f.filter())
+
+    def test_compiled_criteria_are_reused_across_trigger_instances(self):
+        rule = MOCK_RULE_1
+        rule.criteria = {'trigger.p2': {'type': 'matchregex', 'pattern': '^pre.*post$'}}
+        compiled_criteria = compile_criteria(rule.criteria)
+
+        trigger_instance = copy.deepcopy(MOCK_TRIGGER_INSTANCE)
+        trigger_instance.payload['p2'] = 'nomatch'
+
+        f = RuleFilter(MOCK_TRIGGER_INSTANCE, MOCK_TRIGGER, rule,
+                       compiled_criteria=compiled_criteria)
+        self.assertTrue(f.filter())
+
+        f = RuleFilter(trigger_instance, MOCK_TRIGGER, rule,
+                       compiled_criteria=compiled_criteria)
+        self.assertFalse(f.filter())
+
+    def test_falsy_static_criteria_pattern_is_treated_as_none(self):
+        for pattern in ['', 0, False]:
+            compiled_criteria = compile_criteria({'trigger.int': {'type': 'equals',
+                                                                  'pattern': pattern}})
+            self.assertEqual(compiled_criteria[0].pattern, None)
+            self.assertEqual(compiled_criteria[0].raw_pattern, pattern)
+
+        # Missing payload value (None) is compared with None and not with ''
+        rule = MOCK_RULE_1
+        rule.criteria = {'trigger.missing': {'type': 'nequals', 'pattern': ''}}
+        f = RuleFilter(MOCK_TRIGGER_INSTANCE, MOCK_TRIGGER, rule)
+        self.assertFalse(f.filter())
+
+        rule.criteria = {'trigger.p1': {'type': 'nequals', 'pattern': ''}}
+        f = RuleFilter(MOCK_TRIGGER_INSTANCE, MOCK_TRIGGER, rule)
+        self.assertTrue(f.filter())
+
+    def test_timediff_criteria_pattern_is_not_cast(self):
+        # Static and rendered patterns are passed to the operator as the same type
+        compiled_criteria = compile_criteria({'trigger.p1': {'type': 'timediff_lt',
+                                                             'pattern': '10'}})
+        self.assertEqual(compiled_criteria[0].pattern, '10')
+
+    @mock.patch('st2reactor.rules.filter.render_template_with_system_context')
+    def test_static_criteria_pattern_is_not_rendered(self, mock_render):
+        mock_render.side_effect = lambda value: value
+
+        rule = MOCK_RULE_1
+        rule.criteria = {'trigger.p1': {'type': 'equals', 'pattern': 'v1'}}
+        f = RuleFilter(MOCK_TRIGGER_INSTANCE, MOCK_TRIGGER, rule)
+        self.assertTrue(f.filter())
+        self.assertFalse(mock_render.called)
+
+        rule.criteria = {'trigger.p1': {'type': 'equals', 'pattern': '{{ "v1" }}'}}
+        f = RuleFilter(MOCK_TRIGGER_INSTANCE, MOCK_TRIGGER, rule)
+        f.filter()
+        self.assertTrue(mock_render.called)
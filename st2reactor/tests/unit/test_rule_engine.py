@@ -13,12 +13,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import eventlet
 import mock
 from mongoengine import NotUniqueError
 
 from st2common.models.api.rule import RuleAPI
 from st2common.models.db.trigger import (TriggerDB, TriggerTypeDB)
 from st2common.persistence.rule import Rule
+from st2common.persistence.rule_enforcement import RuleEnforcement
 from st2common.persistence.trigger import (TriggerType, Trigger)
 from st2common.util import date as date_utils
 import st2reactor.container.utils as container_utils
@@ -89,6 +91,35 @@ class RuleEngineTest(DbTestCase):
         rules_engine = RulesEngine()
         rules_engine.handle_trigger_instance(trigger_instance)  # should not throw.
 
+    @mock.patch.object(RuleEnforcement, 'insert_many', mock.MagicMock())
+    def test_enforce_rules_concurrently_and_batch_enforcements(self):
+        state = {'running': 0, 'max_running': 0}
+
+        def mock_enforce(persist_enforcement=True):
+            state['running'] += 1
+            state['max_running'] = max(state['max_running'], state['running'])
+            eventlet.sleep(0.01)
+            state['running'] -= 1
+
+        enforcers = []
+        for index in range(0, 6):
+            enforcer = mock.Mock()
+            enforcer.enforce.side_effect = mock_enforce
+            enforcer.enforcement_db = 'enforcement-%s' % (index)
+            enforcers.append(enforcer)
+
+        rules_engine = RulesEngine(enforcement_pool_size=10,
+                                   max_enforcements_per_trigger_instance=3)
+        rules_engine.enforce_rules(enforcers)
+
+        self.assertEqual(state['max_running'], 3)
+        for enforcer in enforcers:
+            enforcer.enforce.assert_called_once_with(persist_enforcement=False)
+
+        # All the enforcements are written using a single bulk insert
+        RuleEnforcement.insert_many.assert_called_once_with(
+            ['enforcement-%s' % (index) for index in range(0, 6)])
+
     @classmethod
     def _setup_test_models(cls):
         RuleEngineTest._setup_sample_triggers()
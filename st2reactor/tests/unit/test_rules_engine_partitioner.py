@@ -0,0 +1,215 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+import unittest2
+
+from st2common.models.db.trigger import TriggerDB
+from st2common.models.db.rule import RuleDB
+from st2common.transport import reactor
+from st2reactor.container.hash_partitioner import Range
+from st2reactor.rules.index import RulesIndex
+from st2reactor.rules.partitioner import DefaultRulesEnginePartitioner
+from st2reactor.rules.partitioner import HashRulesEnginePartitioner
+from st2reactor.rules.worker import TriggerInstanceDispatcher
+from st2tests import config
+
+__all__ = [
+    'RulesEnginePartitionerTestCase',
+    'TriggerRoutingKeyTestCase'
+]
+
+TRIGGER_REFS = ['pack%s.trigger%s' % (i % 7, i) for i in range(0, 100)]
+
+
+class RulesEnginePartitionerTestCase(unittest2.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super(RulesEnginePartitionerTestCase, cls).setUpClass()
+        config.parse_args()
+
+    def test_default_partitioner_owns_all_triggers(self):
+        partitioner = DefaultRulesEnginePartitioner(node_name='node1')
+        self.assertFalse(partitioner.is_partitioned())
+        for trigger_ref in TRIGGER_REFS:
+            self.assertTrue(partitioner.is_trigger_owner(trigger_ref))
+
+        queues = partitioner.get_queues()
+        self.assertEqual(len(queues), 1)
+        self.assertEqual(queues[0].routing_key, '#')
+
+    def test_hash_partitioners_split_triggers(self):
+        range_mid = int(Range.RANGE_MAX_VALUE / 2)
+        partitioner1 = HashRulesEnginePartitioner(node_name='node1',
+                                                  hash_ranges='MIN..%s' % range_mid)
+        partitioner2 = HashRulesEnginePartitioner(node_name='node2',
+                                                  hash_ranges='%s..MAX' % range_mid)
+        self.assertTrue(partitioner1.is_partitioned())
+
+        owned1 = [ref for ref in TRIGGER_REFS if partitioner1.is_trigger_owner(ref)]
+        owned2 = [ref for ref in TRIGGER_REFS if partitioner2.is_trigger_owner(ref)]
+
+        # Each trigger is owned by exactly one node
+        self.assertEqual(sorted(owned1 + owned2), sorted(TRIGGER_REFS))
+        self.assertEqual(set(owned1) & set(owned2), set([]))
+        self.assertTrue(len(owned1) > 0)
+        self.assertTrue(len(owned2) > 0)
+
+        queue_names = [queue.name for queue in partitioner1.get_queues()]
+        self.assertEqual(queue_names, ['st2.trigger_instances_dispatch.rules_engine.node1',
+                                       'st2.trigger_instances_dispatch.rules_engine.unpartitioned'])
+
+    def test_hash_partitioner_queues(self):
+        partitioner = HashRulesEnginePartitioner(node_name='node1', hash_ranges='MIN..MAX')
+        work_q, unpartitioned_q = partitioner.get_queues()
+
+        # Node queue is durable so no instances are lost when the node restarts
+        self.assertTrue(work_q.durable)
+        self.assertFalse(work_q.exclusive)
+        self.assertFalse(work_q.auto_delete)
+
+        # Unpartitioned queue receives instances without a trigger reference and instances
+        # of triggers which are not bound to any node
+        exchanges = [(b.exchange.name, b.routing_key) for b in unpartitioned_q.bindings]
+        self.assertEqual(exchanges, [(reactor.TRIGGER_INSTANCE_UNROUTED_XCHG.name, '')])
+        self.assertEqual(
+            reactor.TRIGGER_INSTANCE_PARTITIONED_XCHG.arguments['alternate-exchange'],
+            reactor.TRIGGER_INSTANCE_UNROUTED_XCHG.name)
+
+        # Declaration of the existing trigger instances exchange is not changed
+        self.assertFalse(reactor.TRIGGER_INSTANCE_XCHG.arguments)
+
+    @mock.patch('st2reactor.rules.partitioner.TriggerWatcher', mock.Mock())
+    def test_hash_partitioner_start_uses_provided_connection(self):
+        partitioner = HashRulesEnginePartitioner(node_name='node1', hash_ranges='MIN..MAX')
+        connection = mock.Mock()
+
+        with mock.patch.object(reactor, 'TRIGGER_INSTANCE_PARTITIONED_XCHG') as xchg:
+            partitioner.start(connection=connection)
+
+        xchg.assert_called_once_with(connection.channel.return_value)
+        xchg.return_value.bind_to.assert_called_once_with(
+            exchange=reactor.TRIGGER_INSTANCE_XCHG, routing_key='#')
+        self.assertEqual(partitioner._bound_work_q.channel, connection.channel.return_value)
+
+        partitioner.stop()
+        connection.channel.return_value.close.assert_called_once_with()
+        self.assertFalse(connection.release.called)
+
+    def test_hash_partitioner_binds_only_owned_triggers(self):
+        partitioner = HashRulesEnginePartitioner(
+            node_name='node1', hash_ranges='MIN..%s' % int(Range.RANGE_MAX_VALUE / 2))
+        partitioner._bound_work_q = mock.Mock()
+
+        for trigger_ref in TRIGGER_REFS:
+            pack, name = trigger_ref.split('.')
+            trigger_db = TriggerDB(pack=pack, name=name, type='dummy_pack.dummy_type')
+            partitioner._handle_create_trigger(trigger_db)
+            # Duplicate events don't result in duplicate bindings
+            partitioner._handle_update_trigger(trigger_db)
+
+        owned = [ref for ref in TRIGGER_REFS if partitioner.is_trigger_owner(ref)]
+        not_owned = [ref for ref in TRIGGER_REFS if ref not in owned]
+        bound = [call[1]['routing_key'] for call in
+                 partitioner._bound_work_q.bind_to.call_args_list]
+        self.assertEqual(sorted(bound), sorted(owned))
+
+        # Possibly stale bindings for the triggers which are not owned are removed
+        unbound = set([call[1]['routing_key'] for call in
+                       partitioner._bound_work_q.unbind_from.call_args_list])
+        self.assertEqual(unbound, set(not_owned))
+
+        partitioner._bound_work_q.reset_mock()
+        pack, name = owned[0].split('.')
+        partitioner._handle_delete_trigger(TriggerDB(pack=pack, name=name))
+        partitioner._bound_work_q.unbind_from.assert_called_once_with(
+            exchange=reactor.TRIGGER_INSTANCE_PARTITIONED_XCHG, routing_key=owned[0])
+
+    def test_rules_index_only_contains_rules_for_owned_triggers(self):
+        partitioner = HashRulesEnginePartitioner(
+            node_name='node1', hash_ranges='MIN..%s' % int(Range.RANGE_MAX_VALUE / 2))
+        rules_index = RulesIndex(trigger_filter=partitioner.is_trigger_owner)
+
+        for index, trigger_ref in enumerate(TRIGGER_REFS):
+            rule_db = RuleDB(id='%024d' % (index), name='rule%s' % (index), pack='test',
+                             trigger=trigger_ref, criteria={}, enabled=True)
+            rules_index._add_rule(rule_db=rule_db)
+
+        for trigger_ref in TRIGGER_REFS:
+            rules = rules_index.get_rules_for_trigger(trigger_ref)
+            self.assertEqual(len(rules), 1 if partitioner.is_trigger_owner(trigger_ref) else 0)
+
+    @mock.patch('st2reactor.rules.worker.trigger_service')
+    @mock.patch('st2reactor.rules.worker.container_utils')
+    def test_instance_of_not_owned_trigger_is_redispatched(self, mock_container_utils,
+                                                           mock_trigger_service):
+        partitioner = HashRulesEnginePartitioner(
+            node_name='node1', hash_ranges='MIN..%s' % int(Range.RANGE_MAX_VALUE / 2))
+        not_owned = [ref for ref in TRIGGER_REFS if not partitioner.is_trigger_owner(ref)][0]
+        pack, name = not_owned.split('.')
+        mock_trigger_service.get_trigger_db_given_type_and_params.return_value = \
+            TriggerDB(pack=pack, name=name)
+
+        dispatcher = TriggerInstanceDispatcher(connection=None, queues=[],
+                                               partitioner=partitioner)
+        dispatcher._trigger_dispatcher = mock.Mock()
+
+        dispatcher.process({'trigger': {'type': 'dummy_pack.dummy_type', 'parameters': {}},
+                            'payload': {'k': 'v'}})
+
+        dispatcher._trigger_dispatcher.dispatch.assert_called_once_with(
+            not_owned, payload={'k': 'v'}, trace_context=None)
+        self.assertFalse(mock_container_utils.create_trigger_instance.called)
+
+    @mock.patch('st2reactor.rules.worker.trace_service', mock.Mock())
+    @mock.patch('st2reactor.rules.worker.container_utils')
+    def test_unrouted_instance_of_not_owned_trigger_is_processed_locally(self,
+                                                                       mock_container_utils):
+        partitioner = HashRulesEnginePartitioner(
+            node_name='node1', hash_ranges='MIN..%s' % int(Range.RANGE_MAX_VALUE / 2))
+        not_owned = [ref for ref in TRIGGER_REFS if not partitioner.is_trigger_owner(ref)][0]
+
+        dispatcher = TriggerInstanceDispatcher(connection=None, queues=[],
+                                               partitioner=partitioner)
+        dispatcher._trigger_dispatcher = mock.Mock()
+        dispatcher.rules_engine = mock.Mock()
+        dispatcher._unowned_rules_engine = mock.Mock()
+
+        dispatcher.process({'trigger': not_owned, 'payload': {'k': 'v'}})
+
+        # Instance must not be re-dispatched (it would end up on the same queue again), it's
+        # handled using the rules from the database instead
+        self.assertFalse(dispatcher._trigger_dispatcher.dispatch.called)
+        self.assertFalse(dispatcher.rules_engine.handle_trigger_instance.called)
+        trigger_instance = mock_container_utils.create_trigger_instance.return_value
+        dispatcher._unowned_rules_engine.handle_trigger_instance.assert_called_once_with(
+            trigger_instance)
+        self.assertEqual(mock_container_utils.create_trigger_instance.call_args[0][0],
+                         not_owned)
+
+
+class TriggerRoutingKeyTestCase(unittest2.TestCase):
+
+    def test_get_trigger_routing_key(self):
+        self.assertEqual(reactor.get_trigger_routing_key('pack1.trigger1'), 'pack1.trigger1')
+        self.assertEqual(reactor.get_trigger_routing_key({'pack': 'pack1', 'name': 'trigger1'}),
+                         'pack1.trigger1')
+        self.assertEqual(reactor.get_trigger_routing_key(TriggerDB(pack='pack1',
+                                                                   name='trigger1')),
+                         'pack1.trigger1')
+        self.assertEqual(reactor.get_trigger_routing_key({'type': 'pack1.type1',
+                                                          'parameters': {}}),
+                         reactor.TRIGGER_INSTANCE_ROUTING_KEY)
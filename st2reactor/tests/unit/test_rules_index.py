@@ -0,0 +1,136 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import bson
+import mock
+import unittest2
+
+from st2common.models.db.rule import RuleDB
+from st2common.models.db.trigger import TriggerDB
+from st2reactor.rules import engine as engine_module
+from st2reactor.rules import index as index_module
+from st2reactor.rules.engine import RulesEngine
+from st2reactor.rules.index import RulesIndex
+
+__all__ = [
+    'RulesIndexTestCase'
+]
+
+MOCK_TRIGGER_DB = TriggerDB(pack='dummy_pack_1', name='st2.test.trigger1',
+                            type='dummy_pack_1.st2.test.triggertype1')
+
+
+def _get_rule_db(name, trigger, enabled=True):
+    rule_db = RuleDB(pack='sixpack', name=name, trigger=trigger, enabled=enabled,
+                     criteria={})
+    rule_db.id = bson.ObjectId()
+    return rule_db
+
+
+class RulesIndexTestCase(unittest2.TestCase):
+    def setUp(self):
+        super(RulesIndexTestCase, self).setUp()
+
+        self.rule_1 = _get_rule_db('rule1', 'dummy_pack_1.st2.test.trigger1')
+        self.rule_2 = _get_rule_db('rule2', 'dummy_pack_1.st2.test.trigger1')
+        self.rule_3 = _get_rule_db('rule3', 'dummy_pack_1.st2.test.trigger2')
+
+        self.rules_index = RulesIndex()
+
+        with mock.patch.object(index_module.Rule, 'query',
+                               mock.MagicMock(return_value=[self.rule_1, self.rule_2,
+                                                            self.rule_3])):
+            self.rules_index.load()
+
+    def test_load(self):
+        rules = self.rules_index.get_rules_for_trigger('dummy_pack_1.st2.test.trigger1')
+        self.assertItemsEqual([rule.name for rule in rules], ['rule1', 'rule2'])
+
+        rules = self.rules_index.get_rules_for_trigger('dummy_pack_1.st2.test.trigger2')
+        self.assertItemsEqual([rule.name for rule in rules], ['rule3'])
+
+        rules = self.rules_index.get_rules_for_trigger('dummy_pack_1.st2.test.trigger3')
+        self.assertEqual(rules, [])
+
+    def test_create_update_delete_events(self):
+        rule_4 = _get_rule_db('rule4', 'dummy_pack_1.st2.test.trigger3')
+        self.rules_index._handle_create_rule(rule_4)
+        rules = self.rules_index.get_rules_for_trigger('dummy_pack_1.st2.test.trigger3')
+        self.assertItemsEqual([rule.name for rule in rules], ['rule4'])
+
+        # Trigger changed, rule should move to a different bucket
+        rule_4.trigger = 'dummy_pack_1.st2.test.trigger2'
+        self.rules_index._handle_update_rule(rule_4)
+        rules = self.rules_index.get_rules_for_trigger('dummy_pack_1.st2.test.trigger3')
+        self.assertEqual(rules, [])
+        rules = self.rules_index.get_rules_for_trigger('dummy_pack_1.st2.test.trigger2')
+        self.assertItemsEqual([rule.name for rule in rules], ['rule3', 'rule4'])
+
+        # Disabled rules are removed from the index
+        self.rule_1.enabled = False
+        self.rules_index._handle_update_rule(self.rule_1)
+        rules = self.rules_index.get_rules_for_trigger('dummy_pack_1.st2.test.trigger1')
+        self.assertItemsEqual([rule.name for rule in rules], ['rule2'])
+
+        self.rules_index._handle_delete_rule(self.rule_2)
+        rules = self.rules_index.get_rules_for_trigger('dummy_pack_1.st2.test.trigger1')
+        self.assertEqual(rules, [])
+
+    def test_criteria_are_compiled_once_per_rule_revision(self):
+        compiled_criteria = self.rules_index.get_compiled_criteria()
+        self.assertEqual(compiled_criteria[str(self.rule_1.id)], [])
+
+        self.rule_1.criteria = {'trigger.k1': {'type': 'equals', 'pattern': 'v1'}}
+        self.rules_index._handle_update_rule(self.rule_1)
+        compiled = self.rules_index.get_compiled_criteria()[str(self.rule_1.id)]
+        self.assertEqual(len(compiled), 1)
+        self.assertEqual(compiled[0].key, 'trigger.k1')
+        self.assertTrue(compiled[0].is_static_pattern)
+
+        self.rules_index._handle_delete_rule(self.rule_1)
+        self.assertTrue(str(self.rule_1.id) not in self.rules_index.get_compiled_criteria())
+
+    @mock.patch.object(index_module, 'get_trigger_db_by_ref',
+                       mock.MagicMock(return_value=MOCK_TRIGGER_DB))
+    def test_trigger_db_is_not_cached_by_index(self):
+        trigger_ref = 'dummy_pack_1.st2.test.trigger1'
+
+        # Triggers are served from the resource cache which is invalidated on trigger CUD
+        self.assertEqual(self.rules_index.get_trigger_db_by_ref(trigger_ref), MOCK_TRIGGER_DB)
+        self.assertEqual(self.rules_index.get_trigger_db_by_ref(trigger_ref), MOCK_TRIGGER_DB)
+        self.assertEqual(index_module.get_trigger_db_by_ref.call_count, 2)
+
+    def test_start_loads_rules_once_watcher_is_ready(self):
+        rules_index = RulesIndex()
+        calls = mock.Mock()
+        rules_index._rules_watcher = calls.watcher
+        rules_index.load = calls.load
+
+        rules_index.start()
+
+        self.assertEqual(calls.mock_calls, [mock.call.watcher.start(wait_ready=True),
+                                            mock.call.load()])
+
+    @mock.patch('st2reactor.rules.engine.Rule.query', mock.MagicMock())
+    @mock.patch('st2reactor.rules.engine.get_trigger_db_by_ref', mock.MagicMock())
+    def test_rules_engine_uses_index(self):
+        rules_engine = RulesEngine(rules_index=self.rules_index)
+        trigger_instance = mock.Mock()
+        trigger_instance.trigger = 'dummy_pack_1.st2.test.trigger3'
+
+        matching_rules = rules_engine.get_matching_rules_for_trigger(trigger_instance)
+        self.assertEqual(matching_rules, [])
+        self.assertFalse(engine_module.Rule.query.called)
+        self.assertFalse(engine_module.get_trigger_db_by_ref.called)
@@ -57,6 +57,7 @@ def _register_config_opts():
     _register_scheduler_opts()
     _register_exporter_opts()
     _register_sensor_container_opts()
+    _register_rules_engine_opts()
 
 
 def _override_db_opts():
@@ -73,6 +74,7 @@ def _override_common_opts():
     CONF.set_override(name='mask_secrets', override=True, group='log')
     CONF.set_override(name='url', override='zake://', group='coordination')
     CONF.set_override(name='lock_timeout', override=1, group='coordination')
+    CONF.set_override(name='ttl', override=0, group='resource_cache')
 
 
 def _register_common_opts():
@@ -89,7 +91,10 @@ def _register_api_opts():
         cfg.IntOpt('heartbeat', default=25,
                    help='Send empty message every N seconds to keep connection open'),
         cfg.BoolOpt('mask_secrets', default=True,
-                    help='True to mask secrets in API responses')
+                    help='True to mask secrets in API responses'),
+        cfg.BoolOpt('estimated_total_count', default=False,
+                    help='True to use the estimated collection count for the X-Total-Count '
+                         'header of list requests without filters')
     ]
     _register_opts(api_opts, group='api')
 
@@ -223,6 +228,26 @@ def _register_sensor_container_opts():
     _register_cli_opts([sensor_test_opt])
 
 
+def _register_rules_engine_opts():
+    rules_engine_opts = [
+        cfg.IntOpt('discrimination_index_min_rules', default=50,
+                   help='Minimum number of rules a trigger needs to have for the equality and '
+                        'prefix criteria index to be used when matching rules. 0 to disable.'),
+        cfg.IntOpt('enforcement_pool_size', default=20,
+                   help='Number of rule enforcements which can run concurrently in a single '
+                        'rules engine process. 0 to enforce rules serially.'),
+        cfg.IntOpt('max_enforcements_per_trigger_instance', default=10,
+                   help='Maximum number of rules which are enforced concurrently for a single '
+                        'trigger instance.'),
+        cfg.StrOpt('node_name', default='rulesengine1',
+                   help='Name of the rules engine node.'),
+        cfg.Opt('partition_provider', type=types.Dict(value_type=types.String()),
+                default={'name': DEFAULT_PARTITION_LOADER},
+                help='Provider of rules engine node partition config.')
+    ]
+    _register_opts(rules_engine_opts, group='rulesengine')
+
+
 def _register_opts(opts, group=None):
     CONF.register_opts(opts, group)
 